@@ -7,6 +7,7 @@ from sqladmin.authentication import AuthenticationBackend
 from sqlmodel import Session
 
 from app import crud
+from app.admin.sessions import admin_session_middleware
 from app.core.config import settings
 from app.core.db import engine
 from app.core.security import verify_password
@@ -16,6 +17,11 @@ from app.models import User
 class AdminAuth(AuthenticationBackend):
     """Custom authentication backend for SQLAdmin."""
 
+    def __init__(self, secret_key: str) -> None:
+        super().__init__(secret_key)
+        # SQLAdmin wraps only its own mount in these
+        self.middlewares = [admin_session_middleware()]
+
     async def login(self, request: Request) -> bool:
         """Handle login."""
         form = await request.form()
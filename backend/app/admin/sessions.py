@@ -0,0 +1,140 @@
+"""Session middleware for the admin sub-application.
+
+Only SQLAdmin uses sessions, so the middleware wraps the ``/admin`` mount
+rather than the whole app, and the cookie is scoped to ``/admin`` so
+browsers stop sending it with API requests.
+
+With ``ADMIN_SESSION_STORE = "redis"`` the cookie only carries a signed,
+random session id and the data is kept in Redis for
+``ADMIN_SESSION_MAX_AGE_SECONDS``. The id is replaced whenever an empty
+session gains data (on login), so a planted id cannot be reused.
+"""
+
+import json
+import logging
+import secrets
+from typing import Any
+
+import itsdangerous
+from itsdangerous.exc import BadSignature
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+ADMIN_PATH = "/admin"
+SESSION_COOKIE = "admin_session"
+
+
+class RedisSessionMiddleware:
+    """``SessionMiddleware`` with the session data kept in Redis."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str,
+        *,
+        session_cookie: str = SESSION_COOKIE,
+        max_age: int = 14 * 24 * 60 * 60,
+        path: str = "/",
+        https_only: bool = False,
+        key_prefix: str = "app:session:",
+    ) -> None:
+        self.app = app
+        self.signer = itsdangerous.TimestampSigner(secret_key)
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.key_prefix = key_prefix
+        self.security_flags = "httponly; samesite=lax"
+        if https_only:
+            self.security_flags += "; secure"
+
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        """The stored session, {} if it expired, None if Redis failed."""
+        try:
+            data = await get_redis().get(self.key_prefix + session_id)
+        except RedisError as e:
+            logger.warning("Could not load admin session: %s", e)
+            return None
+        return json.loads(data) if data else {}
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        return (
+            f"{self.session_cookie}={value}; path={self.path}; "
+            f"Max-Age={max_age}; {self.security_flags}"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        session_id: str | None = None
+        initial: dict[str, Any] | None = {}
+        cookie = HTTPConnection(scope).cookies.get(self.session_cookie)
+        if cookie:
+            try:
+                session_id = self.signer.unsign(cookie, max_age=self.max_age).decode()
+            except BadSignature:
+                pass
+            else:
+                initial = await self._load(session_id)
+        scope["session"] = dict(initial or {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+                try:
+                    if session and session != initial:
+                        # Reuse the id only for a session that already had data
+                        if initial and session_id:
+                            new_id = session_id
+                        else:
+                            new_id = secrets.token_urlsafe(32)
+                        await get_redis().set(
+                            self.key_prefix + new_id,
+                            json.dumps(session),
+                            ex=self.max_age,
+                        )
+                        if new_id != session_id:
+                            signed = self.signer.sign(new_id).decode()
+                            headers.append(
+                                "Set-Cookie", self._cookie(signed, self.max_age)
+                            )
+                    elif not session and session_id is not None and initial is not None:
+                        # Cleared (logout) or expired: drop it on both sides
+                        await get_redis().delete(self.key_prefix + session_id)
+                        headers.append("Set-Cookie", self._cookie("null", 0))
+                except RedisError as e:
+                    logger.warning("Could not save admin session: %s", e)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def admin_session_middleware() -> Middleware:
+    """The session middleware for the admin mount, per ``ADMIN_SESSION_STORE``."""
+    if settings.ADMIN_SESSION_STORE == "redis":
+        return Middleware(
+            RedisSessionMiddleware,
+            secret_key=settings.SECRET_KEY,
+            max_age=settings.ADMIN_SESSION_MAX_AGE_SECONDS,
+            path=ADMIN_PATH,
+            key_prefix=settings.ADMIN_SESSION_KEY_PREFIX,
+        )
+    return Middleware(
+        SessionMiddleware,
+        secret_key=settings.SECRET_KEY,
+        session_cookie=SESSION_COOKIE,
+        max_age=settings.ADMIN_SESSION_MAX_AGE_SECONDS,
+        path=ADMIN_PATH,
+    )
@@ -0,0 +1,27 @@
+"""Add content_encoding to file
+
+Revision ID: add_file_content_encoding
+Revises: add_user_storage_usage
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_file_content_encoding'
+down_revision = 'add_user_storage_usage'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without default: existing blobs are stored uncompressed
+    op.add_column(
+        'file', sa.Column('content_encoding', sa.String(length=16), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('file', 'content_encoding')
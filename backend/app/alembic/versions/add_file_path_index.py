@@ -0,0 +1,24 @@
+"""Add an index on file.file_path
+
+Revision ID: add_file_path_index
+Revises: add_file_storage_tier
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_file_path_index'
+down_revision = 'add_file_storage_tier'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The upload sweeper looks blobs up by path; created on each partition too
+    op.create_index(op.f('ix_file_file_path'), 'file', ['file_path'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_file_file_path'), table_name='file')
@@ -0,0 +1,32 @@
+"""Add last_accessed_at and storage_tier to file
+
+Revision ID: add_file_storage_tier
+Revises: add_file_content_encoding
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_file_storage_tier'
+down_revision = 'add_file_content_encoding'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('file', sa.Column('last_accessed_at', sa.DateTime(), nullable=True))
+    # Every existing blob lives under UPLOAD_DIR
+    op.add_column(
+        'file',
+        sa.Column(
+            'storage_tier', sa.String(length=8), nullable=False, server_default='hot'
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('file', 'storage_tier')
+    op.drop_column('file', 'last_accessed_at')
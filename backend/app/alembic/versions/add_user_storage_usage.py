@@ -0,0 +1,40 @@
+"""Add per-user storage usage counters
+
+Revision ID: add_user_storage_usage
+Revises: cascade_file_owner
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_storage_usage'
+down_revision = 'cascade_file_owner'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_storage_usage',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('bytes_used', sa.BigInteger(), nullable=False),
+        sa.Column('file_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(
+        op.f('ix_user_storage_usage_bytes_used'), 'user_storage_usage', ['bytes_used'], unique=False
+    )
+    # Backfill from existing files; from here on the file CRUD keeps it current
+    op.execute(
+        'INSERT INTO user_storage_usage (user_id, bytes_used, file_count) '
+        'SELECT owner_id, sum(file_size), count(*) FROM file GROUP BY owner_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_storage_usage_bytes_used'), table_name='user_storage_usage')
+    op.drop_table('user_storage_usage')
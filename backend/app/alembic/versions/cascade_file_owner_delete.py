@@ -0,0 +1,27 @@
+"""Cascade file rows on user deletion
+
+Revision ID: cascade_file_owner
+Revises: partition_by_owner
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'cascade_file_owner'
+down_revision = 'partition_by_owner'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('file_owner_id_fkey', 'file', type_='foreignkey')
+    op.create_foreign_key(
+        'file_owner_id_fkey', 'file', 'user', ['owner_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('file_owner_id_fkey', 'file', type_='foreignkey')
+    op.create_foreign_key('file_owner_id_fkey', 'file', 'user', ['owner_id'], ['id'])
@@ -0,0 +1,123 @@
+"""Hash partition item and file tables by owner_id
+
+Revision ID: partition_by_owner
+Revises: add_file_model
+Create Date: 2026-10-19 00:00:00.000000
+
+Rebuilds ``item`` and ``file`` as ``PARTITION BY HASH (owner_id)`` tables.
+Postgres cannot convert a table in place, so each table is renamed, the
+partitioned table is created under the original name, rows are copied over
+and the old table is dropped. The copy holds an ACCESS EXCLUSIVE lock on
+the old table, so run it in a maintenance window on large databases.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_by_owner'
+down_revision = 'add_file_model'
+branch_labels = None
+depends_on = None
+
+# Frozen here on purpose: app.models.partitioning.OWNER_HASH_PARTITIONS may
+# change later, this migration must keep creating the same layout
+PARTITIONS = 8
+
+ITEM_COLUMNS = "id, owner_id, title, description"
+FILE_COLUMNS = (
+    "id, owner_id, filename, original_filename, file_path, file_size, "
+    "content_type, file_hash, created_at"
+)
+
+
+def _item_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+    ]
+
+
+def _file_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=512), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('file_hash', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def _set_aside(table: str, indexes: list[str]) -> None:
+    # Constraint and index names are schema-wide, free them for the new table
+    op.rename_table(table, f'{table}_old')
+    op.execute(f'ALTER TABLE "{table}_old" RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey')
+    for index in indexes:
+        op.execute(f'ALTER INDEX {index} RENAME TO {index}_old')
+
+
+def _copy_and_drop_old(table: str, columns: str) -> None:
+    op.execute(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{table}_old"')
+    op.drop_table(f'{table}_old')
+
+
+def upgrade() -> None:
+    _set_aside('item', [])
+    op.create_table(
+        'item',
+        *_item_columns(),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', 'owner_id'),
+        postgresql_partition_by='HASH (owner_id)',
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE item_p{remainder} PARTITION OF item '
+            f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+        )
+    op.create_index(op.f('ix_item_owner_id'), 'item', ['owner_id'], unique=False)
+    _copy_and_drop_old('item', ITEM_COLUMNS)
+
+    _set_aside('file', ['ix_file_owner_id'])
+    op.create_table(
+        'file',
+        *_file_columns(),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id', 'owner_id'),
+        postgresql_partition_by='HASH (owner_id)',
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE file_p{remainder} PARTITION OF file '
+            f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+        )
+    op.create_index(op.f('ix_file_owner_id'), 'file', ['owner_id'], unique=False)
+    _copy_and_drop_old('file', FILE_COLUMNS)
+
+
+def downgrade() -> None:
+    # Dropping the partitioned parent drops its partitions and their indexes
+    _set_aside('file', ['ix_file_owner_id'])
+    op.create_table(
+        'file',
+        *_file_columns(),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_file_owner_id'), 'file', ['owner_id'], unique=False)
+    _copy_and_drop_old('file', FILE_COLUMNS)
+
+    _set_aside('item', ['ix_item_owner_id'])
+    op.create_table(
+        'item',
+        *_item_columns(),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    _copy_and_drop_old('item', ITEM_COLUMNS)
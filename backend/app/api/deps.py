@@ -7,22 +7,51 @@ Now uses fastapi-users for authentication, but keeps backward compatibility.
 from collections.abc import Generator
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlmodel import Session
 
-from app.core.db import engine
+from app.core.db import SessionLocal
+from app.core.replica import (
+    ReadSessionLocal,
+    mark_recent_write,
+    replica_enabled,
+    use_replica,
+)
+from app.core.security import get_bearer_subject
 from app.models.user import User
 from app.users.config import CurrentUser as FastAPIUsersCurrentUser
 from app.users.config import CurrentSuperuser as FastAPIUsersCurrentSuperuser
 
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
 # Database session dependency
-def get_db() -> Generator[Session, None, None]:
-    """Get database session."""
-    with Session(engine) as session:
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """Get a primary database session.
+
+    After a write request the caller's reads stick to the primary for
+    ``DB_REPLICA_STICKY_SECONDS`` so they see their own changes.
+    """
+    with SessionLocal() as session:
+        yield session
+    if replica_enabled() and request.method not in SAFE_METHODS:
+        user_id = get_bearer_subject(request)
+        if user_id is not None:
+            mark_recent_write(user_id)
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Get a session for read-only routes, on the read replica when possible."""
+    if replica_enabled() and use_replica(get_bearer_subject(request)):
+        session_factory = ReadSessionLocal
+    else:
+        session_factory = SessionLocal
+    with session_factory() as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
+ReadSessionDep = Annotated[Session, Depends(get_read_db)]
 
 # User authentication dependencies (using fastapi-users)
 CurrentUser = FastAPIUsersCurrentUser
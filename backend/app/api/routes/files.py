@@ -2,19 +2,44 @@
 
 import uuid
 from typing import Any
+from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, File as FastAPIFile, HTTPException, Request, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import (
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.api.responses import ZeroCopyFileResponse, throttle_download
+from app.core.access_tracker import access_tracker
+from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.models import FilePublic, FilesPublic, Message
+from app.core.upload_limits import UploadLimitedRoute
+from app.models import (
+    FileArchiveRequest,
+    FileBulkDeletePublic,
+    FileBulkDeleteRequest,
+    FilePublic,
+    FilesPublic,
+    Message,
+    StorageUsagesPublic,
+)
+from app.models.file import COLD_TIER
 from app.services import FileService
+from app.utils.archive import stream_zip
+from app.utils.compression import accepts_encoding, iter_decoded
+from app.utils.tasks import enqueue_blob_deletion
 
 router = APIRouter(prefix="/files", tags=["files"])
+# Uploads get their own router so admission control runs before the body is read
+upload_router = APIRouter(route_class=UploadLimitedRoute)
 
 
-@router.post("/upload", response_model=FilePublic)
+@upload_router.post("/upload", response_model=FilePublic)
 @limiter.limit("10/minute")
 async def upload_file(
     request: Request,
@@ -30,7 +55,7 @@ async def upload_file(
 
 @router.get("/", response_model=FilesPublic)
 def get_files(
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
@@ -41,10 +66,20 @@ def get_files(
     )
 
 
+@router.get(
+    "/storage/top",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=StorageUsagesPublic,
+)
+def get_top_storage_consumers(session: ReadSessionDep, limit: int = 20) -> Any:
+    """List the users storing the most bytes (superusers only)."""
+    return FileService.get_top_storage_consumers(session=session, limit=limit)
+
+
 @router.get("/{file_id}", response_model=FilePublic)
 def get_file(
     file_id: uuid.UUID,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUser,
 ) -> Any:
     """Get file information."""
@@ -55,16 +90,29 @@ def get_file(
 
 @router.get("/{file_id}/download")
 async def download_file(
+    request: Request,
     file_id: uuid.UUID,
-    session: SessionDep,
+    session: ReadSessionDep,
+    primary_session: SessionDep,
     current_user: CurrentUser,
 ) -> Any:
-    """Download a file."""
+    """Download a file.
+
+    Files in the cold tier are recalled to the hot tier first. Compressed
+    blobs are sent as stored with ``Content-Encoding: zstd`` to clients that
+    accept it, and decompressed on the fly for everyone else. The body is
+    paced to the user's download bandwidth limit.
+    """
     from pathlib import Path
 
     db_file = FileService.get_file(
         session=session, file_id=file_id, current_user=current_user
     )
+    access_tracker.record(db_file.id, db_file.owner_id)
+    if db_file.storage_tier == COLD_TIER:
+        db_file = await run_in_threadpool(
+            FileService.recall_file, session=primary_session, db_file=db_file
+        )
     
     file_path = Path(db_file.file_path)
     if not file_path.exists():
@@ -72,11 +120,64 @@ async def download_file(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found on disk"
         )
     
-    return FileResponse(
-        path=file_path,
-        filename=db_file.original_filename,
-        media_type=db_file.content_type or "application/octet-stream",
+    media_type = db_file.content_type or "application/octet-stream"
+    headers = {"Vary": "Accept-Encoding"} if db_file.content_encoding else {}
+    response: Response
+    if db_file.content_encoding is None or accepts_encoding(
+        request.headers.get("accept-encoding"), db_file.content_encoding
+    ):
+        if db_file.content_encoding is not None:
+            headers["Content-Encoding"] = db_file.content_encoding
+        response = ZeroCopyFileResponse(
+            path=file_path,
+            filename=db_file.original_filename,
+            media_type=media_type,
+            headers=headers,
+        )
+    else:
+        headers["Content-Length"] = str(db_file.file_size)
+        headers["Content-Disposition"] = (
+            f"attachment; filename*=utf-8''{quote(db_file.original_filename)}"
+        )
+        response = StreamingResponse(
+            iter_decoded(file_path, db_file.content_encoding, settings.DOWNLOAD_CHUNK_SIZE),
+            media_type=media_type,
+            headers=headers,
+        )
+    return throttle_download(response, current_user)
+
+
+@router.post("/archive")
+def download_archive(
+    body: FileArchiveRequest,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+) -> Response:
+    """Download several files as one ZIP archive, streamed as it is built."""
+    members = FileService.get_archive_members(
+        session=session, file_ids=body.file_ids, current_user=current_user
+    )
+    response = StreamingResponse(
+        stream_zip(members),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="files.zip"'},
     )
+    return throttle_download(response, current_user)
+
+
+@router.delete("/bulk", response_model=FileBulkDeletePublic)
+def delete_files(
+    body: FileBulkDeleteRequest,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """Delete many files at once; ids of missing or foreign files are skipped."""
+    paths = FileService.delete_files(
+        session=session, file_ids=body.file_ids, current_user=current_user
+    )
+    # Rows are gone already, the ARQ worker unlinks the blobs at a throttled pace
+    enqueue_blob_deletion(paths)
+    return FileBulkDeletePublic(deleted=len(paths))
 
 
 @router.delete("/{file_id}", response_model=Message)
@@ -90,3 +191,6 @@ def delete_file(
         session=session, file_id=file_id, current_user=current_user
     )
     return Message(message=result["message"])
+
+
+router.include_router(upload_router)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.api.deps import (
     CurrentUser,
+    ReadSessionDep,
     SessionDep,
     get_current_active_superuser,
 )
@@ -29,7 +30,7 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(session: ReadSessionDep, skip: int = 0, limit: int = 100) -> Any:
     """
     Retrieve users.
     """
@@ -106,7 +107,7 @@ def register_user(
 
 @router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+    user_id: uuid.UUID, session: ReadSessionDep, current_user: CurrentUser
 ) -> Any:
     """
     Get a specific user by id.
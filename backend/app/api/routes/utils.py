@@ -1,7 +1,16 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.access_tracker import access_tracker
+from app.core.bandwidth import bandwidth_limiter
+from app.core.cache import get_cache_status
+from app.core.invalidation import invalidation_bus
+from app.core.rate_limit import limiter
+from app.core.redis import get_redis_stats
+from app.core.upload_limits import upload_limiter
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -33,3 +42,80 @@ async def health_check() -> bool:
     This endpoint is excluded from rate limiting as it's used for monitoring.
     """
     return True
+
+
+@router.get(
+    "/health-check/cache",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def cache_health_check() -> dict[str, Any]:
+    """
+    Report the active cache tier ("redis" or the in-memory "memory" fallback).
+    """
+    return get_cache_status()
+
+
+@router.get(
+    "/health-check/redis",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def redis_health_check() -> dict[str, Any]:
+    """
+    Report shared Redis pool usage and command latency counters.
+    """
+    return get_redis_stats()
+
+
+@router.get(
+    "/health-check/invalidation",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def invalidation_health_check() -> dict[str, Any]:
+    """
+    Report whether this worker is subscribed to the cache invalidation bus.
+    """
+    return invalidation_bus.status()
+
+
+@router.get(
+    "/health-check/uploads",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def uploads_health_check() -> dict[str, Any]:
+    """
+    Report active and queued uploads in this worker and rejection counters.
+    """
+    return upload_limiter.status()
+
+
+@router.get(
+    "/health-check/access-tracker",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def access_tracker_health_check() -> dict[str, Any]:
+    """
+    Report file access times waiting to be written and flush counters.
+    """
+    return access_tracker.status()
+
+
+@router.get(
+    "/health-check/bandwidth",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def bandwidth_health_check() -> dict[str, Any]:
+    """
+    Report download bandwidth shaping in this worker: throttled bytes and wait time.
+    """
+    return bandwidth_limiter.status()
+
+
+@router.get(
+    "/health-check/rate-limit",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def rate_limit_health_check() -> dict[str, Any]:
+    """
+    Report rate limit decisions in this worker and whether Redis is being used.
+    """
+    return limiter.status()
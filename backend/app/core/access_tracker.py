@@ -0,0 +1,96 @@
+"""Write-behind tracking of file downloads.
+
+Downloads only record ``(file_id, owner_id) -> time`` in memory. Every
+``FILE_ACCESS_FLUSH_SECONDS`` the pending times are written to
+``file.last_accessed_at`` in one batched UPDATE, so a popular file costs one
+row update per interval instead of one per download. Times not yet flushed
+when a worker dies are lost; they only delay a blob's move to the cold tier.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import crud
+from app.core.config import settings
+from app.core.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class AccessTracker:
+    """Collects file accesses in memory and writes them out in batches."""
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self.flushed = 0
+        self.failed_flushes = 0
+        self._pending: dict[tuple[uuid.UUID, uuid.UUID], datetime] = {}
+        # Sync routes record from threadpool workers
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def record(self, file_id: uuid.UUID, owner_id: uuid.UUID) -> None:
+        """Note that a file was accessed just now."""
+        with self._lock:
+            self._pending[(file_id, owner_id)] = datetime.now(timezone.utc)
+
+    def flush(self) -> int:
+        """Write pending access times to the database (blocking).
+
+        Returns the number of files written. On a database error the times
+        are kept for the next flush.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with SessionLocal() as session:
+                crud.record_file_accesses(session=session, accesses=pending)
+        except SQLAlchemyError:
+            self.failed_flushes += 1
+            logger.exception("Could not flush %d file access times", len(pending))
+            with self._lock:
+                # Accesses recorded during the failed flush are newer
+                for key, accessed_at in pending.items():
+                    self._pending.setdefault(key, accessed_at)
+            return 0
+        self.flushed += len(pending)
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
+
+    async def start(self) -> None:
+        """Start flushing in the background of the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flush and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "flush_interval_seconds": self.flush_interval,
+        }
+
+
+access_tracker = AccessTracker(settings.FILE_ACCESS_FLUSH_SECONDS)
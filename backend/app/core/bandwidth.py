@@ -0,0 +1,139 @@
+"""Per-user download bandwidth shaping.
+
+Each user has a token bucket of bytes, refilled at the rate of their tier in
+``DOWNLOAD_BANDWIDTH_LIMITS`` and holding ``DOWNLOAD_BANDWIDTH_BURST_SECONDS``
+worth of that rate. Buckets live in Redis, so concurrent downloads by one
+user share the budget across workers and pods.
+
+Every body chunk of a throttled response is charged in one Lua script call.
+The bucket may go into debt: the script returns how long the caller must
+wait for the balance to recover, and the chunk is sent after that sleep.
+While Redis is unreachable each worker falls back to its own in-process
+buckets, so limits still hold per worker.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 15.0  # How long to use local buckets after a Redis error
+
+# KEYS[1]: bucket; ARGV: rate (bytes/s), capacity (bytes), cost (bytes).
+# Returns the milliseconds to wait before sending the charged bytes.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000) - cost
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) * 1000 / rate) + 1000)
+if tokens >= 0 then
+  return 0
+end
+return math.ceil(-tokens * 1000 / rate)
+"""
+
+
+def bandwidth_tier(user: User) -> str:
+    """The ``DOWNLOAD_BANDWIDTH_LIMITS`` tier of ``user``."""
+    if user.is_superuser:
+        return "superuser"
+    return "verified" if user.is_verified else "unverified"
+
+
+def download_rate_for(user: User) -> int | None:
+    """Bytes per second ``user`` may download at, None if unlimited."""
+    rate = settings.DOWNLOAD_BANDWIDTH_LIMITS.get(bandwidth_tier(user), 0)
+    return rate if rate > 0 else None
+
+
+class BandwidthLimiter:
+    """Token buckets of bytes per key, in Redis with a local fallback."""
+
+    def __init__(self, burst_seconds: float, key_prefix: str) -> None:
+        self.burst_seconds = burst_seconds
+        self.key_prefix = key_prefix
+        self.streams = 0
+        self.bytes_sent = 0
+        self.bytes_throttled = 0
+        self.throttle_seconds = 0.0
+        self.redis_errors = 0
+        self._local: dict[str, tuple[float, float]] = {}
+        self._script: Any = None
+        self._redis_down_until = 0.0
+
+    def _capacity(self, rate: int) -> int:
+        return max(1, int(rate * self.burst_seconds))
+
+    def _charge_local(self, key: str, rate: int, cost: int) -> float:
+        capacity = self._capacity(rate)
+        now = time.monotonic()
+        tokens, updated = self._local.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate) - cost
+        if tokens >= capacity:
+            self._local.pop(key, None)  # Full again, nothing to remember
+        else:
+            self._local[key] = (tokens, now)
+        return -tokens / rate if tokens < 0 else 0.0
+
+    async def _charge_redis(self, key: str, rate: int, cost: int) -> float:
+        redis = get_redis()
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        wait_ms = await self._script(
+            keys=[self.key_prefix + key], args=[rate, self._capacity(rate), cost]
+        )
+        return int(wait_ms) / 1000
+
+    async def charge(self, key: str, rate: int, cost: int) -> float:
+        """Take ``cost`` bytes from ``key``'s bucket; returns seconds to wait."""
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                return await self._charge_redis(key, rate, cost)
+            except (RedisError, RuntimeError, OSError) as e:
+                # RuntimeError: the shared pool is not initialised (scripts, tests)
+                self.redis_errors += 1
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("Bandwidth limiter using local buckets: %s", e)
+        return self._charge_local(key, rate, cost)
+
+    async def pace(self, key: str, rate: int, size: int) -> None:
+        """Wait until ``size`` more bytes may be sent for ``key``."""
+        if size <= 0:
+            return
+        wait = await self.charge(key, rate, size)
+        self.bytes_sent += size
+        if wait > 0:
+            self.bytes_throttled += size
+            self.throttle_seconds += wait
+            await asyncio.sleep(wait)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "active_streams": self.streams,
+            "bytes_sent": self.bytes_sent,
+            "bytes_throttled": self.bytes_throttled,
+            "throttle_seconds": round(self.throttle_seconds, 3),
+            "redis_errors": self.redis_errors,
+            "using_local_buckets": time.monotonic() < self._redis_down_until,
+            "limits": settings.DOWNLOAD_BANDWIDTH_LIMITS,
+        }
+
+
+bandwidth_limiter = BandwidthLimiter(
+    settings.DOWNLOAD_BANDWIDTH_BURST_SECONDS, settings.DOWNLOAD_BANDWIDTH_KEY_PREFIX
+)
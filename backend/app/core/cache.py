@@ -1,27 +1,244 @@
 """Cache configuration using fastapi-cache2."""
 
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Literal
+
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_cache.decorator import cache
+from fastapi_cache.types import Backend
 from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+CacheTier = Literal["redis", "memory"]
+
+
+class LRUMemoryBackend(Backend):
+    """Bounded in-process LRU cache backend.
+
+    Unlike fastapi-cache2's ``InMemoryBackend`` the store is per instance and
+    capped at ``max_entries``; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._store: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def _get(self, key: str) -> tuple[bytes, float | None] | None:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        _, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return entry
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        entry = self._get(key)
+        if entry is None:
+            return 0, None
+        value, expires_at = entry
+        ttl = -1 if expires_at is None else int(expires_at - time.monotonic())
+        return ttl, value
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._get(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        expires_at = time.monotonic() + expire if expire else None
+        self._store[key] = (value, expires_at)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        if namespace:
+            keys = [k for k in self._store if k.startswith(namespace)]
+            for k in keys:
+                del self._store[k]
+            return len(keys)
+        if key:
+            return 1 if self._store.pop(key, None) is not None else 0
+        return 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class TieredCacheBackend(Backend):
+    """Redis-backed cache that degrades to an in-process LRU when Redis fails.
+
+    Any Redis error demotes the backend to the memory tier. While demoted, a
+    background probe pings Redis at most once every ``retry_interval`` seconds
+    and re-promotes it as soon as it answers. The memory tier is cleared on
+    promotion so it never serves entries older than the outage. If a
+    ``clear()`` could not reach Redis while degraded, every key under
+    ``CACHE_KEY_PREFIX`` is cleared in Redis before it is used again, since
+    the entries that clear was meant to drop may still be there.
+    """
+
+    def __init__(
+        self,
+        redis: "aioredis.Redis[Any]",
+        fallback: LRUMemoryBackend,
+        retry_interval: float,
+        *,
+        redis_available: bool = True,
+    ) -> None:
+        self.redis = redis
+        self.primary = RedisBackend(redis)
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self._tier: CacheTier = "redis" if redis_available else "memory"
+        self._demoted_at: float | None = None if redis_available else time.time()
+        self._next_probe = 0.0 if redis_available else time.monotonic() + retry_interval
+        self._probe_task: asyncio.Task[None] | None = None
+        self._missed_clear = False
+        self.demotions = 0 if redis_available else 1
+        self.promotions = 0
 
-async def init_cache() -> None:
-    """Initialize cache backend."""
+    @property
+    def tier(self) -> CacheTier:
+        return self._tier
+
+    def _demote(self, exc: Exception) -> None:
+        if self._tier == "redis":
+            logger.warning("Cache falling back to in-memory tier: %s", exc)
+            self._tier = "memory"
+            self._demoted_at = time.time()
+            self.demotions += 1
+        self._next_probe = time.monotonic() + self.retry_interval
+
+    def _maybe_probe(self) -> None:
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        if time.monotonic() < self._next_probe:
+            return
+        self._next_probe = time.monotonic() + self.retry_interval
+        self._probe_task = asyncio.create_task(self._probe())
+
+    async def _probe(self) -> None:
+        try:
+            await self.redis.ping()
+        except (RedisError, OSError):
+            return
+        if self._missed_clear:
+            try:
+                await self.primary.clear(namespace=settings.CACHE_KEY_PREFIX)
+            except (RedisError, OSError):
+                return
+            self._missed_clear = False
+        logger.info("Redis reachable again, cache re-promoted to Redis tier")
+        await self.fallback.clear(namespace=settings.CACHE_KEY_PREFIX)
+        self._tier = "redis"
+        self._demoted_at = None
+        self.promotions += 1
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        if self._tier == "redis":
+            try:
+                return await self.primary.get_with_ttl(key)
+            except (RedisError, OSError) as e:
+                self._demote(e)
+        self._maybe_probe()
+        return await self.fallback.get_with_ttl(key)
+
+    async def get(self, key: str) -> bytes | None:
+        if self._tier == "redis":
+            try:
+                return await self.primary.get(key)
+            except (RedisError, OSError) as e:
+                self._demote(e)
+        self._maybe_probe()
+        return await self.fallback.get(key)
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        if self._tier == "redis":
+            try:
+                await self.primary.set(key, value, expire)
+                return
+            except (RedisError, OSError) as e:
+                self._demote(e)
+        self._maybe_probe()
+        await self.fallback.set(key, value, expire)
+
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        # Always clear the memory tier too, so a later demotion cannot
+        # resurrect entries that were invalidated while Redis was healthy.
+        count = await self.fallback.clear(namespace, key)
+        if self._tier == "redis":
+            try:
+                return await self.primary.clear(namespace, key)
+            except (RedisError, OSError) as e:
+                self._demote(e)
+        # Redis may still hold what this clear was meant to drop
+        self._missed_clear = True
+        self._maybe_probe()
+        return count
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "tier": self._tier,
+            "degraded": self._tier != "redis",
+            "degraded_since": self._demoted_at,
+            "memory_entries": len(self.fallback),
+            "memory_max_entries": self.fallback.max_entries,
+            "demotions": self.demotions,
+            "promotions": self.promotions,
+        }
+
+
+_backend: TieredCacheBackend | None = None
+
+
+async def init_cache(redis: "aioredis.Redis[Any]") -> None:
+    """Initialize cache backend on the shared Redis client.
+
+    Redis is the primary tier. If it is unreachable at startup, or fails
+    later on, the cache keeps working from a bounded in-process LRU and is
+    re-promoted to Redis automatically once it recovers.
+    """
+    global _backend
     try:
-        redis = aioredis.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
-        )
-        FastAPICache.init(RedisBackend(redis), prefix=settings.CACHE_KEY_PREFIX)
-    except Exception:
-        # In test environment or when Redis is unavailable, skip cache initialization
-        # This allows tests to run without Redis connection
-        pass
+        await redis.ping()
+        redis_available = True
+    except (RedisError, OSError):
+        # In test environment or when Redis is unavailable, start on the
+        # memory tier; the backend will probe Redis in the background
+        logger.warning("Redis unavailable at startup, using in-memory cache tier")
+        redis_available = False
+
+    _backend = TieredCacheBackend(
+        redis,
+        LRUMemoryBackend(settings.CACHE_MEMORY_MAX_ENTRIES),
+        settings.CACHE_REDIS_RETRY_SECONDS,
+        redis_available=redis_available,
+    )
+    FastAPICache.init(_backend, prefix=settings.CACHE_KEY_PREFIX)
+
+
+def get_cache_status() -> dict[str, Any]:
+    """Report which cache tier is currently serving requests."""
+    if _backend is None:
+        return {"tier": None, "degraded": True}
+    return _backend.status()
 
 
 # Export cache decorator for easy use
-__all__ = ["cache", "init_cache"]
+__all__ = [
+    "LRUMemoryBackend",
+    "TieredCacheBackend",
+    "cache",
+    "get_cache_status",
+    "init_cache",
+]
@@ -68,6 +68,39 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional read replica. Read-only GET endpoints use it when it is set.
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None  # If None, uses POSTGRES_PORT
+    DB_REPLICA_MAX_LAG_SECONDS: float = 2.0  # Read from primary above this lag
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 1.0  # How long a lag measurement is trusted
+    DB_REPLICA_STICKY_SECONDS: int = 5  # Read-your-writes window after a user's write
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+psycopg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
+    # Server-side prepared statements (psycopg). A query is prepared after it has
+    # run DB_PREPARE_THRESHOLD times on a connection; None never prepares.
+    DB_PREPARE_THRESHOLD: int | None = 5
+    DB_PREPARED_MAX: int = 100  # Prepared statements kept per connection (LRU)
+    # Set when connecting through PgBouncer in transaction pooling mode: the next
+    # transaction may run on another server connection, so prepares are disabled
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Pagination: "window" returns page and total in one query via count(*) OVER (),
+    # "separate" issues a count query and a page query
+    PAGINATION_COUNT_MODE: Literal["window", "separate"] = "window"
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -108,9 +141,24 @@ class Settings(BaseSettings):
             return f"redis://:{self.REDIS_PASSWORD}@{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
+    # Shared Redis connection pool (cache, rate limiting, job queue)
+    REDIS_MAX_CONNECTIONS: int = 50  # Per worker process
+    REDIS_POOL_TIMEOUT_SECONDS: int = 2  # Wait for a free connection before failing
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5  # Fail fast instead of stalling requests
+
     # Cache configuration
     CACHE_EXPIRE_SECONDS: int = 300  # 5 minutes default
     CACHE_KEY_PREFIX: str = "app:cache:"
+    CACHE_MEMORY_MAX_ENTRIES: int = 10_000  # In-process LRU size used when Redis is down
+    CACHE_REDIS_RETRY_SECONDS: int = 15  # How often to probe Redis while degraded
+
+    # Cross-process invalidation of in-process caches (Redis pub/sub)
+    INVALIDATION_CHANNEL: str = "app:invalidation"
+    INVALIDATION_MAX_STALENESS_SECONDS: int = 5  # Flush interval while pub/sub is down
+
+    # Negative caching of ids that do not exist (per process)
+    NEGATIVE_CACHE_TTL_SECONDS: int = 30  # 0 disables negative caching
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 100_000
 
     # ARQ configuration
     ARQ_REDIS_URL: str | None = None  # If None, uses REDIS_URL
@@ -136,6 +184,19 @@ class Settings(BaseSettings):
     RATE_LIMIT_LOGIN: str = "5/minute"  # Login: 5 requests per minute
     RATE_LIMIT_REGISTER: str = "3/minute"  # Register: 3 requests per minute
     RATE_LIMIT_PASSWORD_RESET: str = "3/hour"  # Password reset: 3 requests per hour
+    RATE_LIMIT_KEY_PREFIX: str = "app:ratelimit:"
+    # "redis": one Redis script call per limited request. "leased": each worker
+    # admits from a local share of every key's budget and reports what it
+    # admitted every RATE_LIMIT_SYNC_SECONDS, with no Redis call per request
+    RATE_LIMIT_MODE: Literal["redis", "leased"] = "redis"
+    RATE_LIMIT_LEASE_FRACTION: float = 0.25  # Share of a key's remaining budget per worker lease
+    RATE_LIMIT_SYNC_SECONDS: float = 1.0  # Lease renewal interval in "leased" mode
+
+    # Admin (SQLAdmin) sessions, only used under /admin. "cookie" keeps the
+    # signed session data in the cookie, "redis" only a session id
+    ADMIN_SESSION_STORE: Literal["cookie", "redis"] = "cookie"
+    ADMIN_SESSION_MAX_AGE_SECONDS: int = 14 * 24 * 60 * 60
+    ADMIN_SESSION_KEY_PREFIX: str = "app:admin-session:"
 
     # Internationalization (i18n) configuration
     I18N_ENABLED: bool = True
@@ -155,6 +216,53 @@ class Settings(BaseSettings):
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "text/plain",
     ]  # Allowed MIME types
+    ARCHIVE_MAX_FILES: int = 1000  # Files per POST /files/archive request
+    BULK_DELETE_MAX_FILES: int = 10_000  # Files per DELETE /files/bulk request
+    DOWNLOAD_CHUNK_SIZE: int = 256 * 1024  # Streaming chunk when the server cannot pathsend
+    # Per-user download bandwidth in bytes per second by tier ("unverified",
+    # "verified", "superuser"), shared across workers through Redis; 0 is unlimited.
+    # Shaping is opt-in: every tier is unlimited by default, set e.g.
+    # {"unverified": 2097152, "verified": 10485760, "superuser": 0} to enable it
+    DOWNLOAD_BANDWIDTH_LIMITS: dict[str, int] = {
+        "unverified": 0,
+        "verified": 0,
+        "superuser": 0,
+    }
+    DOWNLOAD_BANDWIDTH_BURST_SECONDS: float = 2.0  # Bucket size, in seconds at the tier's rate
+    DOWNLOAD_BANDWIDTH_KEY_PREFIX: str = "app:bandwidth:"
+    # Optional zstd compression of stored uploads (needs the "zstd" extra)
+    UPLOAD_COMPRESSION_ENABLED: bool = False
+    UPLOAD_COMPRESSION_LEVEL: int = 3
+    # PDF and .docx are left out on purpose: .docx is already a ZIP archive and PDF
+    # streams are deflated, so zstd would spend CPU for next to no saving
+    UPLOAD_COMPRESSIBLE_TYPES: list[str] = ["text/plain", "application/msword"]
+    # Upload admission control, per worker process
+    UPLOAD_MAX_CONCURRENT: int = 8
+    UPLOAD_MAX_CONCURRENT_PER_USER: int = 2
+    UPLOAD_QUEUE_TIMEOUT_SECONDS: float = 10.0  # Wait for a free slot before 503
+    # Refuse uploads (507) while UPLOAD_DIR has less free space than this; 0 (the
+    # default) disables the check. Tune per deployment to the largest expected upload
+    # times UPLOAD_MAX_CONCURRENT plus headroom for the database and logs
+    UPLOAD_MIN_FREE_BYTES: int = 0
+    # Per user, superusers exempt; 0 (the default) disables, set e.g. 1 GiB to opt in
+    STORAGE_QUOTA_BYTES: int = 0
+    # Background removal of deleted uploads (user deletion, bulk file delete)
+    BLOB_CLEANUP_BATCH_SIZE: int = 200  # Files unlinked per batch
+    BLOB_CLEANUP_PAUSE_SECONDS: float = 0.5  # Pause between batches to spare disk IO
+    # Upload sweeper: removes orphaned blobs and rows whose blob is missing
+    SWEEP_CRON_HOUR: int = 3  # Daily run, worker local time
+    SWEEP_BATCH_SIZE: int = 1000  # Paths/rows reconciled per query
+    SWEEP_ORPHAN_GRACE_SECONDS: int = 3600  # Younger blobs may be uploads in progress
+    SWEEP_VERIFY_HASHES: bool = False  # Re-hash every blob and compare to file_hash
+    SWEEP_HASH_BYTES_PER_SECOND: int = 20 * 1024 * 1024  # Read cap while re-hashing
+    # Tiered storage: blobs not downloaded for a while move to a cheaper,
+    # compressed cold tier and are recalled on their next download
+    COLD_TIER_DIR: str | None = None  # Base directory of the cold tier; None disables tiering
+    COLD_TIER_AFTER_DAYS: int = 7  # Days since last download (or upload) before a blob is cold
+    COLD_TIER_COMPRESSION_LEVEL: int = 10  # zstd level for cold blobs (needs the "zstd" extra)
+    COLD_TIER_CRON_HOUR: int = 4  # Daily migration run, worker local time
+    COLD_TIER_BATCH_SIZE: int = 500  # Rows per query during migration
+    FILE_ACCESS_FLUSH_SECONDS: float = 60.0  # Write-behind interval for last download times
 
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
@@ -1,9 +1,39 @@
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, create_engine, select
 
 from app.core.config import settings
 from app.models import User
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def get_prepare_threshold() -> int | None:
+    """Executions before psycopg prepares a query server-side (None: never)."""
+    if settings.DB_PGBOUNCER_MODE:
+        # Prepared statements live on one server connection; with transaction
+        # pooling the next execution may land on a connection that lacks them
+        return None
+    return settings.DB_PREPARE_THRESHOLD
+
+
+def create_db_engine(url: str, prepare_threshold: int | None) -> Engine:
+    """Create an engine whose psycopg connections prepare hot queries."""
+    db_engine = create_engine(url, connect_args={"prepare_threshold": prepare_threshold})
+
+    @event.listens_for(db_engine, "connect")
+    def _set_prepared_max(dbapi_connection: Any, _connection_record: Any) -> None:
+        dbapi_connection.prepared_max = settings.DB_PREPARED_MAX
+
+    return db_engine
+
+
+engine = create_db_engine(str(settings.SQLALCHEMY_DATABASE_URI), get_prepare_threshold())
+
+# Request sessions keep loaded attributes after commit, so CRUD functions can
+# return the rows they just wrote without a refresh SELECT. Inserts still pick
+# up any server-generated values through RETURNING (eager_defaults="auto").
+SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -7,6 +7,7 @@ from typing import Callable
 from fastapi import Request
 
 from app.core.config import settings
+from app.core.invalidation import invalidate, invalidation_bus
 
 
 class I18n:
@@ -97,6 +98,20 @@ def get_i18n() -> I18n:
     return _i18n_instance
 
 
+def _drop_i18n_instance(_key: str | None) -> None:
+    """Forget the loaded catalogs; they are reloaded on next use."""
+    global _i18n_instance
+    _i18n_instance = None
+
+
+invalidation_bus.register("i18n", _drop_i18n_instance)
+
+
+def reload_translations() -> None:
+    """Reload translation catalogs in every worker process."""
+    invalidate("i18n")
+
+
 def get_locale(request: Request) -> str:
     """Get locale from request."""
     return get_i18n().get_locale_from_request(request)
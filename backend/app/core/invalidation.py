@@ -0,0 +1,177 @@
+"""Cross-process invalidation bus for in-process caches.
+
+Per-worker state (translation catalogs, cached rows, ...) registers a handler
+for a topic. ``invalidate(topic, key)`` runs the local handlers immediately
+and publishes a compact message on Redis pub/sub so every other worker and
+pod runs its handlers too.
+
+Pub/sub is fire-and-forget, so messages sent while a subscriber is
+disconnected are lost. The bus therefore flushes every registered cache
+when the subscription drops, again every ``INVALIDATION_MAX_STALENESS_SECONDS``
+while Redis stays down, and once more after it has resubscribed, so nothing
+cached during an outage outlives that bound. Handlers must keep a flush
+cheap, e.g. by dropping entries and reloading lazily.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Handlers receive the invalidated key, or None to drop everything
+InvalidationHandler = Callable[[str | None], None]
+
+
+class InvalidationBus:
+    """Publish/apply cache invalidations across processes."""
+
+    def __init__(self, channel: str, max_staleness: float) -> None:
+        self.channel = channel
+        self.max_staleness = max_staleness
+        self.origin = uuid.uuid4().hex
+        self.connected = False
+        self.published = 0
+        self.received = 0
+        self.resyncs = 0
+        self._handlers: dict[str, list[InvalidationHandler]] = defaultdict(list)
+        self._redis: aioredis.Redis[Any] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def register(self, topic: str, handler: InvalidationHandler) -> None:
+        """Run ``handler`` whenever ``topic`` is invalidated in any process."""
+        self._handlers[topic].append(handler)
+
+    def _apply(self, topic: str, key: str | None) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Invalidation handler for %r failed", topic)
+
+    def _apply_all(self) -> None:
+        for topic in list(self._handlers):
+            self._apply(topic, None)
+
+    def invalidate(self, topic: str, key: str | None = None) -> None:
+        """Invalidate ``key`` (or the whole ``topic``) here and on every other node.
+
+        Safe to call from the event loop and from threadpool workers (sync
+        routes and CRUD functions run there).
+        """
+        self._apply(topic, key)
+        if self._loop is None or self._redis is None:
+            return
+        message = json.dumps(
+            {"o": self.origin, "t": topic, "k": key}, separators=(",", ":")
+        )
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            task = self._loop.create_task(self._publish(message))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(self._publish(message), self._loop)
+
+    async def _publish(self, message: str) -> None:
+        assert self._redis is not None
+        try:
+            await self._redis.publish(self.channel, message)
+            self.published += 1
+        except (RedisError, OSError) as e:
+            # Remote nodes fall back to their staleness bound
+            logger.warning("Failed to publish invalidation: %s", e)
+
+    def _handle(self, data: bytes | str) -> None:
+        try:
+            message = json.loads(data)
+            origin, topic, key = message["o"], message["t"], message["k"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed invalidation message: %r", data)
+            return
+        if origin == self.origin:
+            return  # Already applied locally
+        self.received += 1
+        self._apply(topic, key)
+
+    async def _listen(self) -> None:
+        assert self._redis is not None
+        had_gap = False
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                if had_gap:
+                    # Anything published while we were away is lost
+                    self._apply_all()
+                    self.resyncs += 1
+                    had_gap = False
+                self.connected = True
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        self._handle(message["data"])
+            except (RedisError, OSError) as e:
+                if self.connected or not had_gap:
+                    logger.warning("Invalidation subscription lost: %s", e)
+                # Invalidations published meanwhile are lost, bound the staleness
+                self._apply_all()
+                self.connected = False
+                had_gap = True
+                await asyncio.sleep(self.max_staleness)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self, redis: "aioredis.Redis[Any]") -> None:
+        """Start listening for invalidations from other processes."""
+        self._redis = redis
+        self._loop = asyncio.get_running_loop()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and forget the Redis client."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        self._redis = None
+        self._loop = None
+        self.connected = False
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "topics": sorted(self._handlers),
+            "published": self.published,
+            "received": self.received,
+            "resyncs": self.resyncs,
+        }
+
+
+invalidation_bus = InvalidationBus(
+    settings.INVALIDATION_CHANNEL, settings.INVALIDATION_MAX_STALENESS_SECONDS
+)
+
+
+def invalidate(topic: str, key: str | None = None) -> None:
+    """Invalidate ``key`` in ``topic`` across all processes."""
+    invalidation_bus.invalidate(topic, key)
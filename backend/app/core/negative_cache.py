@@ -0,0 +1,96 @@
+"""Short-lived, per-process cache of primary keys known not to exist.
+
+Scrapers and broken clients repeatedly request random ids. Remembering a
+miss for ``NEGATIVE_CACHE_TTL_SECONDS`` answers the repeats without a
+database round trip. Entries are dropped, in every worker, through the
+invalidation bus as soon as a row with that id is created.
+
+A lookup can miss, then lose the race with a creation whose invalidation
+arrives before the miss is recorded. Callers therefore take the table's
+``generation()`` before querying and pass it to ``add``, which ignores the
+miss if anything in the table was invalidated in the meantime.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+
+class NegativeCache:
+    """Bounded TTL set of ``(table, id)`` pairs that were looked up and missed."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._entries: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        # CRUD functions run in threadpool workers
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def contains(self, table: str, id: uuid.UUID | str) -> bool:
+        """Return True if ``id`` recently missed in ``table``."""
+        if not self.enabled:
+            return False
+        key = (table, str(id))
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False
+            self.hits += 1
+            return True
+
+    def generation(self, table: str) -> int:
+        """Count of invalidations seen for ``table``; take it before the lookup."""
+        return self._generations.get(table, 0)
+
+    def add(self, table: str, id: uuid.UUID | str, generation: int) -> None:
+        """Remember that ``id`` does not exist in ``table``.
+
+        Ignored if ``table`` was invalidated since ``generation`` was taken:
+        the row may have been created after the lookup missed.
+        """
+        if not self.enabled:
+            return
+        key = (table, str(id))
+        with self._lock:
+            if self._generations.get(table, 0) != generation:
+                return
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, table: str, id: str | None) -> None:
+        """Forget one id, or every id of ``table`` when ``id`` is None."""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            if id is not None:
+                self._entries.pop((table, id), None)
+                return
+            for key in [k for k in self._entries if k[0] == table]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+negative_cache = NegativeCache(
+    settings.NEGATIVE_CACHE_TTL_SECONDS, settings.NEGATIVE_CACHE_MAX_ENTRIES
+)
+
+for _table in ("user", "item", "file"):
+    invalidation_bus.register(
+        _table, lambda key, table=_table: negative_cache.discard(table, key)
+    )
@@ -1,17 +1,139 @@
-"""Rate limiting configuration using slowapi."""
+"""Request rate limiting with the generic cell rate algorithm (GCRA).
 
-# Patch slowapi's default handler BEFORE any slowapi imports
-# This fixes the issue where AuthenticationError doesn't have 'detail' attribute
-# Must be done before importing slowapi.middleware which caches the handler
-import slowapi.extension
+Each limit such as ``"100/minute"`` becomes an emission interval (60s/100)
+and a burst of ``amount`` requests. Per key only the theoretical arrival
+time (TAT) of the next request is stored: a request is allowed if the TAT,
+after adding one interval, is no more than a full window ahead of now.
+Against Redis that is one ``EVALSHA`` of ``GCRA_SCRIPT`` per limit, on the
+shared async pool, using the Redis clock so workers agree on time.
 
-from fastapi import Request, status
+Limits are applied by ``app.middleware.RateLimitMiddleware``: routes
+decorated with ``@limiter.limit(...)`` get their own limits, every other
+route gets ``RATE_LIMIT_DEFAULT``. Keys are per route and client address.
+
+With ``RATE_LIMIT_MODE="leased"`` requests make no Redis calls. Each
+worker admits from a local lease of ``RATE_LIMIT_LEASE_FRACTION`` of a key's
+remaining budget, and every ``RATE_LIMIT_SYNC_SECONDS`` reports what it
+admitted and renews all its leases in one pipeline of ``LEASE_SCRIPT`` calls.
+Both scripts advance the same TAT, so admitted requests are always charged
+and the long-run rate holds. The price is over-admission within one sync
+interval: each of W workers may admit ``ceil(fraction * remaining)``
+requests for a key (at least one while anything remains, and
+``ceil(fraction * amount)`` for a key it has not seen yet), so a key can
+get up to ``W * ceil(fraction * remaining)`` where only ``remaining`` fit.
+The excess is charged as debt that delays the key's next leases.
+
+Redis errors are logged and counted (see ``/utils/health-check/rate-limit``)
+and the worker falls back to in-process counters for
+``REDIS_RETRY_SECONDS``, so limits still hold per worker.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar
+
+from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+from limits import RateLimitItem, parse_many
+from redis.exceptions import RedisError
+from starlette.types import Scope
 
 from app.core.config import settings
+from app.core.redis import InstrumentedRedis, create_redis_pool, get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 15.0  # How long to use local counters after a Redis error
+LOCAL_PRUNE_THRESHOLD = 10_000  # Drop expired local keys once there are this many
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# KEYS[1]: TAT key; ARGV: emission interval (ms), burst (requests).
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local new_tat = tat + interval
+local allow_at = new_tat - interval * burst
+if allow_at > now then
+  return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)}
+"""
+
+# KEYS[1]: TAT key; ARGV: emission interval (ms), burst (requests), requests
+# admitted locally since the last sync (charged even if over the limit).
+# Returns {remaining, retry_after_ms, reset_after_ms}.
+LEASE_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local used = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now) + interval * used
+if used > 0 then
+  redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now))
+end
+local remaining = math.max(0, math.floor((now - tat) / interval + burst))
+local retry_after = 0
+if remaining == 0 then
+  retry_after = math.ceil(tat + interval - interval * burst - now)
+end
+return {remaining, retry_after, math.ceil(tat - now)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of counting one request against one limit."""
+
+    allowed: bool
+    limit: RateLimitItem
+    remaining: int
+    retry_after: float  # Seconds until the next request would be allowed
+    reset_after: float  # Seconds until the full burst is available again
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit.amount),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(time.time() + self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+@dataclass
+class Lease:
+    """A worker's local share of one key's budget in "leased" mode."""
+
+    item: RateLimitItem
+    tokens: int  # Requests this worker may still admit before the next sync
+    used: int = 0  # Requests admitted since the last sync
+    retry_at: float = 0.0  # Monotonic time the shared budget has room again
+    reset_at: float = 0.0  # Monotonic time the shared budget is full again
+
+
+class RateLimitExceeded(HTTPException):
+    """A request went over one of its route's rate limits."""
+
+    def __init__(self, result: RateLimitResult) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(result.limit),
+            headers=result.headers(),
+        )
+        self.result = result
 
 
 def rate_limit_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -24,49 +146,285 @@ def rate_limit_exceeded_handler(request: Request, exc: Exception) -> JSONRespons
         error_message = str(exc.message)
     else:
         error_message = str(exc)
-    
+
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"error": f"Rate limit exceeded: {error_message}"},
+        headers=getattr(exc, "headers", None),
     )
 
 
-# Patch the handler before initializing Limiter
-slowapi.extension._rate_limit_exceeded_handler = rate_limit_exceeded_handler
+def client_address(scope: Scope) -> str:
+    """The rate limit key of the client, its IP address."""
+    client = scope.get("client")
+    return client[0] if client else "127.0.0.1"
 
-# Initialize limiter
-# Use in-memory storage if storage_uri points to memory:// or if Redis fails
-storage_uri = settings.RATE_LIMIT_STORAGE
-if storage_uri and storage_uri.startswith("memory://"):
-    # Use in-memory storage (for tests)
-    limiter = Limiter(
-        key_func=get_remote_address,
-        storage_uri=storage_uri,
-        default_limits=[settings.RATE_LIMIT_DEFAULT],
-        headers_enabled=True,
-    )
-else:
-    # Try Redis, fallback to memory if it fails
-    # Note: slowapi may try to connect during initialization
-    try:
-        limiter = Limiter(
-            key_func=get_remote_address,
-            storage_uri=storage_uri,
-            default_limits=[settings.RATE_LIMIT_DEFAULT],
-            headers_enabled=True,
-            swallow_errors=True,  # Swallow connection errors
+
+def route_name(handler: Callable[..., Any]) -> str:
+    return f"{handler.__module__}.{handler.__name__}"
+
+
+class RateLimiter:
+    """GCRA limits per route and client, in Redis with a local fallback."""
+
+    def __init__(
+        self,
+        storage_uri: str,
+        default_limits: list[str],
+        key_prefix: str,
+        enabled: bool = True,
+        mode: Literal["redis", "leased"] = "redis",
+        lease_fraction: float = 0.25,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self.storage_uri = storage_uri
+        self.default_limits = [
+            item for value in default_limits for item in parse_many(value)
+        ]
+        self.key_prefix = key_prefix
+        self.enabled = enabled
+        self.mode = mode
+        self.lease_fraction = lease_fraction
+        self.sync_interval = sync_interval
+        self.use_redis = not storage_uri.startswith("memory://")
+        self.allowed = 0
+        self.rejected = 0
+        self.redis_errors = 0
+        self.syncs = 0
+        self.synced_keys = 0
+        self._route_limits: dict[str, list[RateLimitItem]] = {}
+        self._local: dict[str, float] = {}
+        self._redis: InstrumentedRedis | None = None
+        self._script: Any = None
+        self._lease_script: Any = None
+        self._leases: dict[str, Lease] = {}
+        self._next_sync = 0.0
+        self._task: asyncio.Task[None] | None = None
+        self._redis_down_until = 0.0
+
+    def limit(self, limit_value: str) -> Callable[[F], F]:
+        """Decorator giving a route its own limits instead of the defaults."""
+        items = parse_many(limit_value)
+
+        def decorator(func: F) -> F:
+            self._route_limits[route_name(func)] = items
+            return func
+
+        return decorator
+
+    def limits_for(self, handler: Callable[..., Any]) -> list[RateLimitItem]:
+        return self._route_limits.get(route_name(handler), self.default_limits)
+
+    def _client(self) -> InstrumentedRedis:
+        # Share the application pool unless limits are stored elsewhere
+        if self.storage_uri == settings.REDIS_URL:
+            return get_redis()
+        if self._redis is None:
+            self._redis = InstrumentedRedis(create_redis_pool(self.storage_uri))
+        return self._redis
+
+    def _hit_local(self, key: str, item: RateLimitItem) -> RateLimitResult:
+        interval = item.get_expiry() / item.amount
+        now = time.monotonic()
+        if len(self._local) >= LOCAL_PRUNE_THRESHOLD:
+            self._local = {k: tat for k, tat in self._local.items() if tat > now}
+        tat = max(self._local.get(key, now), now)
+        allow_at = tat + interval - interval * item.amount
+        if allow_at > now:
+            return RateLimitResult(False, item, 0, allow_at - now, tat - now)
+        self._local[key] = tat + interval
+        remaining = int((now - allow_at) / interval)
+        return RateLimitResult(True, item, remaining, 0.0, tat + interval - now)
+
+    async def _hit_redis(self, key: str, item: RateLimitItem) -> RateLimitResult:
+        redis = self._client()
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(GCRA_SCRIPT)
+        interval_ms = item.get_expiry() * 1000 / item.amount
+        allowed, remaining, retry_ms, reset_ms = await self._script(
+            keys=[self.key_prefix + key], args=[interval_ms, item.amount]
         )
-    except Exception:
-        # Fallback to in-memory storage if Redis connection fails
-        limiter = Limiter(
-            key_func=get_remote_address,
-            storage_uri="memory://",
-            default_limits=[settings.RATE_LIMIT_DEFAULT],
-            headers_enabled=True,
+        return RateLimitResult(
+            bool(allowed),
+            item,
+            int(remaining),
+            int(retry_ms) / 1000,
+            int(reset_ms) / 1000,
+        )
+
+    def _lease_size(self, remaining: int) -> int:
+        return math.ceil(remaining * self.lease_fraction) if remaining > 0 else 0
+
+    def _hit_leased(self, key: str, item: RateLimitItem) -> RateLimitResult:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is None:
+            # Unknown key: assume a full budget until the next sync says otherwise
+            lease = self._leases[key] = Lease(item, self._lease_size(item.amount))
+        if lease.tokens <= 0:
+            retry_at = max(lease.retry_at, self._next_sync)
+            return RateLimitResult(
+                False, item, 0, max(0.0, retry_at - now), max(0.0, lease.reset_at - now)
+            )
+        lease.tokens -= 1
+        lease.used += 1
+        reset_after = (
+            max(lease.reset_at - now, 0.0)
+            + lease.used * item.get_expiry() / item.amount
         )
+        return RateLimitResult(True, item, lease.tokens, 0.0, reset_after)
+
+    async def sync(self) -> int:
+        """Report locally admitted requests and renew every lease ("leased" mode).
+
+        One pipeline round trip for all keys. Returns the number of keys
+        synced; on a Redis error the counts are kept for the next sync and
+        requests use local counters for ``REDIS_RETRY_SECONDS``.
+        """
+        self._next_sync = time.monotonic() + self.sync_interval
+        if not self._leases or time.monotonic() < self._redis_down_until:
+            return 0
+        leases = list(self._leases.items())
+        used = [lease.used for _, lease in leases]
+        for _, lease in leases:
+            lease.used = 0
+        try:
+            redis = self._client()
+            if (
+                self._lease_script is None
+                or self._lease_script.registered_client is not redis
+            ):
+                self._lease_script = redis.register_script(LEASE_SCRIPT)
+            async with redis.pipeline(transaction=False) as pipe:
+                for (key, lease), count in zip(leases, used, strict=True):
+                    interval_ms = lease.item.get_expiry() * 1000 / lease.item.amount
+                    await self._lease_script(
+                        keys=[self.key_prefix + key],
+                        args=[interval_ms, lease.item.amount, count],
+                        client=pipe,
+                    )
+                replies = await pipe.execute()
+        except (RedisError, RuntimeError, OSError) as e:
+            for (_, lease), count in zip(leases, used, strict=True):
+                lease.used += count
+            self.redis_errors += 1
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            logger.warning(
+                "Rate limiter using local counters for %.0fs: %s",
+                REDIS_RETRY_SECONDS,
+                e,
+            )
+            return 0
+        now = time.monotonic()
+        for (key, lease), count, (remaining, retry_ms, reset_ms) in zip(
+            leases, used, replies, strict=True
+        ):
+            if count == 0 and lease.used == 0 and int(reset_ms) <= 0:
+                del self._leases[key]  # Idle with a full budget, nothing to remember
+                continue
+            # Requests admitted during the round trip come out of the new lease
+            lease.tokens = self._lease_size(int(remaining)) - lease.used
+            lease.retry_at = now + int(retry_ms) / 1000
+            lease.reset_at = now + int(reset_ms) / 1000
+        self.syncs += 1
+        self.synced_keys += len(leases)
+        return len(leases)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync()
+
+    async def start(self) -> None:
+        """Start syncing leases in the background ("leased" mode only)."""
+        if (
+            self.enabled
+            and self.mode == "leased"
+            and self.use_redis
+            and self._task is None
+        ):
+            self._next_sync = time.monotonic() + self.sync_interval
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop syncing and report what was admitted since the last sync."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            await self.sync()
+
+    async def hit(self, key: str, item: RateLimitItem) -> RateLimitResult:
+        """Count one request for ``key`` against ``item``."""
+        if self.use_redis and time.monotonic() >= self._redis_down_until:
+            if self.mode == "leased":
+                return self._hit_leased(key, item)
+            try:
+                return await self._hit_redis(key, item)
+            except (RedisError, RuntimeError, OSError) as e:
+                # RuntimeError: the shared pool is not initialised (scripts, tests)
+                self.redis_errors += 1
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning(
+                    "Rate limiter using local counters for %.0fs: %s",
+                    REDIS_RETRY_SECONDS,
+                    e,
+                )
+        return self._hit_local(key, item)
+
+    async def check(
+        self, handler: Callable[..., Any], scope: Scope
+    ) -> RateLimitResult | None:
+        """Count a request to ``handler`` against each of its limits.
+
+        Returns the first limit exceeded, else the one with the fewest
+        requests remaining (None if the route has no limits).
+        """
+        name = route_name(handler)
+        client = client_address(scope)
+        tightest = None
+        for item in self.limits_for(handler):
+            key = f"{name}:{item.amount}/{item.get_expiry()}:{client}"
+            result = await self.hit(key, item)
+            if not result.allowed:
+                self.rejected += 1
+                return result
+            if tightest is None or result.remaining < tightest.remaining:
+                tightest = result
+        self.allowed += 1
+        return tightest
+
+    async def close(self) -> None:
+        """Close the client of a separate ``RATE_LIMIT_STORAGE_URI``, if any."""
+        if self._redis is not None:
+            await self._redis.aclose(close_connection_pool=True)
+            self._redis = None
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "storage": "redis" if self.use_redis else "memory",
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "redis_errors": self.redis_errors,
+            "mode": self.mode,
+            "leased_keys": len(self._leases),
+            "syncs": self.syncs,
+            "synced_keys": self.synced_keys,
+            "using_local_counters": not self.use_redis
+            or time.monotonic() < self._redis_down_until,
+            "local_keys": len(self._local),
+            "default_limits": [str(item) for item in self.default_limits],
+        }
+
 
-# Also patch slowapi.middleware's cached reference
-# slowapi.middleware imports _rate_limit_exceeded_handler at module level via:
-# from slowapi import Limiter, _rate_limit_exceeded_handler
-# So we need to patch it after slowapi.middleware is imported
-# This will be done in main.py after importing SlowAPIMiddleware
+limiter = RateLimiter(
+    settings.RATE_LIMIT_STORAGE,
+    [settings.RATE_LIMIT_DEFAULT],
+    settings.RATE_LIMIT_KEY_PREFIX,
+    enabled=settings.RATE_LIMIT_ENABLED,
+    mode=settings.RATE_LIMIT_MODE,
+    lease_fraction=settings.RATE_LIMIT_LEASE_FRACTION,
+    sync_interval=settings.RATE_LIMIT_SYNC_SECONDS,
+)
@@ -0,0 +1,164 @@
+"""Shared Redis connection pool.
+
+One bounded async connection pool is created in the application lifespan and
+shared by the cache backend and the ARQ job queue. The client is an
+``ArqRedis`` (a thin ``redis.asyncio.Redis`` subclass), so jobs can be
+enqueued on the same connections the cache uses.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import redis as redis_sync
+from arq.connections import ArqRedis
+from redis.asyncio import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+
+
+@dataclass
+class RedisStats:
+    """In-process counters for the shared Redis pool."""
+
+    commands: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    pool_waits: int = 0
+    pool_exhausted: int = 0
+
+    def record(self, latency: float) -> None:
+        self.commands += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    def snapshot(self) -> dict[str, Any]:
+        avg = self.total_latency / self.commands if self.commands else 0.0
+        return {
+            "commands": self.commands,
+            "errors": self.errors,
+            "avg_latency_ms": round(avg * 1000, 3),
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+            "pool_waits": self.pool_waits,
+            "pool_exhausted": self.pool_exhausted,
+        }
+
+
+stats = RedisStats()
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking pool that counts waits for, and timeouts on, a free connection."""
+
+    async def get_connection(
+        self, command_name: Any, *keys: Any, **options: Any
+    ) -> Any:
+        if not self.can_get_connection():
+            stats.pool_waits += 1
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                stats.pool_exhausted += 1
+            raise
+
+    def in_use(self) -> int:
+        return len(self._in_use_connections)
+
+
+class InstrumentedRedis(ArqRedis):
+    """ArqRedis client that records per-command latency."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record(time.perf_counter() - start)
+
+
+_pool: InstrumentedConnectionPool | None = None
+_redis: InstrumentedRedis | None = None
+_arq_redis: InstrumentedRedis | None = None
+
+
+def create_redis_pool(url: str | None = None) -> InstrumentedConnectionPool:
+    """Create a bounded async connection pool sized from settings."""
+    return InstrumentedConnectionPool.from_url(
+        url or settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        health_check_interval=30,
+    )
+
+
+def create_sync_redis_pool(url: str) -> redis_sync.BlockingConnectionPool:
+    """Create a bounded synchronous pool for clients that cannot use asyncio."""
+    return redis_sync.BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+
+
+async def init_redis() -> InstrumentedRedis:
+    """Create the shared Redis client. Connections are opened lazily."""
+    global _pool, _redis, _arq_redis
+    if _redis is None:
+        _pool = create_redis_pool()
+        _redis = InstrumentedRedis(_pool)
+        # ARQ only gets its own pool when ARQ_REDIS_URL points elsewhere
+        if settings.ARQ_REDIS_CONNECTION == settings.REDIS_URL:
+            _arq_redis = _redis
+        else:
+            _arq_redis = InstrumentedRedis(
+                create_redis_pool(settings.ARQ_REDIS_CONNECTION)
+            )
+    return _redis
+
+
+def get_redis() -> InstrumentedRedis:
+    """Get the shared Redis client created by ``init_redis``."""
+    if _redis is None:
+        raise RuntimeError("Redis pool is not initialized, call init_redis() first")
+    return _redis
+
+
+def get_arq_redis() -> InstrumentedRedis:
+    """Get the client used to enqueue ARQ jobs (the shared one by default)."""
+    if _arq_redis is None:
+        raise RuntimeError("Redis pool is not initialized, call init_redis() first")
+    return _arq_redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and disconnect every pooled connection."""
+    global _pool, _redis, _arq_redis
+    if _arq_redis is not None and _arq_redis is not _redis:
+        await _arq_redis.aclose(close_connection_pool=True)
+    if _redis is not None:
+        await _redis.aclose()
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = None
+    _redis = None
+    _arq_redis = None
+
+
+def get_redis_stats() -> dict[str, Any]:
+    """Report pool usage and command latency counters."""
+    result = stats.snapshot()
+    result["max_connections"] = settings.REDIS_MAX_CONNECTIONS
+    result["in_use_connections"] = _pool.in_use() if _pool is not None else 0
+    return result
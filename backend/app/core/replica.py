@@ -0,0 +1,131 @@
+"""Read-replica routing for read-only endpoints.
+
+Reads go to the replica unless:
+
+* no replica is configured,
+* the replica lags the primary by more than ``DB_REPLICA_MAX_LAG_SECONDS``
+  (or cannot be reached), or
+* the requesting user wrote something in the last
+  ``DB_REPLICA_STICKY_SECONDS`` (read-your-writes). The write marker lives
+  in Redis so it holds across workers and pods.
+"""
+
+import logging
+import threading
+import time
+
+import redis as redis_sync
+from redis.exceptions import RedisError
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import create_db_engine, engine, get_prepare_threshold
+from app.core.redis import create_sync_redis_pool
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "app:db:sticky:"
+
+# Replay lag, reported as 0 when the replica has replayed everything it
+# received (an idle primary would otherwise look like a growing lag)
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+replica_engine: Engine | None = None
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    replica_engine = create_db_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI), get_prepare_threshold()
+    )
+
+ReadSessionLocal = sessionmaker(
+    bind=replica_engine or engine,
+    class_=Session,
+    expire_on_commit=False,
+    info={"read_replica": replica_engine is not None},
+)
+
+_sticky_redis: "redis_sync.Redis[bytes] | None" = None
+if replica_engine is not None:
+    _sticky_redis = redis_sync.Redis(
+        connection_pool=create_sync_redis_pool(settings.REDIS_URL)
+    )
+
+
+class ReplicaLagMonitor:
+    """Measure replica lag, trusting each measurement for a short interval."""
+
+    def __init__(self, db_engine: Engine, check_interval: float) -> None:
+        self.engine = db_engine
+        self.check_interval = check_interval
+        self.lag: float | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current_lag(self) -> float | None:
+        """Replica lag in seconds, or None if the replica is unreachable."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self.lag
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return self.lag
+            try:
+                with self.engine.connect() as conn:
+                    self.lag = float(conn.execute(REPLICA_LAG_QUERY).scalar_one())
+            except SQLAlchemyError as e:
+                logger.warning("Read replica unavailable: %s", e)
+                self.lag = None
+            self._checked_at = time.monotonic()
+            return self.lag
+
+
+lag_monitor = (
+    ReplicaLagMonitor(replica_engine, settings.DB_REPLICA_LAG_CHECK_SECONDS)
+    if replica_engine is not None
+    else None
+)
+
+
+def replica_enabled() -> bool:
+    """True if reads may be routed to a replica (and writes must be tracked)."""
+    return lag_monitor is not None
+
+
+def mark_recent_write(user_id: str) -> None:
+    """Pin ``user_id``'s reads to the primary for the read-your-writes window."""
+    if _sticky_redis is None:
+        return
+    try:
+        _sticky_redis.set(
+            STICKY_KEY_PREFIX + user_id, b"1", ex=settings.DB_REPLICA_STICKY_SECONDS
+        )
+    except RedisError as e:
+        logger.warning("Failed to record recent write for replica routing: %s", e)
+
+
+def _wrote_recently(user_id: str) -> bool:
+    if _sticky_redis is None:
+        return False
+    try:
+        return bool(_sticky_redis.exists(STICKY_KEY_PREFIX + user_id))
+    except RedisError:
+        return True  # Cannot tell, so do not risk a stale read
+
+
+def use_replica(user_id: str | None) -> bool:
+    """Decide whether a read for ``user_id`` may be served by the replica."""
+    if lag_monitor is None:
+        return False
+    if user_id is not None and _wrote_recently(user_id):
+        return False
+    lag = lag_monitor.current_lag()
+    return lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+
+def is_replica_session(session: Session) -> bool:
+    """True if ``session`` reads from the replica (misses may just be lag)."""
+    return bool(session.info.get("read_replica"))
@@ -4,6 +4,7 @@ from typing import Any
 
 import jwt
 from passlib.context import CryptContext
+from starlette.requests import HTTPConnection
 
 from app.core.config import settings
 
@@ -28,6 +29,33 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+def get_token_subject(token: str) -> str | None:
+    """Return the ``sub`` claim of a valid access token, or None.
+
+    Accepts both our own tokens and fastapi-users tokens (which carry an
+    audience). Used for routing decisions, never for authorization.
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[ALGORITHM],
+            options={"verify_aud": False},
+        )
+    except jwt.PyJWTError:
+        return None
+    subject = payload.get("sub")
+    return str(subject) if subject else None
+
+
+def get_bearer_subject(conn: HTTPConnection) -> str | None:
+    """Return the ``sub`` of the request's bearer token, if it has a valid one."""
+    scheme, _, token = conn.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return get_token_subject(token)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -0,0 +1,137 @@
+"""Admission control for file uploads.
+
+Uploads are disk heavy: the multipart body is spooled to a temporary file
+and then copied into ``UPLOAD_DIR``. Unbounded bursts saturate disk IO and
+the aiofiles thread pool and starve downloads on the same node, so each
+process admits at most ``UPLOAD_MAX_CONCURRENT`` uploads (queueing the rest
+for up to ``UPLOAD_QUEUE_TIMEOUT_SECONDS``) and at most
+``UPLOAD_MAX_CONCURRENT_PER_USER`` per user. Uploads are refused outright
+while free space on ``UPLOAD_DIR`` is below ``UPLOAD_MIN_FREE_BYTES``, a
+watermark that is off (0) by default and tuned per deployment.
+
+The checks run in :class:`UploadLimitedRoute`, before the request body is
+read, so a rejected upload costs no disk IO at all.
+"""
+
+import asyncio
+import shutil
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.security import get_bearer_subject
+
+
+class UploadLimiter:
+    """Per-process and per-user upload concurrency limits with counters."""
+
+    def __init__(
+        self, max_concurrent: int, max_per_user: int, queue_timeout: float
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected_busy = 0
+        self.rejected_user = 0
+        self.rejected_disk = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._per_user: defaultdict[str, int] = defaultdict(int)
+
+    @asynccontextmanager
+    async def slot(self, user_id: str | None) -> AsyncIterator[None]:
+        """Hold an upload slot, or raise 429/503 if none can be had."""
+        if user_id is not None and self._per_user[user_id] >= self.max_per_user:
+            self.rejected_user += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent uploads",
+                headers={"Retry-After": "1"},
+            )
+        # Reserve the per-user slot before waiting so queued uploads count too
+        if user_id is not None:
+            self._per_user[user_id] += 1
+        try:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:  # Not the builtin TimeoutError before 3.11
+                self.rejected_busy += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Upload capacity exhausted, try again later",
+                    headers={"Retry-After": str(max(1, round(self.queue_timeout)))},
+                )
+            finally:
+                self.queued -= 1
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+                self.completed += 1
+                self._semaphore.release()
+        finally:
+            if user_id is not None:
+                self._per_user[user_id] -= 1
+                if not self._per_user[user_id]:
+                    del self._per_user[user_id]
+
+    def check_disk_space(self, directory: Path, min_free_bytes: int) -> None:
+        """Raise 507 if ``directory``'s filesystem is below the free-space watermark."""
+        if min_free_bytes <= 0:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        if shutil.disk_usage(directory).free < min_free_bytes:
+            self.rejected_disk += 1
+            raise HTTPException(
+                status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+                detail="Not enough storage space for uploads",
+            )
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "users_uploading": len(self._per_user),
+            "completed": self.completed,
+            "rejected_busy": self.rejected_busy,
+            "rejected_per_user": self.rejected_user,
+            "rejected_disk": self.rejected_disk,
+        }
+
+
+upload_limiter = UploadLimiter(
+    settings.UPLOAD_MAX_CONCURRENT,
+    settings.UPLOAD_MAX_CONCURRENT_PER_USER,
+    settings.UPLOAD_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+class UploadLimitedRoute(APIRoute):
+    """Route class that admits a request through ``upload_limiter`` first.
+
+    FastAPI reads the request body before resolving dependencies, so the
+    checks wrap the whole route handler instead of being a dependency.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            upload_limiter.check_disk_space(
+                Path(settings.UPLOAD_DIR), settings.UPLOAD_MIN_FREE_BYTES
+            )
+            async with upload_limiter.slot(get_bearer_subject(request)):
+                return await handler(request)
+
+        return limited_handler
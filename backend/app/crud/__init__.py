@@ -1,15 +1,28 @@
 from app.crud.file import (
     create_file,
-    delete_file,
+    delete_owned_file,
+    delete_owned_files,
+    get_cold_files,
     get_file,
     get_files,
+    get_owned_files,
+    move_file_blob,
+    record_file_accesses,
 )
 from app.crud.item import (
     create_item,
     delete_item,
+    delete_owned_item,
     get_item,
     get_items,
     update_item,
+    update_owned_item,
+)
+from app.crud.storage_usage import (
+    StorageQuotaExceededError,
+    get_storage_usage,
+    get_top_storage_consumers,
+    update_storage_usage,
 )
 from app.crud.user import (
     authenticate,
@@ -37,11 +50,23 @@ __all__ = [
     "get_item",
     "get_items",
     "update_item",
+    "update_owned_item",
     "delete_item",
+    "delete_owned_item",
     # File CRUD
     "create_file",
     "get_file",
     "get_files",
-    "delete_file",
+    "get_owned_files",
+    "delete_owned_file",
+    "delete_owned_files",
+    "record_file_accesses",
+    "get_cold_files",
+    "move_file_blob",
+    # Storage usage CRUD
+    "StorageQuotaExceededError",
+    "get_storage_usage",
+    "get_top_storage_consumers",
+    "update_storage_usage",
 ]
 
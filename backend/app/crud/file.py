@@ -1,68 +1,234 @@
 """CRUD operations for file management."""
 
 import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Any
 
-from sqlmodel import Session, select, func
+from sqlalchemy import bindparam, delete, or_, update
+from sqlmodel import Session, col, func, select
 
-from app.models.file import File, FileCreate
+from app.core.invalidation import invalidate
+from app.core.negative_cache import negative_cache
+from app.core.replica import is_replica_session
+from app.crud.pagination import paginate
+from app.crud.storage_usage import StorageQuotaExceededError, update_storage_usage
+from app.models.file import HOT_TIER, File, FileCreate
 
 
-def create_file(*, session: Session, file_create: FileCreate, owner_id: uuid.UUID) -> File:
-    """Create a new file record."""
+def create_file(
+    *,
+    session: Session,
+    file_create: FileCreate,
+    owner_id: uuid.UUID,
+    quota_bytes: int | None = None,
+) -> File:
+    """Create a new file record and count it towards the owner's storage.
+
+    Raises StorageQuotaExceededError (nothing is written) if ``quota_bytes``
+    is given and the file does not fit.
+    """
     file_data = file_create.model_dump()
     file_data["owner_id"] = owner_id
     db_file = File.model_validate(file_data)
+    try:
+        update_storage_usage(
+            session=session,
+            owner_id=owner_id,
+            bytes_delta=db_file.file_size,
+            files_delta=1,
+            quota_bytes=quota_bytes,
+        )
+    except StorageQuotaExceededError:
+        session.rollback()
+        raise
     session.add(db_file)
     session.commit()
-    session.refresh(db_file)
+    invalidate("file", str(db_file.id))
     return db_file
 
 
 def get_file(*, session: Session, file_id: uuid.UUID) -> File | None:
     """Get a file by ID."""
-    return session.get(File, file_id)
+    if negative_cache.contains("file", file_id):
+        return None
+    generation = negative_cache.generation("file")
+    db_file = session.get(File, file_id)
+    # A miss on a lagging replica may be a row that was just created
+    if db_file is None and not is_replica_session(session):
+        negative_cache.add("file", file_id, generation)
+    return db_file
+
+
+def get_owned_files(
+    *, session: Session, file_ids: list[uuid.UUID], owner_id: uuid.UUID | None
+) -> list[File]:
+    """Get the files in ``file_ids`` that belong to ``owner_id`` (None: any owner)."""
+    statement = select(File).where(col(File.id).in_(file_ids))
+    if owner_id is not None:
+        statement = statement.where(File.owner_id == owner_id)
+    return list(session.exec(statement))
 
 
 def get_files(
     *, session: Session, owner_id: uuid.UUID | None = None, skip: int = 0, limit: int = 100
 ) -> tuple[list[File], int]:
     """Get files with optional filtering by owner."""
+    statement = select(File).order_by(File.created_at.desc())
+    count_statement = select(func.count()).select_from(File)
     if owner_id:
-        count_statement = (
-            select(func.count())
-            .select_from(File)
-            .where(File.owner_id == owner_id)
+        statement = statement.where(File.owner_id == owner_id)
+        count_statement = count_statement.where(File.owner_id == owner_id)
+    return paginate(
+        session=session,
+        statement=statement,
+        count_statement=count_statement,
+        skip=skip,
+        limit=limit,
+    )
+
+
+def delete_owned_files(
+    *, session: Session, file_ids: list[uuid.UUID], owner_id: uuid.UUID | None
+) -> list[str]:
+    """Delete many file records in one ``DELETE ... RETURNING`` statement.
+
+    Only files belonging to ``owner_id`` (None: any owner) are deleted and
+    storage counters are adjusted in the same transaction. Blobs are left on
+    disk; the returned paths are for the caller to unlink.
+    """
+    statement = delete(File).where(col(File.id).in_(file_ids))
+    if owner_id is not None:
+        statement = statement.where(File.owner_id == owner_id)
+    deleted = session.execute(
+        statement.returning(File.file_path, File.file_size, File.owner_id)
+    ).all()
+    usage: dict[uuid.UUID, list[int]] = {}
+    for _, file_size, file_owner_id in deleted:
+        totals = usage.setdefault(file_owner_id, [0, 0])
+        totals[0] += file_size
+        totals[1] += 1
+    for file_owner_id, (freed, count) in usage.items():
+        update_storage_usage(
+            session=session, owner_id=file_owner_id, bytes_delta=-freed, files_delta=-count
+        )
+    session.commit()
+    return [file_path for file_path, _, _ in deleted]
+
+
+def delete_owned_file(
+    *, session: Session, file_id: uuid.UUID, owner_id: uuid.UUID | None
+) -> bool:
+    """Delete a file record in one ``DELETE ... RETURNING`` round trip, then its blob.
+
+    Only matches the file if it belongs to ``owner_id`` (pass None for
+    superusers). The row is removed before the blob so a crash can only
+    leave an orphaned blob, never a row pointing at a missing file.
+    Returns False when nothing was deleted.
+    """
+    statement = delete(File).where(File.id == file_id)
+    if owner_id is not None:
+        statement = statement.where(File.owner_id == owner_id)
+    deleted = session.execute(
+        statement.returning(File.file_path, File.file_size, File.owner_id)
+    ).first()
+    if deleted is None:
+        session.commit()
+        return False
+    file_path, file_size, file_owner_id = deleted
+    update_storage_usage(
+        session=session, owner_id=file_owner_id, bytes_delta=-file_size, files_delta=-1
+    )
+    session.commit()
+    Path(file_path).unlink(missing_ok=True)
+    return True
+
+
+def record_file_accesses(
+    *, session: Session, accesses: dict[tuple[uuid.UUID, uuid.UUID], datetime]
+) -> None:
+    """Set ``last_accessed_at`` for many files in one executemany round trip.
+
+    ``accesses`` maps ``(file_id, owner_id)`` to the access time. Times never
+    move backwards and files deleted in the meantime are skipped.
+    """
+    if not accesses:
+        return
+    table = File.__table__
+    statement = (
+        update(table)
+        .where(
+            table.c.id == bindparam("file_id"),
+            table.c.owner_id == bindparam("file_owner_id"),
+            or_(
+                table.c.last_accessed_at.is_(None),
+                table.c.last_accessed_at < bindparam("accessed_at"),
+            ),
         )
-        statement = (
-            select(File)
-            .where(File.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(File.created_at.desc())
+        .values(last_accessed_at=bindparam("accessed_at"))
+    )
+    # Same row order in every worker, so concurrent flushes cannot deadlock
+    params = [
+        {"file_id": file_id, "file_owner_id": owner_id, "accessed_at": accessed_at}
+        for (file_id, owner_id), accessed_at in sorted(
+            accesses.items(), key=lambda access: (access[0][1], access[0][0])
+        )
+    ]
+    session.execute(statement, params)
+    session.commit()
+
+
+def get_cold_files(
+    *,
+    session: Session,
+    accessed_before: datetime,
+    after_id: uuid.UUID | None = None,
+    limit: int = 100,
+) -> list[File]:
+    """Get hot files last downloaded (or, if never, uploaded) before ``accessed_before``.
+
+    Ordered by id; pass the last id seen as ``after_id`` for the next page.
+    """
+    statement = (
+        select(File)
+        .where(
+            File.storage_tier == HOT_TIER,
+            func.coalesce(File.last_accessed_at, File.created_at) < accessed_before,
+        )
+        .order_by(File.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        statement = statement.where(File.id > after_id)
+    return list(session.exec(statement))
+
+
+def move_file_blob(
+    *,
+    session: Session,
+    db_file: File,
+    file_path: str,
+    content_encoding: str | None,
+    storage_tier: str,
+) -> bool:
+    """Point a file row at a new copy of its blob.
+
+    Only updates the row if it still points at ``db_file.file_path``, so a
+    concurrent delete or move wins. Returns False when nothing was updated;
+    the caller then owns the new copy and should remove it.
+    """
+    result = session.execute(
+        update(File)
+        .where(
+            File.id == db_file.id,
+            File.owner_id == db_file.owner_id,
+            File.file_path == db_file.file_path,
         )
-    else:
-        count_statement = select(func.count()).select_from(File)
-        statement = (
-            select(File)
-            .offset(skip)
-            .limit(limit)
-            .order_by(File.created_at.desc())
+        .values(
+            file_path=file_path,
+            content_encoding=content_encoding,
+            storage_tier=storage_tier,
         )
-    
-    count = session.exec(count_statement).one()
-    files = session.exec(statement).all()
-    return list(files), count
-
-
-def delete_file(*, session: Session, db_file: File) -> None:
-    """Delete a file record and the actual file."""
-    # Delete the actual file from filesystem
-    file_path = Path(db_file.file_path)
-    if file_path.exists():
-        file_path.unlink()
-    
-    # Delete the database record
-    session.delete(db_file)
+        .execution_options(synchronize_session=False)
+    )
     session.commit()
+    return result.rowcount == 1
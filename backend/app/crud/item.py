@@ -1,8 +1,12 @@
 import uuid
-from typing import Any
 
-from sqlmodel import Session, select, func
+from sqlalchemy import delete, update
+from sqlmodel import Session, func, select
 
+from app.core.invalidation import invalidate
+from app.core.negative_cache import negative_cache
+from app.core.replica import is_replica_session
+from app.crud.pagination import paginate
 from app.models.item import Item, ItemCreate, ItemUpdate
 
 
@@ -11,38 +15,38 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
     session.commit()
-    session.refresh(db_item)
+    invalidate("item", str(db_item.id))
     return db_item
 
 
 def get_item(*, session: Session, item_id: uuid.UUID) -> Item | None:
     """Get an item by ID."""
-    return session.get(Item, item_id)
+    if negative_cache.contains("item", item_id):
+        return None
+    generation = negative_cache.generation("item")
+    item = session.get(Item, item_id)
+    # A miss on a lagging replica may be a row that was just created
+    if item is None and not is_replica_session(session):
+        negative_cache.add("item", item_id, generation)
+    return item
 
 
 def get_items(
     *, session: Session, skip: int = 0, limit: int = 100, owner_id: uuid.UUID | None = None
 ) -> tuple[list[Item], int]:
     """Get items with optional filtering by owner."""
+    statement = select(Item)
+    count_statement = select(func.count()).select_from(Item)
     if owner_id:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == owner_id)
-        )
-        statement = (
-            select(Item)
-            .where(Item.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-        )
-    else:
-        count_statement = select(func.count()).select_from(Item)
-        statement = select(Item).offset(skip).limit(limit)
-    
-    count = session.exec(count_statement).one()
-    items = session.exec(statement).all()
-    return list(items), count
+        statement = statement.where(Item.owner_id == owner_id)
+        count_statement = count_statement.where(Item.owner_id == owner_id)
+    return paginate(
+        session=session,
+        statement=statement,
+        count_statement=count_statement,
+        skip=skip,
+        limit=limit,
+    )
 
 
 def update_item(*, session: Session, db_item: Item, item_in: ItemUpdate) -> Item:
@@ -51,7 +55,6 @@ def update_item(*, session: Session, db_item: Item, item_in: ItemUpdate) -> Item
     db_item.sqlmodel_update(update_dict)
     session.add(db_item)
     session.commit()
-    session.refresh(db_item)
     return db_item
 
 
@@ -60,3 +63,43 @@ def delete_item(*, session: Session, db_item: Item) -> None:
     session.delete(db_item)
     session.commit()
 
+
+def update_owned_item(
+    *, session: Session, item_id: uuid.UUID, item_in: ItemUpdate, owner_id: uuid.UUID | None
+) -> Item | None:
+    """Update an item in one ``UPDATE ... RETURNING`` round trip.
+
+    Only matches the item if it belongs to ``owner_id`` (pass None for
+    superusers). Returns None when nothing matched; the caller decides
+    between 404 and 403.
+    """
+    update_dict = item_in.model_dump(exclude_unset=True)
+    if not update_dict:
+        statement = select(Item).where(Item.id == item_id)
+        if owner_id is not None:
+            statement = statement.where(Item.owner_id == owner_id)
+        return session.exec(statement).first()
+
+    statement = update(Item).where(Item.id == item_id)
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    statement = statement.values(**update_dict).returning(Item)
+    db_item = session.execute(statement).scalar_one_or_none()
+    session.commit()
+    return db_item
+
+
+def delete_owned_item(
+    *, session: Session, item_id: uuid.UUID, owner_id: uuid.UUID | None
+) -> bool:
+    """Delete an item in one ``DELETE ... RETURNING`` round trip.
+
+    Only matches the item if it belongs to ``owner_id`` (pass None for
+    superusers). Returns False when nothing was deleted.
+    """
+    statement = delete(Item).where(Item.id == item_id)
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    deleted_id = session.execute(statement.returning(Item.id)).scalar_one_or_none()
+    session.commit()
+    return deleted_id is not None
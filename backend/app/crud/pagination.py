@@ -0,0 +1,48 @@
+"""Offset pagination helpers shared by the list CRUD functions."""
+
+from typing import Any
+
+from sqlalchemy import Select
+from sqlmodel import Session, func
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.config import settings
+
+
+def paginate(
+    *,
+    session: Session,
+    statement: SelectOfScalar[Any],
+    count_statement: SelectOfScalar[int],
+    skip: int,
+    limit: int,
+) -> tuple[list[Any], int]:
+    """Return one page of ``statement`` and the total number of matching rows.
+
+    In ``"window"`` mode (the default) the total is computed by
+    ``count(*) OVER ()`` on the page query itself, so the page and the count
+    come back in a single round trip. ``count_statement`` is then only run
+    when the page is empty but ``skip`` is past the first page, because an
+    empty page has no row to carry the count.
+
+    In ``"separate"`` mode the count and page queries are issued one after
+    the other, which can be cheaper on very large tables where the window
+    forces Postgres to materialise every matching row before applying LIMIT.
+    """
+    if settings.PAGINATION_COUNT_MODE == "separate":
+        count = session.exec(count_statement).one()
+        rows = session.exec(statement.offset(skip).limit(limit)).all()
+        return list(rows), count
+
+    windowed: Select[Any] = (
+        statement.add_columns(func.count().over().label("total_count"))
+        .offset(skip)
+        .limit(limit)
+    )
+    # execute() rather than exec(): we need (entity, total) rows, not scalars
+    rows = session.execute(windowed).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if skip == 0:
+        return [], 0
+    return [], session.exec(count_statement).one()
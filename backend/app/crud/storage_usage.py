@@ -0,0 +1,74 @@
+"""CRUD operations for per-user storage accounting.
+
+``user_storage_usage`` holds one counter row per user. File CRUD functions
+adjust it in the same transaction as the file row, so the counter never
+drifts from the ``file`` table and totals can be read without scanning it.
+"""
+
+import uuid
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select
+
+from app.models.file import UserStorageUsage
+
+
+class StorageQuotaExceededError(Exception):
+    """Adding a file would take its owner over their storage quota."""
+
+
+def update_storage_usage(
+    *,
+    session: Session,
+    owner_id: uuid.UUID,
+    bytes_delta: int,
+    files_delta: int,
+    quota_bytes: int | None = None,
+) -> None:
+    """Atomically adjust ``owner_id``'s counters. Does not commit.
+
+    With ``quota_bytes`` the increment only applies if the new total stays
+    within the quota; otherwise :class:`StorageQuotaExceededError` is raised
+    and the caller should roll back. The upsert locks the counter row, so
+    concurrent uploads by the same user cannot both slip under the quota.
+    """
+    if quota_bytes is not None and bytes_delta > quota_bytes:
+        raise StorageQuotaExceededError
+    table = UserStorageUsage.__table__
+    statement = insert(table).values(
+        user_id=owner_id, bytes_used=bytes_delta, file_count=files_delta
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            "bytes_used": table.c.bytes_used + statement.excluded.bytes_used,
+            "file_count": table.c.file_count + statement.excluded.file_count,
+        },
+        where=(
+            table.c.bytes_used + statement.excluded.bytes_used <= quota_bytes
+            if quota_bytes is not None
+            else None
+        ),
+    )
+    updated = session.execute(statement.returning(table.c.user_id)).first()
+    if updated is None:
+        raise StorageQuotaExceededError
+
+
+def get_storage_usage(
+    *, session: Session, owner_id: uuid.UUID
+) -> UserStorageUsage | None:
+    """Get a user's storage counters (None if they never uploaded)."""
+    return session.get(UserStorageUsage, owner_id)
+
+
+def get_top_storage_consumers(
+    *, session: Session, limit: int = 20
+) -> list[UserStorageUsage]:
+    """Get the users storing the most bytes, largest first."""
+    statement = (
+        select(UserStorageUsage)
+        .order_by(col(UserStorageUsage.bytes_used).desc())
+        .limit(limit)
+    )
+    return list(session.exec(statement))
@@ -1,10 +1,14 @@
 import uuid
-from typing import Any
 
-from sqlmodel import Session, select, func
+from sqlmodel import Session, func, select
 
+from app.core.invalidation import invalidate
+from app.core.negative_cache import negative_cache
+from app.core.replica import is_replica_session
 from app.core.security import get_password_hash, verify_password
+from app.crud.pagination import paginate
 from app.models.user import User, UserCreate, UserUpdate
+from app.utils.tasks import enqueue_user_blob_cleanup
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -14,13 +18,20 @@ def create_user(*, session: Session, user_create: UserCreate) -> User:
     )
     session.add(db_obj)
     session.commit()
-    session.refresh(db_obj)
+    invalidate("user", str(db_obj.id))
     return db_obj
 
 
 def get_user(*, session: Session, user_id: uuid.UUID) -> User | None:
     """Get a user by ID."""
-    return session.get(User, user_id)
+    if negative_cache.contains("user", user_id):
+        return None
+    generation = negative_cache.generation("user")
+    user = session.get(User, user_id)
+    # A miss on a lagging replica may be a row that was just created
+    if user is None and not is_replica_session(session):
+        negative_cache.add("user", user_id, generation)
+    return user
 
 
 def get_user_by_email(*, session: Session, email: str) -> User | None:
@@ -31,12 +42,13 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
 
 def get_users(*, session: Session, skip: int = 0, limit: int = 100) -> tuple[list[User], int]:
     """Get users with pagination."""
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
-    
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-    return list(users), count
+    return paginate(
+        session=session,
+        statement=select(User),
+        count_statement=select(func.count()).select_from(User),
+        skip=skip,
+        limit=limit,
+    )
 
 
 def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> User:
@@ -50,7 +62,7 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> User
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
-    session.refresh(db_user)
+    invalidate("user", str(db_user.id))
     return db_user
 
 
@@ -59,14 +71,21 @@ def update_user_password(*, session: Session, db_user: User, new_password: str)
     db_user.hashed_password = get_password_hash(new_password)
     session.add(db_user)
     session.commit()
-    session.refresh(db_user)
+    invalidate("user", str(db_user.id))
     return db_user
 
 
 def delete_user(*, session: Session, db_user: User) -> None:
-    """Delete a user."""
+    """Delete a user.
+
+    Items and files are removed by ON DELETE CASCADE in the same statement;
+    the user's uploads are deleted from disk by a background job.
+    """
+    user_id = db_user.id
     session.delete(db_user)
     session.commit()
+    invalidate("user", str(user_id))
+    enqueue_user_blob_cleanup(user_id)
 
 
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
@@ -14,24 +14,19 @@ import sentry_sdk
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
 from app.admin import setup_admin
 from app.api.main import api_router
+from app.core.access_tracker import access_tracker
 from app.core.cache import init_cache
 from app.core.config import settings
 from app.core.i18n import get_i18n
+from app.core.invalidation import invalidation_bus
 from app.core.permissions import setup_permissions
-from app.core.rate_limit import limiter, rate_limit_exceeded_handler
-
-# Patch slowapi.middleware's cached reference to _rate_limit_exceeded_handler
-# slowapi.middleware imports it at module level, so we need to patch it after import
-import slowapi.middleware
-if hasattr(slowapi.middleware, "_rate_limit_exceeded_handler"):
-    slowapi.middleware._rate_limit_exceeded_handler = rate_limit_exceeded_handler
+from app.core.rate_limit import RateLimitExceeded, limiter, rate_limit_exceeded_handler
+from app.core.redis import close_redis, init_redis
+from app.middleware import RateLimitMiddleware
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -42,12 +37,21 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
-    await init_cache()  # init_cache handles errors internally
+    redis = await init_redis()  # Shared pool, connections are opened lazily
+    await init_cache(redis)  # init_cache handles errors internally
+    await invalidation_bus.start(redis)  # Reconnects on its own if Redis is down
+    await access_tracker.start()
+    await limiter.start()  # Lease syncing, only in RATE_LIMIT_MODE="leased"
     # Initialize i18n
     if settings.I18N_ENABLED:
         get_i18n()  # Initialize translations
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    await access_tracker.stop()  # Writes out pending access times
+    await invalidation_bus.stop()
+    await limiter.stop()
+    await limiter.close()
+    await close_redis()
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
@@ -65,30 +69,9 @@ if settings.RATE_LIMIT_ENABLED:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     
-    # Custom middleware to exclude health check from rate limiting
-    from starlette.middleware.base import BaseHTTPMiddleware
-    from starlette.requests import Request as StarletteRequest
-    from starlette.responses import Response
-    
-    class RateLimitMiddleware(SlowAPIMiddleware):
-        """Custom rate limit middleware that excludes health check endpoint."""
-        
-        async def dispatch(self, request: StarletteRequest, call_next):
-            # Exclude health check endpoint from rate limiting
-            if request.url.path.endswith("/health-check/") or request.url.path.endswith("/health-check"):
-                # Skip rate limiting for health check
-                return await call_next(request)
-            # Initialize view_rate_limit in request state for limiter decorators
-            if not hasattr(request.state, "view_rate_limit"):
-                request.state.view_rate_limit = None
-            # Apply rate limiting for other endpoints
-            return await super().dispatch(request, call_next)
-    
+    # Health check is exempt, see app.middleware.rate_limit
     app.add_middleware(RateLimitMiddleware)
 
-# Add session middleware for admin authentication
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
-
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -1,6 +1,7 @@
 """Middleware for the application."""
 
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.setup import setup_middleware
 
-__all__ = ["RequestIDMiddleware", "setup_middleware"]
+__all__ = ["RateLimitMiddleware", "RequestIDMiddleware", "setup_middleware"]
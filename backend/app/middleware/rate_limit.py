@@ -0,0 +1,80 @@
+"""Application-wide rate limiting middleware."""
+
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    RateLimiter,
+    RateLimitExceeded,
+    rate_limit_exceeded_handler,
+)
+
+# Matched exactly: monitoring must never be rate limited, nothing else is exempt
+EXEMPT_PATHS = frozenset(
+    {
+        f"{settings.API_V1_STR}/utils/health-check/",
+        f"{settings.API_V1_STR}/utils/health-check",
+    }
+)
+
+
+def find_route_handler(
+    routes: Sequence[BaseRoute], scope: Scope
+) -> Callable[..., Any] | None:
+    """The endpoint of the route that will handle ``scope``, if any."""
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "endpoint", None)
+    return None
+
+
+class RateLimitMiddleware:
+    """Apply the app's ``RateLimiter`` before the route runs.
+
+    Routes decorated with ``@limiter.limit`` get their own limits, all other
+    routes ``RATE_LIMIT_DEFAULT``. Rate limit headers are added to the start
+    message as it goes out, so responses are neither wrapped nor buffered.
+    Paths in ``EXEMPT_PATHS`` and unmatched paths skip the check entirely.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        app: Starlette = scope["app"]
+        limiter: RateLimiter = app.state.limiter
+        if not limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        handler = find_route_handler(app.routes, scope)
+        result = await limiter.check(handler, scope) if handler is not None else None
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+        if not result.allowed:
+            request = Request(scope, receive=receive, send=send)
+            response = rate_limit_exceeded_handler(request, RateLimitExceeded(result))
+            await response(scope, receive, send)
+            return
+
+        headers = result.headers()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,26 +1,42 @@
 """Request ID middleware for request tracking."""
 
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add a unique request ID to each request."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Add request ID to request and response headers."""
-        # Get request ID from header or generate new one
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+class RequestIDMiddleware:
+    """Middleware to add a unique request ID to each request.
 
-        # Add request ID to request state
-        request.state.request_id = request_id
+    Plain ASGI rather than ``BaseHTTPMiddleware``: no extra task or memory
+    stream per request, and streamed bodies pass through untouched.
+    """
 
-        # Process request
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        return response
+        # Get request ID from header or generate new one
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None:
+            request_id = str(uuid.uuid4())
+
+        # Add request ID to request state (request.state reads scope["state"])
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
@@ -12,9 +12,15 @@ from app.models.item import (
 )
 from app.models.file import (
     File,
+    FileArchiveRequest,
+    FileBulkDeletePublic,
+    FileBulkDeleteRequest,
     FileCreate,
     FilePublic,
     FilesPublic,
+    StorageUsagePublic,
+    StorageUsagesPublic,
+    UserStorageUsage,
 )
 from app.models.user import (
     UpdatePassword,
@@ -51,8 +57,14 @@ __all__ = [
     # File models
     "File",
     "FileCreate",
+    "FileArchiveRequest",
+    "FileBulkDeleteRequest",
+    "FileBulkDeletePublic",
     "FilePublic",
     "FilesPublic",
+    "UserStorageUsage",
+    "StorageUsagePublic",
+    "StorageUsagesPublic",
     # Common models
     "Message",
     "Token",
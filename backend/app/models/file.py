@@ -2,33 +2,76 @@
 
 import uuid
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
+from pydantic import Field as PydanticField
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field as SQLField, Relationship, SQLModel
 
+from app.models.ids import uuid7
+from app.models.partitioning import (
+    create_hash_partitions,
+    owner_partitioned_mapper_args,
+    owner_partitioned_table_args,
+)
+
 if TYPE_CHECKING:
     from app.models.user import User
 
+HOT_TIER = "hot"  # Under UPLOAD_DIR
+COLD_TIER = "cold"  # Under COLD_TIER_DIR
+
 
 class FileBase(SQLModel):
     """Base file model."""
     filename: str = SQLField(max_length=255)
     original_filename: str = SQLField(max_length=255)
-    file_path: str = SQLField(max_length=512)
+    file_path: str = SQLField(max_length=512, index=True)
     file_size: int
     content_type: str | None = SQLField(default=None, max_length=100)
     file_hash: str | None = SQLField(default=None, max_length=64)
+    # "zstd" if the blob is stored compressed; file_size and file_hash are
+    # always of the original bytes
+    content_encoding: str | None = SQLField(default=None, max_length=16)
     owner_id: uuid.UUID = SQLField(foreign_key="user.id", index=True)
 
 
 class File(FileBase, table=True):
-    """File database model."""
-    id: uuid.UUID = SQLField(default_factory=uuid.uuid4, primary_key=True)
+    """File database model, hash partitioned by owner_id on PostgreSQL."""
+    __table_args__ = owner_partitioned_table_args()
+
+    id: uuid.UUID = SQLField(default_factory=uuid7, primary_key=True)
+    owner_id: uuid.UUID = SQLField(
+        foreign_key="user.id", primary_key=True, index=True, ondelete="CASCADE"
+    )
     created_at: datetime = SQLField(default_factory=lambda: datetime.now(timezone.utc))
+    # Written behind in batches by app.core.access_tracker, may lag by
+    # FILE_ACCESS_FLUSH_SECONDS
+    last_accessed_at: datetime | None = SQLField(default=None)
+    storage_tier: str = SQLField(default=HOT_TIER, max_length=8)  # HOT_TIER or COLD_TIER
     
     owner: "User" = Relationship(back_populates="files")
 
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return owner_partitioned_mapper_args(cls.__table__)
+
+
+create_hash_partitions(File.__table__)
+
+
+class UserStorageUsage(SQLModel, table=True):
+    """Running total of a user's uploads, kept in step with the file table."""
+    __tablename__ = "user_storage_usage"  # type: ignore[assignment]
+
+    user_id: uuid.UUID = SQLField(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    bytes_used: int = SQLField(default=0, sa_type=BigInteger, index=True)
+    file_count: int = SQLField(default=0)
+
 
 class FileCreate(BaseModel):
     """File creation schema."""
@@ -38,6 +81,22 @@ class FileCreate(BaseModel):
     file_size: int
     content_type: str | None = None
     file_hash: str | None = None
+    content_encoding: str | None = None
+
+
+class FileArchiveRequest(BaseModel):
+    """Files to bundle into one ZIP download."""
+    file_ids: list[uuid.UUID] = PydanticField(min_length=1)
+
+
+class FileBulkDeleteRequest(BaseModel):
+    """Files to delete in one request."""
+    file_ids: list[uuid.UUID] = PydanticField(min_length=1)
+
+
+class FileBulkDeletePublic(BaseModel):
+    """Result of a bulk delete."""
+    deleted: int
 
 
 class FilePublic(BaseModel):
@@ -54,3 +113,15 @@ class FilesPublic(BaseModel):
     """Files list response."""
     data: list[FilePublic]
     count: int
+
+
+class StorageUsagePublic(BaseModel):
+    """Storage used by one user."""
+    user_id: uuid.UUID
+    bytes_used: int
+    file_count: int
+
+
+class StorageUsagesPublic(BaseModel):
+    """Top storage consumers."""
+    data: list[StorageUsagePublic]
@@ -1,8 +1,16 @@
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.models.ids import uuid7
+from app.models.partitioning import (
+    create_hash_partitions,
+    owner_partitioned_mapper_args,
+    owner_partitioned_table_args,
+)
+
 if TYPE_CHECKING:
     from app.models.user import User
 
@@ -24,13 +32,27 @@ class ItemUpdate(ItemBase):
 
 
 # Database model, database table inferred from class name
+# Hash partitioned by owner_id on PostgreSQL (see app.models.partitioning)
 class Item(ItemBase, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = owner_partitioned_table_args()
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     owner_id: uuid.UUID = Field(
-        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+        foreign_key="user.id",
+        primary_key=True,
+        index=True,
+        nullable=False,
+        ondelete="CASCADE",
     )
     owner: "User" = Relationship(back_populates="items")
 
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return owner_partitioned_mapper_args(cls.__table__)
+
+
+create_hash_partitions(Item.__table__)
+
 
 # Properties to return via API, id is always required
 class ItemPublic(ItemBase):
@@ -0,0 +1,44 @@
+"""Hash partitioning of owner-scoped tables.
+
+``item`` and ``file`` are partitioned by ``HASH (owner_id)`` on PostgreSQL, so
+queries filtered by owner only touch one partition. Postgres requires the
+partition key in every unique constraint, so the table primary key is
+``(id, owner_id)``; the ORM still identifies rows by ``id`` alone, which keeps
+``session.get(Item, id)`` working.
+"""
+
+from typing import Any
+
+from sqlalchemy import DDL, Table, event
+
+# Changing this requires a migration that re-partitions existing rows
+OWNER_HASH_PARTITIONS = 8
+
+
+def owner_partitioned_table_args() -> dict[str, Any]:
+    """``__table_args__`` for a table partitioned by ``HASH (owner_id)``."""
+    return {"postgresql_partition_by": "HASH (owner_id)"}
+
+
+def owner_partitioned_mapper_args(table: Table) -> dict[str, Any]:
+    """``__mapper_args__`` that keep ``id`` as the ORM identity."""
+    return {"primary_key": [table.c.id]}
+
+
+def create_hash_partitions(
+    table: Table, partitions: int = OWNER_HASH_PARTITIONS
+) -> None:
+    """Create the partitions of ``table`` whenever the table itself is created.
+
+    Only used by ``metadata.create_all()``; migrations create partitions
+    explicitly.
+    """
+    for remainder in range(partitions):
+        event.listen(
+            table,
+            "after_create",
+            DDL(
+                f'CREATE TABLE "{table.name}_p{remainder}" PARTITION OF "{table.name}" '
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            ).execute_if(dialect="postgresql"),
+        )
@@ -2,15 +2,27 @@
 
 import uuid
 from pathlib import Path
-from typing import Any
 
 from fastapi import HTTPException, UploadFile, status
 from sqlmodel import Session
 
 from app import crud
-from app.models.file import File, FileCreate, FilePublic, FilesPublic
+from app.core.access_tracker import access_tracker
+from app.core.config import settings
+from app.models.file import (
+    COLD_TIER,
+    HOT_TIER,
+    File,
+    FileCreate,
+    FilePublic,
+    FilesPublic,
+    StorageUsagePublic,
+    StorageUsagesPublic,
+)
 from app.models.user import User
-from app.utils.files import get_file_hash, get_file_info, save_upload_file
+from app.utils.archive import ArchiveMember
+from app.utils.files import save_upload_file
+from app.utils.tiering import copy_to_hot_tier
 
 
 class FileService:
@@ -21,29 +33,45 @@ class FileService:
         *, session: Session, upload_file: UploadFile, current_user: User
     ) -> FilePublic:
         """Upload a file."""
+        quota_bytes = FileService._quota_for(current_user)
+        if quota_bytes is not None and upload_file.size is not None:
+            # Reject before writing any bytes to UPLOAD_DIR
+            usage = crud.get_storage_usage(session=session, owner_id=current_user.id)
+            if (usage.bytes_used if usage else 0) + upload_file.size > quota_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Storage quota exceeded",
+                )
         try:
-            # Save file to filesystem (async)
-            file_path = await save_upload_file(upload_file, user_id=str(current_user.id))
-            
-            # Get file information
-            file_info = get_file_info(file_path)
-            
-            # Calculate file hash
-            file_hash = get_file_hash(file_path)
-            
+            # Save file to filesystem (async), hashing it on the way
+            stored = await save_upload_file(upload_file, user_id=str(current_user.id))
+            file_path = stored.path
+
             # Create file record
             file_create = FileCreate(
                 filename=file_path.name,
                 original_filename=upload_file.filename or "file",
                 file_path=str(file_path),
-                file_size=file_info["size"],
+                file_size=stored.size,
                 content_type=upload_file.content_type,
-                file_hash=file_hash,
-            )
-            
-            db_file = crud.create_file(
-                session=session, file_create=file_create, owner_id=current_user.id
+                file_hash=stored.sha256,
+                content_encoding=stored.content_encoding,
             )
+
+            try:
+                db_file = crud.create_file(
+                    session=session,
+                    file_create=file_create,
+                    owner_id=current_user.id,
+                    quota_bytes=quota_bytes,
+                )
+            except crud.StorageQuotaExceededError:
+                # A concurrent upload used up the remaining quota
+                file_path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Storage quota exceeded",
+                )
             return FilePublic(
                 id=db_file.id,
                 filename=db_file.filename,
@@ -52,7 +80,9 @@ class FileService:
                 content_type=db_file.content_type,
                 created_at=db_file.created_at,
             )
-            
+
+        except HTTPException:
+            raise
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -64,6 +94,28 @@ class FileService:
                 detail=f"Failed to upload file: {str(e)}",
             )
 
+    @staticmethod
+    def _quota_for(user: User) -> int | None:
+        """Storage quota in bytes for ``user``, None if unlimited."""
+        if user.is_superuser or settings.STORAGE_QUOTA_BYTES <= 0:
+            return None
+        return settings.STORAGE_QUOTA_BYTES
+
+    @staticmethod
+    def get_top_storage_consumers(*, session: Session, limit: int = 20) -> StorageUsagesPublic:
+        """List the users storing the most bytes, read from the usage counters."""
+        usages = crud.get_top_storage_consumers(session=session, limit=limit)
+        return StorageUsagesPublic(
+            data=[
+                StorageUsagePublic(
+                    user_id=usage.user_id,
+                    bytes_used=usage.bytes_used,
+                    file_count=usage.file_count,
+                )
+                for usage in usages
+            ]
+        )
+
     @staticmethod
     def get_files(
         *, session: Session, current_user: User, skip: int = 0, limit: int = 100
@@ -104,7 +156,7 @@ class FileService:
             )
 
         return db_file
-    
+
     @staticmethod
     def get_file_public(*, session: Session, file_id: uuid.UUID, current_user: User) -> FilePublic:
         """Get a file by ID with access control. Returns FilePublic schema for API responses."""
@@ -119,19 +171,114 @@ class FileService:
         )
 
     @staticmethod
-    def delete_file(*, session: Session, file_id: uuid.UUID, current_user: User) -> dict[str, str]:
-        """Delete a file with access control."""
-        db_file = crud.get_file(session=session, file_id=file_id)
-        if not db_file:
+    def recall_file(*, session: Session, db_file: File) -> File:
+        """Bring a cold file's blob back to the hot tier; returns the current row.
+
+        ``session`` must be a primary session, ``db_file`` may come from a
+        replica. Blocking file IO, run it in a worker thread.
+        """
+        if db_file.storage_tier != COLD_TIER:
+            return db_file
+        cold_path = Path(db_file.file_path)
+        try:
+            hot_path = copy_to_hot_tier(cold_path, owner_id=db_file.owner_id)
+        except FileNotFoundError:
+            hot_path = None  # Recalled or deleted meanwhile, the primary knows which
+        moved = hot_path is not None and crud.move_file_blob(
+            session=session,
+            db_file=db_file,
+            file_path=str(hot_path),
+            content_encoding=db_file.content_encoding,
+            storage_tier=HOT_TIER,
+        )
+        if moved:
+            cold_path.unlink(missing_ok=True)
+        current = crud.get_file(session=session, file_id=db_file.id)
+        if not moved and hot_path is not None and (
+            current is None or current.file_path != str(hot_path)
+        ):
+            # Lost to a concurrent delete; a concurrent recall may share our path
+            hot_path.unlink(missing_ok=True)
+        if current is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
             )
+        return current
 
-        # Check access: superuser or owner
-        if not current_user.is_superuser and db_file.owner_id != current_user.id:
+    @staticmethod
+    def get_archive_members(
+        *, session: Session, file_ids: list[uuid.UUID], current_user: User
+    ) -> list[ArchiveMember]:
+        """Authorise ``file_ids`` in one query and describe them for a ZIP download."""
+        file_ids = list(dict.fromkeys(file_ids))  # Drop duplicates, keep order
+        if len(file_ids) > settings.ARCHIVE_MAX_FILES:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.ARCHIVE_MAX_FILES} files per archive",
             )
+        owner_id = None if current_user.is_superuser else current_user.id
+        files = {
+            db_file.id: db_file
+            for db_file in crud.get_owned_files(
+                session=session, file_ids=file_ids, owner_id=owner_id
+            )
+        }
+        if len(files) != len(file_ids):
+            # Missing and foreign files look the same, ids of others' files don't leak
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+            )
+        members = []
+        for file_id in file_ids:
+            db_file = files[file_id]
+            path = Path(db_file.file_path)
+            # Checked up front: once streaming starts the status is already sent
+            if not path.exists():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="File not found on disk"
+                )
+            # Counts as a download; cold blobs are read in place, not recalled
+            access_tracker.record(db_file.id, db_file.owner_id)
+            members.append(
+                ArchiveMember(
+                    path=path,
+                    name=db_file.original_filename,
+                    content_type=db_file.content_type,
+                    modified=db_file.created_at,
+                    content_encoding=db_file.content_encoding,
+                )
+            )
+        return members
 
-        crud.delete_file(session=session, db_file=db_file)
+    @staticmethod
+    def delete_files(
+        *, session: Session, file_ids: list[uuid.UUID], current_user: User
+    ) -> list[str]:
+        """Delete the caller's files among ``file_ids``; returns blob paths to unlink.
+
+        Ids that do not exist or belong to someone else are skipped.
+        """
+        if len(file_ids) > settings.BULK_DELETE_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.BULK_DELETE_MAX_FILES} files per request",
+            )
+        owner_id = None if current_user.is_superuser else current_user.id
+        return crud.delete_owned_files(
+            session=session, file_ids=list(set(file_ids)), owner_id=owner_id
+        )
+
+    @staticmethod
+    def delete_file(*, session: Session, file_id: uuid.UUID, current_user: User) -> dict[str, str]:
+        """Delete a file with access control."""
+        owner_id = None if current_user.is_superuser else current_user.id
+        if not crud.delete_owned_file(session=session, file_id=file_id, owner_id=owner_id):
+            # Only a miss needs a lookup to tell 404 from 403
+            if crud.get_file(session=session, file_id=file_id):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+            )
         return {"message": "File deleted successfully"}
@@ -1,11 +1,11 @@
 import uuid
-from typing import Any
+from typing import NoReturn
 
 from fastapi import HTTPException, status
 from sqlmodel import Session
 
 from app import crud
-from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, User
+from app.models import ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, User
 
 
 class ItemService:
@@ -55,36 +55,30 @@ class ItemService:
         *, session: Session, item_id: uuid.UUID, item_in: ItemUpdate, current_user: User
     ) -> ItemPublic:
         """Update an item with access control."""
-        item = crud.get_item(session=session, item_id=item_id)
+        # Ownership is enforced by the UPDATE itself; only a miss needs a lookup
+        owner_id = None if current_user.is_superuser else current_user.id
+        item = crud.update_owned_item(
+            session=session, item_id=item_id, item_in=item_in, owner_id=owner_id
+        )
         if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Item not found"
-            )
-
-        # Check access: superuser or owner
-        if not current_user.is_superuser and item.owner_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
-            )
-
-        updated_item = crud.update_item(session=session, db_item=item, item_in=item_in)
-        return updated_item
+            ItemService._raise_not_found_or_forbidden(session=session, item_id=item_id)
+        return item
 
     @staticmethod
     def delete_item(*, session: Session, item_id: uuid.UUID, current_user: User) -> dict[str, str]:
         """Delete an item with access control."""
-        item = crud.get_item(session=session, item_id=item_id)
-        if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Item not found"
-            )
+        owner_id = None if current_user.is_superuser else current_user.id
+        if not crud.delete_owned_item(session=session, item_id=item_id, owner_id=owner_id):
+            ItemService._raise_not_found_or_forbidden(session=session, item_id=item_id)
+        return {"message": "Item deleted successfully"}
 
-        # Check access: superuser or owner
-        if not current_user.is_superuser and item.owner_id != current_user.id:
+    @staticmethod
+    def _raise_not_found_or_forbidden(*, session: Session, item_id: uuid.UUID) -> NoReturn:
+        """Explain why an ownership-scoped mutation matched no row."""
+        if crud.get_item(session=session, item_id=item_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
             )
-
-        crud.delete_item(session=session, db_item=item)
-        return {"message": "Item deleted successfully"}
-
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Item not found"
+        )
@@ -0,0 +1 @@
+"""Background jobs run by the ARQ worker (``arq app.tasks.worker.WorkerSettings``)."""
@@ -0,0 +1,206 @@
+"""Reconcile ``UPLOAD_DIR`` with the ``file`` table.
+
+Uploads write the blob before inserting the row and deletes remove the row
+before the blob, so a crash can leave either side behind. The sweep runs in
+two streaming passes, each holding at most ``SWEEP_BATCH_SIZE`` paths or rows
+in memory:
+
+1. Walk ``UPLOAD_DIR`` (and ``COLD_TIER_DIR``, if set) and remove blobs no
+   row points to, once they are older than ``SWEEP_ORPHAN_GRACE_SECONDS``
+   (younger ones may be uploads whose row is not committed yet). Paths are
+   compared resolved, so a row stored under a relative ``UPLOAD_DIR`` still
+   matches its blob. If no blob under a directory matches any row, the
+   directory is skipped: that is far more likely a misconfigured directory
+   than a tier full of orphans, and removed blobs cannot be recovered.
+2. Walk the ``file`` table by primary key and delete rows whose blob is gone,
+   unless the row was repointed meanwhile (moved between storage tiers).
+   With ``verify_hashes`` the remaining blobs are re-hashed at a capped read
+   rate and mismatches are reported (not deleted).
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, tuple_
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.invalidation import invalidate
+from app.crud.storage_usage import update_storage_usage
+from app.models import File
+from app.utils.files import get_file_hash
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepReport:
+    blobs_scanned: int = 0
+    orphans_removed: int = 0
+    bytes_reclaimed: int = 0
+    rows_scanned: int = 0
+    missing_rows_removed: int = 0
+    hashes_verified: int = 0
+    hash_mismatches: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _iter_blob_batches(root: Path, batch_size: int) -> Iterator[list[os.DirEntry[str]]]:
+    batch: list[os.DirEntry[str]] = []
+    directories = [str(root)]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        batch.append(entry)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+        except FileNotFoundError:
+            continue
+    if batch:
+        yield batch
+
+
+def _lookup_paths(path: str) -> set[str]:
+    # Rows store the path as save_upload_file or tiering built it, relative or
+    # absolute depending on the directory setting at the time
+    absolute = os.path.abspath(path)
+    return {path, absolute, os.path.relpath(absolute), os.path.realpath(path)}
+
+
+def _known_paths(session: Session, batch: list[os.DirEntry[str]]) -> set[str]:
+    """The resolved paths in ``batch`` that a row points to."""
+    candidates = set().union(*(_lookup_paths(entry.path) for entry in batch))
+    rows = session.exec(
+        select(File.file_path).where(col(File.file_path).in_(candidates))
+    )
+    return {os.path.realpath(file_path) for file_path in rows}
+
+
+def _has_known_blob(session: Session, root: Path) -> bool:
+    for batch in _iter_blob_batches(root, settings.SWEEP_BATCH_SIZE):
+        if _known_paths(session, batch):
+            session.rollback()
+            return True
+    session.rollback()
+    return False
+
+
+def _remove_orphans(session: Session, report: SweepReport, root: Path) -> None:
+    # Stops at the first batch with a match, normally the first one
+    if not _has_known_blob(session, root):
+        logger.warning(
+            "Upload sweep: no blob under %s matches a file row, not removing any",
+            root,
+        )
+        return
+    cutoff = time.time() - settings.SWEEP_ORPHAN_GRACE_SECONDS
+    for batch in _iter_blob_batches(root, settings.SWEEP_BATCH_SIZE):
+        report.blobs_scanned += len(batch)
+        known = _known_paths(session, batch)
+        for entry in batch:
+            if os.path.realpath(entry.path) in known:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            report.orphans_removed += 1
+            report.bytes_reclaimed += stat.st_size
+        session.rollback()  # Do not hold a snapshot across batches
+
+
+def _reconcile_rows(session: Session, report: SweepReport, verify_hashes: bool) -> None:
+    last_id: uuid.UUID | None = None
+    while True:
+        statement = select(
+            File.id, File.file_path, File.file_hash, File.content_encoding
+        ).order_by(File.id)
+        if last_id is not None:
+            statement = statement.where(File.id > last_id)
+        rows = session.exec(statement.limit(settings.SWEEP_BATCH_SIZE)).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        report.rows_scanned += len(rows)
+
+        missing = []
+        for file_id, file_path, file_hash, content_encoding in rows:
+            path = Path(file_path)
+            if not path.exists():
+                missing.append((file_id, file_path))
+                continue
+            if verify_hashes and file_hash:
+                report.hashes_verified += 1
+                try:
+                    actual = get_file_hash(
+                        path,
+                        content_encoding=content_encoding,
+                        max_bytes_per_second=settings.SWEEP_HASH_BYTES_PER_SECOND,
+                    )
+                except FileNotFoundError:
+                    continue  # Deleted while we were looking
+                if actual != file_hash:
+                    report.hash_mismatches += 1
+                    logger.warning("Hash mismatch for file %s at %s", file_id, path)
+
+        if missing:
+            deleted = session.execute(
+                delete(File)
+                .where(tuple_(File.id, File.file_path).in_(missing))
+                .returning(File.id, File.owner_id, File.file_size)
+            ).all()
+            freed: Counter[uuid.UUID] = Counter()
+            removed: Counter[uuid.UUID] = Counter()
+            for _, owner_id, file_size in deleted:
+                freed[owner_id] += file_size
+                removed[owner_id] += 1
+            for owner_id in removed:
+                update_storage_usage(
+                    session=session,
+                    owner_id=owner_id,
+                    bytes_delta=-freed[owner_id],
+                    files_delta=-removed[owner_id],
+                )
+            session.commit()
+            report.missing_rows_removed += len(deleted)
+            for file_id, _, _ in deleted:
+                invalidate("file", str(file_id))
+        else:
+            session.rollback()
+
+
+def sweep_uploads(*, verify_hashes: bool = False) -> SweepReport:
+    """Run both sweep passes and return what was found and fixed."""
+    report = SweepReport()
+    with SessionLocal() as session:
+        _remove_orphans(session, report, Path(settings.UPLOAD_DIR))
+        if settings.COLD_TIER_DIR:
+            _remove_orphans(session, report, Path(settings.COLD_TIER_DIR))
+        _reconcile_rows(session, report, verify_hashes)
+    logger.info(
+        "Upload sweep: %d orphaned blobs removed (%d bytes reclaimed), "
+        "%d rows without a blob removed, %d hash mismatches",
+        report.orphans_removed,
+        report.bytes_reclaimed,
+        report.missing_rows_removed,
+        report.hash_mismatches,
+    )
+    return report
@@ -0,0 +1,80 @@
+"""Task definitions."""
+
+import asyncio
+import logging
+from typing import Any
+
+from app.core.config import settings
+from app.tasks.sweeper import sweep_uploads
+from app.tasks.tiering import migrate_cold_files
+from app.utils.files import delete_files_batch, delete_paths, get_user_upload_dir
+from app.utils.tiering import get_user_cold_dir
+
+logger = logging.getLogger(__name__)
+
+
+async def delete_user_blobs_task(_ctx: dict[str, Any], user_id: str) -> dict[str, int]:
+    """Remove a deleted user's uploads from ``UPLOAD_DIR`` and the cold tier.
+
+    Files are unlinked ``BLOB_CLEANUP_BATCH_SIZE`` at a time in a worker
+    thread, pausing ``BLOB_CLEANUP_PAUSE_SECONDS`` between batches so a large
+    account does not saturate the disk.
+    """
+    user_dirs = [get_user_upload_dir(user_id)]
+    if settings.COLD_TIER_DIR:
+        user_dirs.append(get_user_cold_dir(user_id))
+    batch_size = settings.BLOB_CLEANUP_BATCH_SIZE
+    removed = freed = 0
+    for user_dir in user_dirs:
+        while True:
+            count, size = await asyncio.to_thread(
+                delete_files_batch, user_dir, batch_size
+            )
+            removed += count
+            freed += size
+            if count < batch_size:
+                break
+            await asyncio.sleep(settings.BLOB_CLEANUP_PAUSE_SECONDS)
+        try:
+            user_dir.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Not empty: an upload raced the deletion, leave it to a later sweep
+            logger.warning("Could not remove %s: %s", user_dir, e)
+    logger.info(
+        "Removed %d files (%d bytes) of deleted user %s", removed, freed, user_id
+    )
+    return {"files_removed": removed, "bytes_freed": freed}
+
+
+async def delete_blobs_task(_ctx: dict[str, Any], paths: list[str]) -> dict[str, int]:
+    """Remove the blobs of file rows that were already deleted.
+
+    Throttled like ``delete_user_blobs_task``: ``BLOB_CLEANUP_BATCH_SIZE``
+    files per batch in a worker thread, ``BLOB_CLEANUP_PAUSE_SECONDS`` apart.
+    """
+    batch_size = settings.BLOB_CLEANUP_BATCH_SIZE
+    removed = 0
+    for start in range(0, len(paths), batch_size):
+        if start:
+            await asyncio.sleep(settings.BLOB_CLEANUP_PAUSE_SECONDS)
+        batch = paths[start : start + batch_size]
+        removed += await asyncio.to_thread(delete_paths, batch)
+    return {"files_removed": removed}
+
+
+async def sweep_uploads_task(
+    _ctx: dict[str, Any], verify_hashes: bool | None = None
+) -> dict[str, Any]:
+    """Reconcile ``UPLOAD_DIR`` with the ``file`` table (see app.tasks.sweeper)."""
+    if verify_hashes is None:
+        verify_hashes = settings.SWEEP_VERIFY_HASHES
+    report = await asyncio.to_thread(sweep_uploads, verify_hashes=verify_hashes)
+    return report.as_dict()
+
+
+async def migrate_cold_files_task(_ctx: dict[str, Any]) -> dict[str, Any]:
+    """Move files not downloaded for a while to the cold tier (see app.tasks.tiering)."""
+    report = await asyncio.to_thread(migrate_cold_files)
+    return report.as_dict()
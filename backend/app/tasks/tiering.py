@@ -0,0 +1,104 @@
+"""Move blobs that have not been downloaded for a while to the cold tier.
+
+Files whose ``last_accessed_at`` (or, if never downloaded, ``created_at``) is
+older than ``COLD_TIER_AFTER_DAYS`` are copied to ``COLD_TIER_DIR``,
+zstd-compressed where that helps, and their row is repointed at the copy
+before the hot blob is removed. The next download recalls the blob (see
+``FileService.recall_file``). Rows are walked by primary key,
+``COLD_TIER_BATCH_SIZE`` at a time.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.file import COLD_TIER, File
+from app.utils.tiering import copy_to_cold_tier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TieringReport:
+    files_scanned: int = 0
+    files_moved: int = 0
+    hot_bytes_freed: int = 0
+    cold_bytes_written: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _move_to_cold_tier(session: Session, db_file: File, report: TieringReport) -> None:
+    hot_path = Path(db_file.file_path)
+    try:
+        hot_size = hot_path.stat().st_size
+        cold_path, content_encoding = copy_to_cold_tier(
+            hot_path,
+            owner_id=db_file.owner_id,
+            content_type=db_file.content_type,
+            content_encoding=db_file.content_encoding,
+        )
+    except FileNotFoundError:
+        return  # Deleted meanwhile; a row without a blob is the sweeper's job
+    except OSError:
+        report.failures += 1
+        logger.exception("Could not copy file %s to the cold tier", db_file.id)
+        return
+    moved = crud.move_file_blob(
+        session=session,
+        db_file=db_file,
+        file_path=str(cold_path),
+        content_encoding=content_encoding,
+        storage_tier=COLD_TIER,
+    )
+    if not moved:
+        cold_path.unlink(missing_ok=True)
+        return
+    hot_path.unlink(missing_ok=True)
+    report.files_moved += 1
+    report.hot_bytes_freed += hot_size
+    report.cold_bytes_written += cold_path.stat().st_size
+
+
+def migrate_cold_files() -> TieringReport:
+    """Move every cold file to the cold tier; does nothing if COLD_TIER_DIR is unset."""
+    report = TieringReport()
+    if not settings.COLD_TIER_DIR:
+        return report
+    accessed_before = datetime.now(timezone.utc) - timedelta(
+        days=settings.COLD_TIER_AFTER_DAYS
+    )
+    with SessionLocal() as session:
+        last_id = None
+        while True:
+            files = crud.get_cold_files(
+                session=session,
+                accessed_before=accessed_before,
+                after_id=last_id,
+                limit=settings.COLD_TIER_BATCH_SIZE,
+            )
+            if not files:
+                break
+            last_id = files[-1].id
+            report.files_scanned += len(files)
+            for db_file in files:
+                _move_to_cold_tier(session, db_file, report)
+            session.expunge_all()  # Keep the identity map to one batch
+    logger.info(
+        "Cold tier migration: %d files moved, %d hot bytes freed, "
+        "%d cold bytes written, %d failures",
+        report.files_moved,
+        report.hot_bytes_freed,
+        report.cold_bytes_written,
+        report.failures,
+    )
+    return report
@@ -0,0 +1,47 @@
+"""ARQ worker configuration.
+
+Start with: ``arq app.tasks.worker.WorkerSettings``
+"""
+
+from arq import cron, func
+from arq.connections import RedisSettings
+
+from app.core.config import settings
+from app.tasks.tasks import (
+    delete_blobs_task,
+    delete_user_blobs_task,
+    migrate_cold_files_task,
+    sweep_uploads_task,
+)
+
+
+class WorkerSettings:
+    """Settings read by the ``arq`` CLI."""
+
+    functions = [
+        # Throttled on purpose, a large account can take a while
+        func(delete_user_blobs_task, timeout=3600),
+        func(delete_blobs_task, timeout=3600),
+        func(sweep_uploads_task, timeout=6 * 3600),
+        func(migrate_cold_files_task, timeout=6 * 3600),
+    ]
+    cron_jobs = [
+        cron(
+            sweep_uploads_task,
+            hour={settings.SWEEP_CRON_HOUR},
+            minute={0},
+            timeout=6 * 3600,
+            unique=True,
+        ),
+        cron(
+            migrate_cold_files_task,
+            hour={settings.COLD_TIER_CRON_HOUR},
+            minute={0},
+            timeout=6 * 3600,
+            unique=True,
+        ),
+    ]
+    redis_settings = RedisSettings.from_dsn(settings.ARQ_REDIS_CONNECTION)
+    max_jobs = 10
+    job_timeout = 300
+    keep_result = 3600
@@ -15,8 +15,11 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.core.db import engine
+from app.core.invalidation import invalidate
+from app.core.replica import mark_recent_write
 from app.core.security import ALGORITHM
 from app.models.user import User
+from app.utils.tasks import enqueue_user_blob_cleanup
 from app.utils.email import generate_new_account_email, send_email
 from fastapi_users import schemas
 
@@ -24,7 +27,7 @@ from fastapi_users import schemas
 # Database adapter
 # Note: fastapi-users expects async SQLAlchemy, but we use sync SQLModel
 # We'll create an adapter that wraps sync sessions to work with async fastapi-users
-SessionLocal = sessionmaker(bind=engine, class_=SQLAlchemySession)
+SessionLocal = sessionmaker(bind=engine, class_=SQLAlchemySession, expire_on_commit=False)
 
 
 class SyncSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
@@ -64,7 +67,8 @@ class SyncSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
                 user_instance = User(**user)
             self.session.add(user_instance)
             self.session.commit()
-            self.session.refresh(user_instance)
+            invalidate("user", str(user_instance.id))
+            mark_recent_write(str(user_instance.id))
             return user_instance
         return await run_in_threadpool(_create_sync)
     
@@ -76,15 +80,21 @@ class SyncSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
                 setattr(user, key, value)
             self.session.add(user)
             self.session.commit()
-            self.session.refresh(user)
+            invalidate("user", str(user.id))
+            # These writes bypass get_db, so pin the user's reads here
+            mark_recent_write(str(user.id))
             return user
         return await run_in_threadpool(_update_sync)
     
     async def delete(self, user: User) -> None:
         """Delete user (async wrapper for sync operation)."""
         def _delete_sync():
+            user_id = user.id
             self.session.delete(user)
             self.session.commit()
+            invalidate("user", str(user_id))
+            mark_recent_write(str(user_id))
+            enqueue_user_blob_cleanup(user_id)
         await run_in_threadpool(_delete_sync)
 
 
@@ -0,0 +1,107 @@
+"""Streaming ZIP archives."""
+
+import io
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from app.utils.compression import open_blob
+
+# Formats that are already compressed; deflating them again only burns CPU
+COMPRESSED_MEDIA_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/gif",
+        "application/pdf",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }
+)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB, same as uploads
+
+
+@dataclass
+class ArchiveMember:
+    path: Path
+    name: str
+    content_type: str | None
+    modified: datetime
+    content_encoding: str | None = None  # Stored encoding, decoded into the ZIP
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands written bytes back to the generator."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_names(members: list[ArchiveMember]) -> list[str]:
+    # Never let a stored filename pick a directory inside the archive
+    bases = [Path(member.name).name or "file" for member in members]
+    # A generated "name (1).ext" must not clash with a real member's name
+    reserved = set(bases)
+    used: set[str] = set()
+    counts: dict[str, int] = {}
+    names = []
+    for base in bases:
+        name = base
+        if name in used:
+            stem, suffix = Path(base).stem, Path(base).suffix
+            count = counts.get(base, 0)
+            while name in used or name in reserved:
+                count += 1
+                name = f"{stem} ({count}){suffix}"
+            counts[base] = count
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def stream_zip(members: Iterable[ArchiveMember]) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``members`` piece by piece.
+
+    Members are read ``CHUNK_SIZE`` at a time and every compressed chunk is
+    yielded as soon as it is produced, so memory use does not depend on file
+    or archive size and nothing is written to disk. Because the output is not
+    seekable, sizes and CRCs go in data descriptors after each member.
+    Already compressed formats are stored, everything else is deflated.
+    """
+    members = list(members)
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for member, name in zip(members, _unique_names(members), strict=True):
+            info = zipfile.ZipInfo(name, date_time=member.modified.timetuple()[:6])
+            if member.content_type in COMPRESSED_MEDIA_TYPES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            with (
+                open_blob(member.path, member.content_encoding) as src,
+                archive.open(info, "w", force_zip64=True) as dst,
+            ):
+                while chunk := src.read(CHUNK_SIZE):
+                    dst.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            # Data descriptor written when the member is closed
+            if data := sink.drain():
+                yield data
+    # Central directory written when the archive is closed
+    if data := sink.drain():
+        yield data
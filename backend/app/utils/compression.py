@@ -0,0 +1,88 @@
+"""Optional zstd compression of stored uploads.
+
+Requires the ``zstandard`` package (``pip install "app[zstd]"``). Without it,
+or with ``UPLOAD_COMPRESSION_ENABLED`` off, uploads are stored as sent.
+Compressed blobs get a ``.zst`` suffix and ``File.content_encoding = "zstd"``.
+"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZSTD = "zstd"
+ZSTD_SUFFIX = ".zst"
+
+if settings.UPLOAD_COMPRESSION_ENABLED and zstandard is None:
+    logger.warning(
+        "UPLOAD_COMPRESSION_ENABLED is set but zstandard is not installed, "
+        "uploads will be stored uncompressed"
+    )
+
+
+def should_compress(content_type: str | None) -> bool:
+    """Whether an upload of ``content_type`` should be stored zstd-compressed."""
+    return (
+        settings.UPLOAD_COMPRESSION_ENABLED
+        and zstandard is not None
+        and content_type in settings.UPLOAD_COMPRESSIBLE_TYPES
+    )
+
+
+def accepts_encoding(accept_encoding: str | None, encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header value allows ``encoding``."""
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            return not params or float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def zstd_available() -> bool:
+    """Whether the optional zstandard package is installed."""
+    return zstandard is not None
+
+
+def compressor(level: int | None = None) -> Any:
+    """A streaming zstd compression object (``compress()`` / ``flush()``).
+
+    ``level`` defaults to ``UPLOAD_COMPRESSION_LEVEL``.
+    """
+    assert zstandard is not None
+    if level is None:
+        level = settings.UPLOAD_COMPRESSION_LEVEL
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+def open_blob(path: Path, content_encoding: str | None) -> IO[bytes]:
+    """Open a stored blob for reading its original (decoded) bytes."""
+    f = open(path, "rb")
+    if content_encoding is None:
+        return f
+    if content_encoding != ZSTD or zstandard is None:
+        f.close()
+        raise RuntimeError(f"Cannot decode {content_encoding!r} blob {path}")
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)  # type: ignore[no-any-return]
+
+
+def iter_decoded(
+    path: Path, content_encoding: str | None, chunk_size: int
+) -> Iterator[bytes]:
+    """Yield a blob's original bytes ``chunk_size`` at a time."""
+    with open_blob(path, content_encoding) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
@@ -1,7 +1,11 @@
 """File upload and management utilities."""
 
 import hashlib
+import os
 import secrets
+import time
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +13,13 @@ import aiofiles
 from fastapi import UploadFile
 
 from app.core.config import settings
+from app.utils.compression import (
+    ZSTD,
+    ZSTD_SUFFIX,
+    compressor,
+    open_blob,
+    should_compress,
+)
 
 
 def get_upload_dir() -> Path:
@@ -18,6 +29,12 @@ def get_upload_dir() -> Path:
     return upload_dir
 
 
+def get_user_upload_dir(user_id: uuid.UUID | str) -> Path:
+    """Get the directory holding a user's uploads (not created)."""
+    # Parsing as a UUID rejects anything that could escape UPLOAD_DIR
+    return Path(settings.UPLOAD_DIR) / str(uuid.UUID(str(user_id)))
+
+
 def generate_secure_filename(original_filename: str) -> str:
     """Generate a secure filename to prevent directory traversal and conflicts."""
     # Get file extension
@@ -43,16 +60,29 @@ def is_allowed_file(filename: str, content_type: str | None = None) -> bool:
     return True
 
 
-async def save_upload_file(upload_file: UploadFile, user_id: str | None = None) -> Path:
+@dataclass
+class StoredUpload:
+    """Where and how an upload was stored."""
+    path: Path
+    size: int  # Original size, before compression
+    sha256: str  # Hash of the original bytes
+    content_encoding: str | None  # None if stored as sent
+
+
+async def save_upload_file(upload_file: UploadFile, user_id: str | None = None) -> StoredUpload:
     """Save uploaded file asynchronously.
-    
+
+    The size and SHA256 hash of the original bytes are computed while
+    writing, and compressible types are zstd-compressed on the way to disk
+    when upload compression is enabled.
+
     Args:
         upload_file: FastAPI UploadFile object
         user_id: Optional user ID for organizing files by user
-        
+
     Returns:
-        Path to saved file
-        
+        The stored file's path, original size, hash and content encoding
+
     Raises:
         ValueError: If file is not allowed or too large
     """
@@ -63,6 +93,7 @@ async def save_upload_file(upload_file: UploadFile, user_id: str | None = None)
     # Check file size (read in chunks to avoid loading entire file into memory)
     file_size = 0
     chunk_size = 1024 * 1024  # 1 MB chunks
+    sha256_hash = hashlib.sha256()
     
     # Create user-specific directory if user_id provided
     upload_dir = get_upload_dir()
@@ -72,6 +103,10 @@ async def save_upload_file(upload_file: UploadFile, user_id: str | None = None)
     
     # Generate secure filename
     secure_filename = generate_secure_filename(upload_file.filename or "file")
+    compress = should_compress(upload_file.content_type)
+    if compress:
+        secure_filename += ZSTD_SUFFIX
+        encoder = compressor()
     file_path = upload_dir / secure_filename
     
     # Save file asynchronously
@@ -83,12 +118,20 @@ async def save_upload_file(upload_file: UploadFile, user_id: str | None = None)
                 if file_path.exists():
                     file_path.unlink()
                 raise ValueError(f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE} bytes")
-            await f.write(chunk)
+            sha256_hash.update(chunk)
+            await f.write(encoder.compress(chunk) if compress else chunk)
+        if compress:
+            await f.write(encoder.flush())
     
     # Reset file pointer for potential reuse
     await upload_file.seek(0)
     
-    return file_path
+    return StoredUpload(
+        path=file_path,
+        size=file_size,
+        sha256=sha256_hash.hexdigest(),
+        content_encoding=ZSTD if compress else None,
+    )
 
 
 async def read_file(file_path: Path) -> bytes:
@@ -103,12 +146,75 @@ async def delete_file(file_path: Path) -> None:
         file_path.unlink()
 
 
-def get_file_hash(file_path: Path) -> str:
-    """Calculate SHA256 hash of file."""
+def delete_files_batch(directory: Path, limit: int) -> tuple[int, int]:
+    """Unlink up to ``limit`` regular files in ``directory``.
+
+    Returns:
+        Number of files removed and bytes freed
+    """
+    removed = freed = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if removed >= limit:
+                    break
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += size
+    except FileNotFoundError:
+        pass
+    return removed, freed
+
+
+def delete_paths(paths: list[str]) -> int:
+    """Unlink ``paths``, skipping ones already gone.
+
+    Returns:
+        Number of files removed
+    """
+    removed = 0
+    for path in paths:
+        try:
+            os.unlink(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def get_file_hash(
+    file_path: Path,
+    *,
+    content_encoding: str | None = None,
+    max_bytes_per_second: int | None = None,
+) -> str:
+    """Calculate SHA256 hash of file.
+
+    Args:
+        file_path: File to hash
+        content_encoding: Encoding the file is stored with; the hash is
+            always of the original bytes
+        max_bytes_per_second: Optional read rate cap, for background jobs
+            that should not compete with request traffic for disk IO
+    """
     sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
+    block_size = 4096 if max_bytes_per_second is None else 1024 * 1024
+    started = time.monotonic()
+    read = 0
+    with open_blob(file_path, content_encoding) as f:
+        for byte_block in iter(lambda: f.read(block_size), b""):
             sha256_hash.update(byte_block)
+            if max_bytes_per_second:
+                read += len(byte_block)
+                ahead = read / max_bytes_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
     return sha256_hash.hexdigest()
 
 
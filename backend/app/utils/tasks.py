@@ -0,0 +1,55 @@
+"""Task queue helpers."""
+
+import logging
+import uuid
+from typing import Any
+
+import anyio.from_thread
+from redis.exceptions import RedisError
+
+from app.core.redis import get_arq_redis
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_job(function: str, *args: Any, job_id: str | None = None) -> bool:
+    """Enqueue ``function`` on the ARQ worker; False if it was not queued."""
+    job = await get_arq_redis().enqueue_job(function, *args, _job_id=job_id)
+    # None means a job with the same id is already queued or running
+    return job is not None
+
+
+def enqueue_job_from_thread(
+    function: str, *args: Any, job_id: str | None = None
+) -> bool:
+    """Enqueue a job from sync code running in a threadpool worker.
+
+    Sync routes and CRUD functions run in anyio worker threads, so the
+    enqueue is handed back to the event loop that owns the Redis pool.
+    Failures are logged and reported as False, never raised.
+    """
+    try:
+        return anyio.from_thread.run(
+            lambda: enqueue_job(function, *args, job_id=job_id)
+        )
+    except (RuntimeError, RedisError, OSError) as e:
+        # RuntimeError: not in a worker thread, or Redis not initialised
+        logger.warning("Failed to enqueue %s%r: %s", function, args, e)
+        return False
+
+
+def enqueue_blob_deletion(paths: list[str]) -> bool:
+    """Queue removal of blobs whose rows were deleted.
+
+    If this fails the blobs are orphans, which the upload sweep removes.
+    """
+    if not paths:
+        return True
+    return enqueue_job_from_thread("delete_blobs_task", paths)
+
+
+def enqueue_user_blob_cleanup(user_id: uuid.UUID) -> bool:
+    """Queue removal of a deleted user's uploads."""
+    return enqueue_job_from_thread(
+        "delete_user_blobs_task", str(user_id), job_id=f"delete_user_blobs:{user_id}"
+    )
@@ -0,0 +1,92 @@
+"""Copying blobs between the hot (``UPLOAD_DIR``) and cold (``COLD_TIER_DIR``) tiers.
+
+Blobs are written under a temporary name in the target tier, fsynced and
+renamed into place. The source is left alone: callers repoint the row first
+and remove the source afterwards, so a crash leaves at worst an extra copy
+for the upload sweeper to collect.
+"""
+
+import os
+import secrets
+import uuid
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from app.core.config import settings
+from app.utils.archive import COMPRESSED_MEDIA_TYPES
+from app.utils.compression import ZSTD, ZSTD_SUFFIX, compressor, zstd_available
+from app.utils.files import get_user_upload_dir
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB, same as uploads
+
+
+def get_user_cold_dir(user_id: uuid.UUID | str) -> Path:
+    """Get the directory holding a user's cold blobs (not created)."""
+    if not settings.COLD_TIER_DIR:
+        raise RuntimeError("COLD_TIER_DIR is not set")
+    return Path(settings.COLD_TIER_DIR) / str(uuid.UUID(str(user_id)))
+
+
+def _read_chunks(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _compressed_chunks(path: Path, level: int) -> Iterator[bytes]:
+    encoder = compressor(level)
+    for chunk in _read_chunks(path):
+        if data := encoder.compress(chunk):
+            yield data
+    yield encoder.flush()
+
+
+def _write_atomically(target: Path, chunks: Iterable[bytes]) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Unique so concurrent recalls of one blob do not write the same temp file
+    temp = target.with_name(f".{target.name}.{secrets.token_hex(4)}.tmp")
+    try:
+        with open(temp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def copy_to_cold_tier(
+    path: Path,
+    *,
+    owner_id: uuid.UUID,
+    content_type: str | None,
+    content_encoding: str | None,
+) -> tuple[Path, str | None]:
+    """Copy a hot blob into the cold tier, zstd-compressing it if that helps.
+
+    Blobs that are already encoded or of an already compressed media type are
+    copied as they are, as is everything when zstandard is not installed.
+    Returns the cold path and the content encoding of the copy.
+    """
+    target = get_user_cold_dir(owner_id) / path.name
+    if (
+        content_encoding is None
+        and content_type not in COMPRESSED_MEDIA_TYPES
+        and zstd_available()
+    ):
+        target = target.with_name(target.name + ZSTD_SUFFIX)
+        _write_atomically(
+            target, _compressed_chunks(path, settings.COLD_TIER_COMPRESSION_LEVEL)
+        )
+        return target, ZSTD
+    _write_atomically(target, _read_chunks(path))
+    return target, content_encoding
+
+
+def copy_to_hot_tier(path: Path, *, owner_id: uuid.UUID) -> Path:
+    """Copy a cold blob back under ``UPLOAD_DIR``, still encoded as it is stored."""
+    target = get_user_upload_dir(owner_id) / path.name
+    _write_atomically(target, _read_chunks(path))
+    return target
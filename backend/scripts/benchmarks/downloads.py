@@ -0,0 +1,105 @@
+"""Benchmark download throughput: streamed chunks vs. server-side pathsend.
+
+Serves a generated file through ``ZeroCopyFileResponse`` to an emulated ASGI
+server that writes to a local socket drained by a reader thread:
+
+- ``stream``: the server does not advertise ``http.response.pathsend``, so
+  the app reads the file and sends it in ``DOWNLOAD_CHUNK_SIZE`` chunks,
+  which the server writes with ``sendall``;
+- ``pathsend``: the app hands over the path and the server copies the file
+  to the socket with ``os.sendfile``, as servers implementing the
+  extension do.
+
+Reports wall-clock MB/s and MB/s per core (bytes / CPU time of this process).
+
+Usage: python -m scripts.benchmarks.downloads [--size-mb 256] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.api.responses import PATHSEND, ZeroCopyFileResponse
+from scripts.benchmarks.utils import format_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _drain(sock: socket.socket) -> None:
+    while sock.recv(1024 * 1024):
+        pass
+
+
+async def serve(path: Path, *, pathsend: bool) -> None:
+    """Run one download through the response with an emulated server."""
+    server_side, client_side = socket.socketpair()
+    reader = threading.Thread(target=_drain, args=(client_side,))
+    reader.start()
+    scope: dict[str, Any] = {
+        "type": "http",
+        "method": "GET",
+        "headers": [],
+        "extensions": {PATHSEND: {}} if pathsend else {},
+    }
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            server_side.sendall(message["body"])
+        elif message["type"] == PATHSEND:
+            with open(message["path"], "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    offset += os.sendfile(
+                        server_side.fileno(), f.fileno(), offset, size - offset
+                    )
+
+    try:
+        await ZeroCopyFileResponse(path)(scope, receive, send)
+    finally:
+        server_side.close()
+        reader.join()
+        client_side.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "blob.bin"
+        with open(path, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+        for mode in ("stream", "pathsend"):
+            asyncio.run(serve(path, pathsend=mode == "pathsend"))  # Warm the page cache
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            for _ in range(args.repeat):
+                asyncio.run(serve(path, pathsend=mode == "pathsend"))
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            total_mb = args.size_mb * args.repeat
+            results.append([mode, total_mb, total_mb / wall, total_mb / cpu])
+
+    logger.info(
+        "Results:\n%s",
+        format_table(["mode", "mb", "mb_per_s", "mb_per_cpu_s"], results),
+    )
+
+
+if __name__ == "__main__":
+    main()
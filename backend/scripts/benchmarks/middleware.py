@@ -0,0 +1,121 @@
+"""Benchmark requests/second through the request ID and rate limit middleware.
+
+Builds two small apps with one JSON route and an in-memory limiter:
+
+- ``base_http``: the previous ``BaseHTTPMiddleware`` implementations
+  (``RequestIDMiddleware`` and the ``SlowAPIMiddleware`` subclass with the
+  ``endswith`` health-check exemption) on a slowapi limiter, reproduced
+  here for comparison;
+- ``asgi``: the current plain ASGI ``RequestIDMiddleware`` and
+  ``RateLimitMiddleware`` on the GCRA ``RateLimiter``.
+
+Requests are driven straight through the ASGI interface, ``--concurrency``
+at a time, so the numbers are middleware and routing cost without a server
+or sockets.
+
+Usage: python -m scripts.benchmarks.middleware [--requests 20000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any
+
+from fastapi import FastAPI
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
+from slowapi.util import get_remote_address
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.rate_limit import RateLimiter, rate_limit_exceeded_handler
+from app.middleware import RateLimitMiddleware, RequestIDMiddleware
+from scripts.benchmarks.utils import asgi_get, format_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BaseHTTPRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Any) -> Response:
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class BaseHTTPRateLimitMiddleware(SlowAPIMiddleware):
+    async def dispatch(self, request: Request, call_next: Any) -> Response:
+        if request.url.path.endswith("/health-check/") or request.url.path.endswith(
+            "/health-check"
+        ):
+            return await call_next(request)
+        if not hasattr(request.state, "view_rate_limit"):
+            request.state.view_rate_limit = None
+        return await super().dispatch(request, call_next)
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items/")
+    async def read_items() -> dict[str, Any]:
+        return {"data": [], "count": 0}
+
+    if mode == "base_http":
+        app.state.limiter = Limiter(
+            key_func=get_remote_address,
+            storage_uri="memory://",
+            default_limits=["1000000/minute"],
+            headers_enabled=True,
+        )
+        app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+        app.add_middleware(BaseHTTPRateLimitMiddleware)
+        app.add_middleware(BaseHTTPRequestIDMiddleware)
+    else:
+        app.state.limiter = RateLimiter("memory://", ["1000000/minute"], "bench:")
+        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def request(app: FastAPI) -> None:
+    status = await asgi_get(app, "/api/v1/items/")
+    assert status == 200, status
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await request(app)
+
+    await worker(100)  # Warm up
+    started = time.perf_counter()
+    per_worker = requests // concurrency
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    results = []
+    for mode in ("base_http", "asgi"):
+        rps = asyncio.run(run(build_app(mode), args.requests, args.concurrency))
+        results.append([mode, args.requests, rps, 1_000_000 / rps])
+    logger.info(
+        "Results:\n%s",
+        format_table(["middleware", "requests", "req_per_s", "us_per_req"], results),
+    )
+
+
+if __name__ == "__main__":
+    main()
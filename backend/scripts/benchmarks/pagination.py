@@ -0,0 +1,147 @@
+"""Benchmark count + page queries: two statements vs. count(*) OVER ().
+
+Builds a temporary copy of the item table shape, fills it with generated
+rows and times both strategies for several table sizes, page sizes and
+offsets. Deep offsets make Postgres walk and discard every skipped row, so
+each row also times a keyset page (``created_at < :cursor``) starting at
+the same row, as a reference for what seeking instead of skipping costs.
+Nothing is written to real tables.
+
+Usage: python -m scripts.benchmarks.pagination [--sizes 10000 100000] [--pages 10 100]
+    [--offsets 0 1000 50000]
+"""
+
+import argparse
+import logging
+from itertools import product
+from typing import Any
+
+from sqlalchemy import Connection, text
+
+from app.core.db import engine
+from scripts.benchmarks.utils import format_table, measure
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEPARATE_COUNT = "SELECT count(*) FROM bench_item WHERE owner_id = :owner_id"
+SEPARATE_PAGE = (
+    "SELECT id, title, description, owner_id FROM bench_item "
+    "WHERE owner_id = :owner_id ORDER BY created_at DESC LIMIT :limit OFFSET :skip"
+)
+WINDOW_PAGE = (
+    "SELECT id, title, description, owner_id, count(*) OVER () AS total_count "
+    "FROM bench_item WHERE owner_id = :owner_id "
+    "ORDER BY created_at DESC LIMIT :limit OFFSET :skip"
+)
+CURSOR_AT = (
+    "SELECT created_at FROM bench_item WHERE owner_id = :owner_id "
+    "ORDER BY created_at DESC LIMIT 1 OFFSET :skip"
+)
+KEYSET_PAGE = (
+    "SELECT id, title, description, owner_id FROM bench_item "
+    "WHERE owner_id = :owner_id AND created_at <= :cursor "
+    "ORDER BY created_at DESC LIMIT :limit"
+)
+
+
+def fill_table(conn: Connection, rows: int, owners: int) -> str:
+    """(Re)create the temp table with ``rows`` rows spread over ``owners`` owners."""
+    conn.execute(text("DROP TABLE IF EXISTS bench_item"))
+    conn.execute(
+        text(
+            "CREATE TEMP TABLE bench_item ("
+            " id uuid PRIMARY KEY DEFAULT gen_random_uuid(),"
+            " title varchar(255) NOT NULL,"
+            " description varchar(255),"
+            " owner_id uuid NOT NULL,"
+            " created_at timestamptz NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO bench_item (title, description, owner_id, created_at) "
+            "SELECT 'title ' || g, 'description ' || g,"
+            " ('00000000-0000-0000-0000-' || lpad((g % :owners)::text, 12, '0'))::uuid,"
+            " now() - g * interval '1 second' "
+            "FROM generate_series(1, :rows) AS g"
+        ),
+        {"rows": rows, "owners": owners},
+    )
+    conn.execute(text("CREATE INDEX ON bench_item (owner_id, created_at DESC)"))
+    conn.execute(text("ANALYZE bench_item"))
+    return "00000000-0000-0000-0000-000000000001"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--offsets", type=int, nargs="+", default=[0, 1000, 50_000], help="rows skipped"
+    )
+    parser.add_argument("--owners", type=int, default=10, help="distinct owner ids")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = []
+    with engine.connect() as conn:
+        for size in args.sizes:
+            logger.info("Filling bench_item with %d rows", size)
+            owner_id = fill_table(conn, size, args.owners)
+            owner_rows = size // args.owners
+            for page, skip in product(args.pages, args.offsets):
+                if skip >= owner_rows:
+                    continue  # Past the owner's last row
+                params = {"owner_id": owner_id, "limit": page, "skip": skip}
+                params["cursor"] = conn.execute(text(CURSOR_AT), params).scalar_one()
+
+                def separate(params: dict[str, Any] = params) -> None:
+                    conn.execute(text(SEPARATE_COUNT), params).scalar_one()
+                    conn.execute(text(SEPARATE_PAGE), params).all()
+
+                def window(params: dict[str, Any] = params) -> None:
+                    conn.execute(text(WINDOW_PAGE), params).all()
+
+                def keyset(params: dict[str, Any] = params) -> None:
+                    conn.execute(text(KEYSET_PAGE), params).all()
+
+                two = measure(separate, repeat=args.repeat)
+                one = measure(window, repeat=args.repeat)
+                seek = measure(keyset, repeat=args.repeat)
+                results.append(
+                    [
+                        size,
+                        page,
+                        skip,
+                        two["median_ms"],
+                        one["median_ms"],
+                        seek["median_ms"],
+                        two["p95_ms"],
+                        one["p95_ms"],
+                    ]
+                )
+        conn.rollback()
+
+    logger.info(
+        "Results (owner-filtered, ORDER BY created_at DESC):\n%s",
+        format_table(
+            [
+                "rows",
+                "page",
+                "offset",
+                "separate_med",
+                "window_med",
+                "keyset_med",
+                "separate_p95",
+                "window_p95",
+            ],
+            results,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark hot queries with and without server-side prepared statements.
+
+Runs the user-by-id, user-by-email and item-page-by-owner queries through
+two engines: one that prepares every statement on first use
+(prepare_threshold=0) and one that never prepares (prepare_threshold=None,
+the PgBouncer transaction pooling mode). Only reads existing rows.
+
+Usage: python -m scripts.benchmarks.prepared_statements [--repeat 2000]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import Engine, func
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.models import Item, User
+from scripts.benchmarks.utils import format_table, measure
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_queries(db_engine: Engine, repeat: int) -> dict[str, dict[str, float]]:
+    with Session(db_engine) as session:
+        user = session.exec(
+            select(User).where(User.email == settings.FIRST_SUPERUSER)
+        ).one()
+        user_id, email = user.id, user.email
+        owner_id = (
+            session.exec(
+                select(Item.owner_id)
+                .group_by(Item.owner_id)
+                .order_by(func.count().desc())
+            ).first()
+            or user_id
+        )
+
+        def by_id() -> None:
+            session.expunge_all()  # Defeat the identity map so a query is sent
+            session.get(User, user_id)
+
+        def by_email() -> None:
+            session.exec(select(User).where(User.email == email)).first()
+
+        def item_page() -> None:
+            session.exec(
+                select(Item).where(Item.owner_id == owner_id).offset(0).limit(100)
+            ).all()
+
+        return {
+            "user_by_id": measure(by_id, repeat=repeat, warmup=10),
+            "user_by_email": measure(by_email, repeat=repeat, warmup=10),
+            "item_page_by_owner": measure(item_page, repeat=repeat, warmup=10),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = str(settings.SQLALCHEMY_DATABASE_URI)
+    prepared = run_queries(create_db_engine(url, prepare_threshold=0), args.repeat)
+    unprepared = run_queries(create_db_engine(url, prepare_threshold=None), args.repeat)
+
+    rows = [
+        [
+            name,
+            prepared[name]["median_ms"],
+            unprepared[name]["median_ms"],
+            prepared[name]["p95_ms"],
+            unprepared[name]["p95_ms"],
+        ]
+        for name in prepared
+    ]
+    logger.info(
+        "Per-query latency:\n%s",
+        format_table(
+            [
+                "query",
+                "prepared_med",
+                "unprepared_med",
+                "prepared_p95",
+                "unprepared_p95",
+            ],
+            rows,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
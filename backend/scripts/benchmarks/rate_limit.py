@@ -0,0 +1,163 @@
+"""Benchmark rate limit checks per request under concurrent load.
+
+Compares, on the same storage:
+
+- ``slowapi-fixed-window`` / ``slowapi-moving-window``: the ``limits``
+  strategies slowapi used, on its synchronous storage client. slowapi calls
+  them inline, so each check blocks the event loop for its round trips;
+- ``gcra``: ``RateLimiter.hit``, one ``EVALSHA`` on the shared async pool;
+- ``gcra-leased``: ``RateLimiter.hit`` in ``"leased"`` mode, no Redis call
+  per check; leases are synced every ``RATE_LIMIT_SYNC_SECONDS`` meanwhile
+  (those pipelines are not counted in ``async_cmds_per_check``).
+
+``--concurrency`` tasks each run their share of ``--requests`` checks over
+``--keys`` client keys, with a limit high enough that every check passes.
+Reported latencies are per check as seen by the awaiting task, so they
+include time spent queued behind other tasks on the loop.
+
+Usage: python -m scripts.benchmarks.rate_limit [--storage-uri redis://localhost:6379/0]
+    [--requests 20000] [--concurrency 50] [--keys 1000]
+
+Defaults to ``RATE_LIMIT_STORAGE``; ``memory://`` compares the in-process
+implementations only.
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+from app.core.redis import close_redis, init_redis, stats
+from scripts.benchmarks.utils import format_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ITEM = parse("1000000/minute")
+
+
+def build_checks(
+    storage_uri: str, limiters: list[RateLimiter]
+) -> dict[str, Callable[[str], Awaitable[bool]]]:
+    checks: dict[str, Callable[[str], Awaitable[bool]]] = {}
+    storage = storage_from_string(storage_uri)
+    for name, strategy in (
+        ("slowapi-fixed-window", FixedWindowRateLimiter(storage)),
+        ("slowapi-moving-window", MovingWindowRateLimiter(storage)),
+    ):
+
+        async def check(key: str, strategy=strategy) -> bool:
+            return strategy.hit(ITEM, "bench", key)
+
+        checks[name] = check
+
+    for name, mode in (("gcra", "redis"), ("gcra-leased", "leased")):
+        limiter = RateLimiter(
+            storage_uri,
+            [],
+            "bench:ratelimit:",
+            mode=mode,
+            lease_fraction=settings.RATE_LIMIT_LEASE_FRACTION,
+            sync_interval=settings.RATE_LIMIT_SYNC_SECONDS,
+        )
+        limiters.append(limiter)
+
+        async def gcra(key: str, limiter=limiter) -> bool:
+            return (await limiter.hit(key, ITEM)).allowed
+
+        checks[name] = gcra
+    return checks
+
+
+async def run(
+    check: Callable[[str], Awaitable[bool]], requests: int, concurrency: int, keys: int
+) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def worker(offset: int, count: int) -> None:
+        for i in range(count):
+            start = time.perf_counter()
+            assert await check(f"client-{(offset + i) % keys}")
+            latencies.append(time.perf_counter() - start)
+
+    await worker(0, 100)  # Warm up (and load the Lua script)
+    latencies.clear()
+    per_worker = requests // concurrency
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(n * per_worker, per_worker) for n in range(concurrency))
+    )
+    return time.perf_counter() - started, latencies
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await init_redis()
+    limiters: list[RateLimiter] = []
+    try:
+        results = []
+        checks = build_checks(args.storage_uri, limiters)
+        for limiter in limiters:
+            await limiter.start()
+        for name, check in checks.items():
+            commands = stats.commands
+            elapsed, latencies = await run(
+                check, args.requests, args.concurrency, args.keys
+            )
+            latencies.sort()
+            count = len(latencies)
+            results.append(
+                [
+                    name,
+                    count,
+                    count / elapsed,
+                    elapsed * 1_000_000 / count,
+                    statistics.median(latencies) * 1000,
+                    latencies[int(count * 0.99)] * 1000,
+                    # Only the async pool is instrumented; slowapi uses its own client
+                    (stats.commands - commands) / (count + 100)
+                    if name.startswith("gcra")
+                    else "-",
+                ]
+            )
+    finally:
+        for limiter in limiters:
+            await limiter.stop()
+            await limiter.close()
+        await close_redis()
+    logger.info(
+        "Results (%s):\n%s",
+        args.storage_uri,
+        format_table(
+            [
+                "backend",
+                "checks",
+                "checks_per_s",
+                "us_per_check",
+                "p50_ms",
+                "p99_ms",
+                "async_cmds_per_check",
+            ],
+            results,
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--storage-uri", default=settings.RATE_LIMIT_STORAGE)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=1000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark session middleware overhead on an API route.
+
+Times ``GET /api/v1/items/`` on a small app with one JSON route:
+
+- ``global``: ``SessionMiddleware`` on the whole app, as before, with and
+  without a signed session cookie in the request (a browser that logged in
+  to the admin sent it with every API call);
+- ``admin_only``: sessions only on the ``/admin`` mount, so API requests do
+  not pass through any session middleware.
+
+Reports the best of ``--rounds`` runs in microseconds per request and the
+overhead over a bare app.
+
+Usage: python -m scripts.benchmarks.sessions [--requests 20000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Any
+
+import itsdangerous
+from fastapi import FastAPI
+from starlette.applications import Starlette
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.admin.sessions import admin_session_middleware
+from app.core.config import settings
+from scripts.benchmarks.utils import asgi_get, format_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items/")
+    async def read_items() -> dict[str, Any]:
+        return {"data": [], "count": 0}
+
+    if mode == "global":
+        app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+    elif mode == "admin_only":
+        app.mount("/admin", Starlette(middleware=[admin_session_middleware()]))
+    return app
+
+
+def session_cookie() -> tuple[bytes, bytes]:
+    data = base64.b64encode(json.dumps({"user_id": "0" * 36}).encode())
+    signed = itsdangerous.TimestampSigner(settings.SECRET_KEY).sign(data)
+    return (b"cookie", b"session=" + signed)
+
+
+async def run(app: FastAPI, requests: int, headers: list[tuple[bytes, bytes]]) -> float:
+    for _ in range(200):  # Warm up
+        await asgi_get(app, "/api/v1/items/", headers)
+    started = time.perf_counter()
+    for _ in range(requests):
+        status = await asgi_get(app, "/api/v1/items/", headers)
+        assert status == 200, status
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("none", "no cookie", []),
+        ("global", "no cookie", []),
+        ("global", "cookie", [session_cookie()]),
+        ("admin_only", "no cookie", []),
+        ("admin_only", "cookie", [session_cookie()]),
+    ]
+    apps = [build_app(mode) for mode, _, _ in cases]
+    best = [float("inf")] * len(cases)
+    for _ in range(args.rounds):  # Interleaved, so drift affects every case alike
+        for i, (app, (_, _, headers)) in enumerate(zip(apps, cases, strict=True)):
+            best[i] = min(best[i], asyncio.run(run(app, args.requests, headers)))
+    results = [
+        [mode, cookie, us, us - best[0]]
+        for (mode, cookie, _), us in zip(cases, best, strict=True)
+    ]
+    logger.info(
+        "Results:\n%s",
+        format_table(["sessions", "request", "us_per_req", "overhead_us"], results),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark insert throughput with UUIDv4 vs. UUIDv7 primary keys.
+
+Loads ``--rows`` rows into a scratch table shaped like ``item`` once per id
+version, in ``--batch`` sized COPY batches with ids generated in Python as the
+models do. Random v4 keys scatter inserts across the whole primary key index,
+so throughput drops once the index outgrows shared_buffers; v7 keys append to
+the right-most leaf. The table is a regular, WAL-logged one like ``item``, so
+the full-page writes caused by touching many index pages per checkpoint are
+part of the cost. Reports throughput over the whole run and for the final
+batch, the resulting index size and the WAL written. The scratch table
+``bench_uuid`` is dropped afterwards; no application table is touched.
+
+Usage: python -m scripts.benchmarks.uuid_inserts [--rows 20000000] [--batch 100000]
+"""
+
+import argparse
+import logging
+import time
+import uuid
+from collections.abc import Callable
+
+from app.core.db import engine
+from app.models.ids import uuid7
+from scripts.benchmarks.utils import format_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OWNER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def load(generate: Callable[[], uuid.UUID], rows: int, batch: int) -> list[float | int]:
+    """Insert ``rows`` rows.
+
+    Returns [total rows/s, last batch rows/s, index MB, WAL MB].
+    """
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS bench_uuid")
+            cur.execute(
+                "CREATE TABLE bench_uuid ("
+                " id uuid PRIMARY KEY,"
+                " title varchar(255) NOT NULL,"
+                " description varchar(255),"
+                " owner_id uuid NOT NULL)"
+            )
+            conn.commit()
+
+            cur.execute("SELECT pg_current_wal_lsn()")
+            wal_start = cur.fetchone()[0]
+            started = time.perf_counter()
+            batch_rate = 0.0
+            for offset in range(0, rows, batch):
+                size = min(batch, rows - offset)
+                batch_started = time.perf_counter()
+                with cur.copy(
+                    "COPY bench_uuid (id, title, description, owner_id) FROM STDIN"
+                ) as copy:
+                    for n in range(offset, offset + size):
+                        copy.write_row((generate(), f"title {n}", None, OWNER_ID))
+                conn.commit()
+                batch_rate = size / (time.perf_counter() - batch_started)
+                if (offset // batch) % 10 == 0:
+                    logger.info("  %d rows, %.0f rows/s", offset + size, batch_rate)
+            total_rate = rows / (time.perf_counter() - started)
+            cur.execute(
+                "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s::pg_lsn)", (wal_start,)
+            )
+            wal_mb = float(cur.fetchone()[0]) / 1024 / 1024
+
+            cur.execute("SELECT pg_relation_size('bench_uuid_pkey')")
+            row = cur.fetchone()
+            index_mb = row[0] / 1024 / 1024 if row else 0.0
+            cur.execute("DROP TABLE bench_uuid")
+            conn.commit()
+    finally:
+        raw.close()
+    return [round(total_rate), round(batch_rate), index_mb, wal_mb]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = []
+    for name, generate in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        logger.info("Loading %d rows with %s ids", args.rows, name)
+        results.append([name, args.rows, *load(generate, args.rows, args.batch)])
+
+    logger.info(
+        "Results:\n%s",
+        format_table(
+            ["ids", "rows", "rows_per_s", "last_batch_rows_per_s", "pkey_mb", "wal_mb"],
+            results,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
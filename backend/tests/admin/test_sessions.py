@@ -0,0 +1,86 @@
+"""Tests for admin-scoped sessions."""
+
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.admin import sessions
+from app.admin.sessions import SESSION_COOKIE, admin_session_middleware
+from app.core.config import settings
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int) -> None:
+        self.data[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+def _app() -> FastAPI:
+    async def login(request: Request) -> JSONResponse:
+        request.session["user_id"] = "42"
+        return JSONResponse(True)
+
+    async def me(request: Request) -> JSONResponse:
+        return JSONResponse(request.session.get("user_id"))
+
+    async def logout(request: Request) -> JSONResponse:
+        request.session.clear()
+        return JSONResponse(True)
+
+    admin = Starlette(
+        routes=[Route("/login", login), Route("/me", me), Route("/logout", logout)],
+        middleware=[admin_session_middleware()],
+    )
+    app = FastAPI()
+
+    @app.get("/api/v1/items/")
+    def read_items(request: Request) -> dict[str, Any]:
+        assert "session" not in request.scope
+        return {"data": []}
+
+    app.mount("/admin", admin)
+    return app
+
+
+@pytest.mark.parametrize("store", ["cookie", "redis"])
+def test_admin_session_is_scoped_to_admin(
+    store: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ADMIN_SESSION_STORE", store)
+    redis = FakeRedis()
+    monkeypatch.setattr(sessions, "get_redis", lambda: redis)
+    client = TestClient(_app(), base_url="http://testserver")
+
+    response = client.get("/admin/login")
+    set_cookie = response.headers["set-cookie"]
+    assert set_cookie.startswith(f"{SESSION_COOKIE}=")
+    assert "path=/admin" in set_cookie
+    assert client.get("/admin/me").json() == "42"
+    if store == "redis":
+        # The cookie carries only the id, the data is server side
+        assert len(redis.data) == 1
+        assert "42" not in set_cookie
+
+    # The API neither sees nor re-signs the admin session
+    cookie = f"{SESSION_COOKIE}={client.cookies[SESSION_COOKIE]}"
+    response = client.get("/api/v1/items/", headers={"Cookie": cookie})
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+
+    client.get("/admin/logout")
+    assert client.get("/admin/me").json() is None
+    assert redis.data == {}
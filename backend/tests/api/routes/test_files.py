@@ -1,15 +1,21 @@
 """Tests for file upload and management routes."""
 
+import asyncio
+import io
 import uuid
-from pathlib import Path
+import zipfile
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.api.routes import files as files_routes
 from app.core.config import settings
 from app.models import File
+from app.tasks.tasks import delete_blobs_task
 from tests.utils.file import create_file_record, create_random_file
 from tests.utils.user import create_random_user
+from tests.utils.utils import capture_statements, statements_on_table
 
 
 def test_upload_file(
@@ -70,6 +76,52 @@ def test_upload_file_too_large(
     assert "too large" in content["detail"].lower()
 
 
+def test_upload_file_over_quota(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that an upload exceeding the user's storage quota is rejected."""
+    monkeypatch.setattr(settings, "STORAGE_QUOTA_BYTES", 10)
+    files = {"file": ("test.txt", b"x" * 11, "text/plain")}
+
+    response = client.post(
+        f"{settings.API_V1_STR}/files/upload",
+        headers=normal_user_token_headers,
+        files=files,
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Storage quota exceeded"
+
+
+def test_get_top_storage_consumers(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    """Test that uploads are counted and listed for superusers."""
+    files = {"file": ("test.txt", b"x" * 1000, "text/plain")}
+    client.post(
+        f"{settings.API_V1_STR}/files/upload",
+        headers=normal_user_token_headers,
+        files=files,
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/files/storage/top", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data
+    assert data == sorted(data, key=lambda usage: usage["bytes_used"], reverse=True)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/files/storage/top", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
+
+
 def test_get_files(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -159,6 +211,86 @@ def test_download_file(
     assert file_content.encode() in response.content
 
 
+def test_download_compressed_file(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that compressed uploads are decoded or passed through on download."""
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(settings, "UPLOAD_COMPRESSION_ENABLED", True)
+    test_content = b"compress me\n" * 1000
+    response = client.post(
+        f"{settings.API_V1_STR}/files/upload",
+        headers=superuser_token_headers,
+        files={"file": ("big.txt", test_content, "text/plain")},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["file_size"] == len(test_content)
+    db_file = db.get(File, uuid.UUID(content["id"]))
+    assert db_file is not None
+    assert db_file.content_encoding == "zstd"
+    url = f"{settings.API_V1_STR}/files/{content['id']}/download"
+
+    response = client.get(
+        url, headers={**superuser_token_headers, "Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.content == test_content
+
+    response = client.get(
+        url, headers={**superuser_token_headers, "Accept-Encoding": "zstd"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "zstd"
+    assert int(response.headers["content-length"]) < len(test_content)
+
+
+def test_download_archive(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test downloading several files as one ZIP."""
+    user = create_random_user(db)
+    file_ids = []
+    contents = []
+    for _ in range(2):
+        file_path, file_content = create_random_file(db, str(user.id))
+        file_ids.append(create_file_record(db, str(user.id), file_path, "same.txt"))
+        contents.append(file_content.encode())
+
+    response = client.post(
+        f"{settings.API_V1_STR}/files/archive",
+        headers=superuser_token_headers,
+        json={"file_ids": file_ids},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist() == ["same.txt", "same (1).txt"]
+    assert [archive.read(name) for name in archive.namelist()] == contents
+
+
+def test_download_archive_with_foreign_file(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test that an archive request including another user's file is refused."""
+    user = create_random_user(db)
+    file_path, _ = create_random_file(db, str(user.id))
+    file_id = create_file_record(db, str(user.id), file_path)
+
+    response = client.post(
+        f"{settings.API_V1_STR}/files/archive",
+        headers=normal_user_token_headers,
+        json={"file_ids": [file_id]},
+    )
+
+    assert response.status_code == 404
+
+
 def test_delete_file(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -214,3 +346,65 @@ def test_delete_file_permission_denied(
     assert response.status_code == 403
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_delete_files_bulk(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test deleting several owned files in one request."""
+    queued: list[list[str]] = []
+    monkeypatch.setattr(files_routes, "enqueue_blob_deletion", queued.append)
+    me = client.get(
+        f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers
+    ).json()
+    own = []
+    for _ in range(3):
+        file_path, _ = create_random_file(db, me["id"])
+        own.append((file_path, create_file_record(db, me["id"], file_path)))
+    other = create_random_user(db)
+    other_path, _ = create_random_file(db, str(other.id))
+    other_id = create_file_record(db, str(other.id), other_path)
+
+    response = client.request(
+        "DELETE",
+        f"{settings.API_V1_STR}/files/bulk",
+        headers=normal_user_token_headers,
+        json={"file_ids": [file_id for _, file_id in own] + [other_id, str(uuid.uuid4())]},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 3}
+    # Blobs are left to the worker, run here in its place
+    assert sorted(queued[0]) == sorted(str(file_path) for file_path, _ in own)
+    asyncio.run(delete_blobs_task({}, queued[0]))
+    assert not any(file_path.exists() for file_path, _ in own)
+    assert other_path.exists()
+    db.expire_all()
+    assert db.get(File, uuid.UUID(other_id)) is not None
+
+
+def test_file_mutations_touch_file_table_once(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """Writes must not re-read the row they just wrote (no refresh SELECT)."""
+    with capture_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/files/upload",
+            headers=superuser_token_headers,
+            files={"file": ("count.txt", b"count statements", "text/plain")},
+        )
+    assert response.status_code == 200
+    file_id = response.json()["id"]
+    assert len(statements_on_table(statements, "file")) == 1
+
+    with capture_statements() as statements:
+        response = client.delete(
+            f"{settings.API_V1_STR}/files/{file_id}",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    # DELETE ... RETURNING, no lookup first
+    assert len(statements_on_table(statements, "file")) == 1
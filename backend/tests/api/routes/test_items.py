@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from app.core.config import settings
 from tests.utils.item import create_random_item
+from tests.utils.utils import capture_statements, statements_on_table
 
 
 def test_create_item(
@@ -162,3 +163,36 @@ def test_delete_item_not_enough_permissions(
     assert response.status_code == 403
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_item_mutations_touch_item_table_once(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """Writes must not re-read the row they just wrote (no refresh SELECT)."""
+    with capture_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            json={"title": "Foo", "description": "Fighters"},
+        )
+    assert response.status_code == 200
+    item_id = response.json()["id"]
+    assert len(statements_on_table(statements, "item")) == 1
+
+    with capture_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/items/{item_id}",
+            headers=superuser_token_headers,
+            json={"title": "Updated title"},
+        )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Updated title"
+    assert len(statements_on_table(statements, "item")) == 1
+
+    with capture_statements() as statements:
+        response = client.delete(
+            f"{settings.API_V1_STR}/items/{item_id}",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    assert len(statements_on_table(statements, "item")) == 1
@@ -8,7 +8,12 @@ from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
 from app.models import User, UserCreate
-from tests.utils.utils import random_email, random_lower_string
+from tests.utils.utils import (
+    capture_statements,
+    random_email,
+    random_lower_string,
+    statements_on_table,
+)
 from tests.utils.user import user_authentication_headers
 
 
@@ -548,3 +553,40 @@ def test_delete_user_without_privileges(
     assert r.status_code == 403
     # fastapi-users returns "Forbidden" when superuser check fails
     assert "Forbidden" in r.json().get("detail", "") or r.json().get("detail") == "Forbidden"
+
+
+def test_user_mutations_statement_counts(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """Writes must not re-read the row they just wrote (no refresh SELECT)."""
+    with capture_statements() as statements:
+        r = client.post(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            json={"email": random_email(), "password": random_lower_string()},
+        )
+    assert r.status_code == 200
+    user_id = r.json()["id"]
+    # Token user lookup, email uniqueness check, INSERT
+    assert len(statements_on_table(statements, "user")) == 3
+
+    with capture_statements() as statements:
+        r = client.patch(
+            f"{settings.API_V1_STR}/users/{user_id}",
+            headers=superuser_token_headers,
+            json={"full_name": "Updated Name"},
+        )
+    assert r.status_code == 200
+    assert r.json()["full_name"] == "Updated Name"
+    # Token user lookup, target user lookup, UPDATE
+    assert len(statements_on_table(statements, "user")) == 3
+
+    with capture_statements() as statements:
+        r = client.delete(
+            f"{settings.API_V1_STR}/users/{user_id}",
+            headers=superuser_token_headers,
+        )
+    assert r.status_code == 200
+    # Token user lookup (CurrentUser reuses it from the same session's identity
+    # map), target user lookup, DELETE
+    assert len(statements_on_table(statements, "user")) == 3
@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+STATUS_ENDPOINTS = [
+    "cache",
+    "redis",
+    "invalidation",
+    "uploads",
+    "access-tracker",
+    "bandwidth",
+    "rate-limit",
+]
+
+
+def test_health_check_is_public(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/health-check/")
+    assert r.status_code == 200
+    assert r.json() is True
+
+
+@pytest.mark.parametrize("name", STATUS_ENDPOINTS)
+def test_status_endpoints_require_superuser(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    name: str,
+) -> None:
+    url = f"{settings.API_V1_STR}/utils/health-check/{name}"
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers=normal_user_token_headers).status_code == 403
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert isinstance(r.json(), dict)
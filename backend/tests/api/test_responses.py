@@ -0,0 +1,65 @@
+"""Tests for custom response classes."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from app.api.responses import PATHSEND, ZeroCopyFileResponse
+
+
+def _run(
+    path: Path,
+    extensions: dict[str, Any],
+    method: str = "GET",
+    headers: list[tuple[bytes, bytes]] | None = None,
+) -> list[dict[str, Any]]:
+    messages: list[dict[str, Any]] = []
+    scope = {
+        "type": "http",
+        "method": method,
+        "headers": headers or [],
+        "extensions": extensions,
+    }
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    asyncio.run(ZeroCopyFileResponse(path)(scope, receive, send))
+    return messages
+
+
+def test_uses_pathsend_when_server_supports_it(tmp_path: Path) -> None:
+    path = tmp_path / "blob.txt"
+    path.write_bytes(b"hello")
+
+    messages = _run(path, {PATHSEND: {}})
+
+    assert messages[0]["type"] == "http.response.start"
+    assert (b"content-length", b"5") in messages[0]["headers"]
+    assert messages[1] == {"type": PATHSEND, "path": str(path.resolve())}
+
+
+def test_streams_body_without_pathsend(tmp_path: Path) -> None:
+    path = tmp_path / "blob.txt"
+    path.write_bytes(b"hello")
+
+    messages = _run(path, {})
+
+    body = b"".join(m["body"] for m in messages if m["type"] == "http.response.body")
+    assert body == b"hello"
+
+
+def test_head_and_range_requests_do_not_use_pathsend(tmp_path: Path) -> None:
+    path = tmp_path / "blob.txt"
+    path.write_bytes(b"hello")
+
+    head = _run(path, {PATHSEND: {}}, method="HEAD")
+    ranged = _run(path, {PATHSEND: {}}, headers=[(b"range", b"bytes=0-1")])
+
+    for messages in (head, ranged):
+        assert messages[0]["type"] == "http.response.start"
+        assert all(m["type"] != PATHSEND for m in messages)
+    assert b"".join(m.get("body", b"") for m in head[1:]) == b""
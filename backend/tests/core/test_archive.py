@@ -0,0 +1,48 @@
+"""Tests for streaming ZIP archives."""
+
+import io
+import os
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from app.utils.archive import CHUNK_SIZE, ArchiveMember, _unique_names, stream_zip
+
+
+def test_stream_zip_stores_compressed_types_and_deflates_others(tmp_path: Path) -> None:
+    text = tmp_path / "notes.txt"
+    text.write_bytes(b"hello " * 10_000)
+    image = tmp_path / "photo.png"
+    image.write_bytes(os.urandom(2 * CHUNK_SIZE + 1))
+    now = datetime.now()
+    members = [
+        ArchiveMember(text, "notes.txt", "text/plain", now),
+        ArchiveMember(image, "../photo.png", "image/png", now),
+    ]
+
+    chunks = list(stream_zip(members))
+
+    # Output is produced incrementally, never a whole member at once
+    assert max(len(chunk) for chunk in chunks) < 2 * CHUNK_SIZE
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    notes, photo = archive.infolist()
+    assert notes.compress_type == zipfile.ZIP_DEFLATED
+    assert photo.filename == "photo.png"
+    assert photo.compress_type == zipfile.ZIP_STORED
+    assert archive.read("photo.png") == image.read_bytes()
+
+
+def test_duplicate_names_never_clash_with_other_members() -> None:
+    now = datetime.now()
+    names = ["a.txt", "a (1).txt", "a.txt", "a.txt", "dir/a (2).txt", ""]
+    members = [ArchiveMember(Path("blob"), name, None, now) for name in names]
+
+    assert _unique_names(members) == [
+        "a.txt",
+        "a (1).txt",
+        "a (3).txt",
+        "a (4).txt",
+        "a (2).txt",
+        "file",
+    ]
@@ -0,0 +1,102 @@
+"""Tests for download bandwidth shaping."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from starlette.responses import Response
+
+from app.api.responses import PATHSEND, ThrottledResponse, ZeroCopyFileResponse
+from app.core import bandwidth
+from app.core.bandwidth import BandwidthLimiter, download_rate_for
+from app.models.user import User
+
+
+def test_local_bucket_allows_burst_then_charges_debt() -> None:
+    limiter = BandwidthLimiter(burst_seconds=1.0, key_prefix="test:")
+
+    async def run() -> list[float]:
+        # No shared Redis pool here, so the limiter falls back to local buckets
+        return [await limiter.charge("user", 1000, 600) for _ in range(3)]
+
+    waits = asyncio.run(run())
+
+    # Bucket of 1000 bytes: 400 left, then 200 and 800 bytes of debt at 1000 B/s
+    assert waits == [0, pytest.approx(0.2, abs=0.05), pytest.approx(0.8, abs=0.05)]
+    assert limiter.redis_errors == 1  # Then Redis is left alone for a while
+
+
+def test_download_rate_for_tiers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        bandwidth.settings,
+        "DOWNLOAD_BANDWIDTH_LIMITS",
+        {"unverified": 100, "verified": 1000, "superuser": 0},
+    )
+
+    assert download_rate_for(User(email="a@example.com", hashed_password="x")) == 100
+    verified = User(email="b@example.com", hashed_password="x", is_verified=True)
+    assert download_rate_for(verified) == 1000
+    superuser = User(email="c@example.com", hashed_password="x", is_superuser=True)
+    assert download_rate_for(superuser) is None
+
+
+def _scope() -> dict[str, Any]:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [],
+        "extensions": {PATHSEND: {}},
+    }
+
+
+def test_throttled_response_paces_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = BandwidthLimiter(burst_seconds=1.0, key_prefix="test:")
+    monkeypatch.setattr("app.api.responses.bandwidth_limiter", limiter)
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(bandwidth.asyncio, "sleep", fake_sleep)
+    messages: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.disconnect"}
+
+    response = ThrottledResponse(Response(b"x" * 3000), key="user", rate=1000)
+    asyncio.run(response(_scope(), receive, send))
+
+    assert messages[0]["status"] == 200
+    assert b"".join(m.get("body", b"") for m in messages[1:]) == b"x" * 3000
+    assert sleeps == [pytest.approx(2.0, abs=0.05)]
+    assert limiter.bytes_throttled == 3000
+    assert limiter.streams == 0
+
+
+def test_throttled_response_disables_pathsend(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "app.api.responses.bandwidth_limiter",
+        BandwidthLimiter(burst_seconds=10.0, key_prefix="test:"),
+    )
+    blob = tmp_path / "blob.bin"
+    blob.write_bytes(b"y" * 1000)
+    messages: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.disconnect"}
+
+    response = ThrottledResponse(ZeroCopyFileResponse(blob), key="user", rate=1000)
+    asyncio.run(response(_scope(), receive, send))
+
+    assert PATHSEND not in [m["type"] for m in messages]
+    assert b"".join(m.get("body", b"") for m in messages[1:]) == b"y" * 1000
@@ -0,0 +1,86 @@
+"""Tests for the tiered cache backend."""
+
+import asyncio
+
+from redis import asyncio as aioredis
+
+from app.core.cache import LRUMemoryBackend, TieredCacheBackend
+from app.core.config import settings
+
+
+def test_lru_memory_backend_evicts_least_recently_used() -> None:
+    async def run() -> None:
+        backend = LRUMemoryBackend(max_entries=2)
+        await backend.set("a", b"1")
+        await backend.set("b", b"2")
+        # Touch "a" so that "b" becomes the eviction candidate
+        assert await backend.get("a") == b"1"
+        await backend.set("c", b"3")
+        assert await backend.get("b") is None
+        assert await backend.get("a") == b"1"
+        assert await backend.get("c") == b"3"
+        assert len(backend) == 2
+
+    asyncio.run(run())
+
+
+def test_lru_memory_backend_expires_entries() -> None:
+    async def run() -> None:
+        backend = LRUMemoryBackend(max_entries=10)
+        await backend.set("a", b"1", expire=-1)
+        assert await backend.get_with_ttl("a") == (0, None)
+
+    asyncio.run(run())
+
+
+def test_tiered_backend_falls_back_to_memory_when_redis_fails() -> None:
+    async def run() -> None:
+        # Nothing listens on port 1, so every command fails to connect
+        redis = aioredis.from_url("redis://127.0.0.1:1/0", socket_connect_timeout=0.1)
+        backend = TieredCacheBackend(redis, LRUMemoryBackend(10), retry_interval=60)
+        assert backend.tier == "redis"
+
+        await backend.set("key", b"value", expire=60)
+        assert backend.tier == "memory"
+        assert await backend.get("key") == b"value"
+        status = backend.status()
+        assert status["degraded"] is True
+        assert status["demotions"] == 1
+        await redis.aclose()
+
+    asyncio.run(run())
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.scripts: list[str] = []
+
+    async def ping(self) -> bool:
+        return True
+
+    async def eval(self, script: str, numkeys: int) -> int:
+        self.scripts.append(script)
+        return 0
+
+
+def test_tiered_backend_replays_clears_missed_while_degraded() -> None:
+    async def run() -> None:
+        redis = FakeRedis()
+        backend = TieredCacheBackend(
+            redis,  # type: ignore[arg-type]
+            LRUMemoryBackend(10),
+            retry_interval=60,
+            redis_available=False,
+        )
+        await backend._probe()
+        assert backend.tier == "redis"
+        assert redis.scripts == []  # Nothing was cleared during the outage
+
+        backend._tier = "memory"
+        await backend.clear(key="stale")
+        await backend._probe()
+        assert backend.tier == "redis"
+        assert len(redis.scripts) == 1
+        assert f"'{settings.CACHE_KEY_PREFIX}:*'" in redis.scripts[0]
+
+    asyncio.run(run())
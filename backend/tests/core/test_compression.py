@@ -0,0 +1,88 @@
+"""Tests for compressed upload storage."""
+
+import asyncio
+import hashlib
+import io
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.core.config import settings
+from app.utils import compression
+from app.utils.archive import ArchiveMember, stream_zip
+from app.utils.compression import ZSTD, accepts_encoding, iter_decoded
+from app.utils.files import get_file_hash, save_upload_file
+
+pytest.importorskip("zstandard")
+
+
+@pytest.fixture
+def compressed_uploads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_COMPRESSION_ENABLED", True)
+    return tmp_path
+
+
+def _upload(content: bytes, filename: str, content_type: str) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def test_accepts_encoding() -> None:
+    assert accepts_encoding("gzip, zstd", "zstd")
+    assert accepts_encoding("br;q=1.0, ZSTD;q=0.5", "zstd")
+    assert not accepts_encoding("zstd;q=0", "zstd")
+    assert not accepts_encoding("gzip, br", "zstd")
+    assert not accepts_encoding(None, "zstd")
+
+
+@pytest.mark.usefixtures("compressed_uploads")
+def test_save_upload_file_compresses_text() -> None:
+    content = b"hello world\n" * 10_000
+
+    stored = asyncio.run(
+        save_upload_file(_upload(content, "notes.txt", "text/plain"), "u1")
+    )
+
+    assert stored.content_encoding == ZSTD
+    assert stored.path.suffix == compression.ZSTD_SUFFIX
+    assert stored.path.stat().st_size < len(content) // 10
+    # Size and hash describe the original bytes
+    assert stored.size == len(content)
+    assert stored.sha256 == hashlib.sha256(content).hexdigest()
+    assert get_file_hash(stored.path, content_encoding=ZSTD) == stored.sha256
+    assert b"".join(iter_decoded(stored.path, ZSTD, 4096)) == content
+
+
+@pytest.mark.usefixtures("compressed_uploads")
+def test_save_upload_file_skips_incompressible_types() -> None:
+    content = b"\x89PNG" + bytes(range(256)) * 100
+
+    stored = asyncio.run(
+        save_upload_file(_upload(content, "photo.png", "image/png"), "u1")
+    )
+
+    assert stored.content_encoding is None
+    assert stored.path.read_bytes() == content
+
+
+@pytest.mark.usefixtures("compressed_uploads")
+def test_stream_zip_decodes_compressed_members() -> None:
+    content = b"line\n" * 50_000
+    stored = asyncio.run(
+        save_upload_file(_upload(content, "notes.txt", "text/plain"), "u1")
+    )
+    member = ArchiveMember(
+        stored.path, "notes.txt", "text/plain", datetime.now(), content_encoding=ZSTD
+    )
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip([member]))))
+
+    assert archive.read("notes.txt") == content
@@ -0,0 +1,40 @@
+"""Tests for primary key generation."""
+
+import time
+
+import pytest
+
+from app.models import ids
+from app.models.ids import uuid7
+
+
+def test_uuid7_layout() -> None:
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert value.int >> 80 >= before
+
+
+def test_uuid7_is_monotonic_within_a_process() -> None:
+    values = [uuid7() for _ in range(10_000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_advances_timestamp_when_counter_overflows_or_clock_steps_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now_ns = [2_000_000_000_000 * 1_000_000]
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now_ns[0])
+    # Restored afterwards, so later ids do not carry the patched timestamp
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids, "_counter", 0)
+    first = uuid7()
+    ids_in_ms = [uuid7() for _ in range(ids._COUNTER_MAX + 1)]
+    assert ids_in_ms[-1].int >> 80 == (first.int >> 80) + 1
+
+    now_ns[0] -= 5_000 * 1_000_000
+    stepped_back = uuid7()
+    assert stepped_back > ids_in_ms[-1]
+    assert stepped_back.int >> 80 == (first.int >> 80) + 1
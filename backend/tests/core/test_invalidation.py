@@ -0,0 +1,87 @@
+"""Tests for the cross-process invalidation bus."""
+
+import asyncio
+import json
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.invalidation import InvalidationBus
+
+
+def test_invalidate_applies_local_handlers() -> None:
+    bus = InvalidationBus("test:invalidation", max_staleness=1)
+    seen: list[str | None] = []
+    bus.register("user", seen.append)
+
+    bus.invalidate("user", "42")
+    bus.invalidate("item", "1")  # No handler registered for this topic
+
+    assert seen == ["42"]
+
+
+def test_remote_messages_apply_and_own_messages_are_skipped() -> None:
+    bus = InvalidationBus("test:invalidation", max_staleness=1)
+    seen: list[str | None] = []
+    bus.register("user", seen.append)
+
+    bus._handle(json.dumps({"o": "other-node", "t": "user", "k": "7"}))
+    bus._handle(json.dumps({"o": bus.origin, "t": "user", "k": "8"}))
+    bus._handle(b"not json")
+
+    assert seen == ["7"]
+    assert bus.received == 1
+
+
+def test_resync_flushes_every_topic() -> None:
+    bus = InvalidationBus("test:invalidation", max_staleness=1)
+    seen: list[tuple[str, str | None]] = []
+    bus.register("user", lambda key: seen.append(("user", key)))
+    bus.register("i18n", lambda key: seen.append(("i18n", key)))
+
+    bus._apply_all()
+
+    assert sorted(seen, key=lambda s: s[0]) == [("i18n", None), ("user", None)]
+
+
+class FlakyRedis:
+    """Fails the first ``failures`` subscriptions, then stays subscribed."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+
+    def pubsub(self, ignore_subscribe_messages: bool) -> "FlakyPubSub":
+        return FlakyPubSub(self)
+
+
+class FlakyPubSub:
+    def __init__(self, redis: FlakyRedis) -> None:
+        self.redis = redis
+
+    async def subscribe(self, channel: str) -> None:
+        if self.redis.failures > 0:
+            self.redis.failures -= 1
+            raise RedisConnectionError("Connection refused")
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool, timeout: float
+    ) -> None:
+        await asyncio.sleep(timeout)
+
+    async def aclose(self) -> None: ...
+
+
+def test_outage_flushes_every_attempt_and_after_resubscribing() -> None:
+    bus = InvalidationBus("test:invalidation", max_staleness=0)
+    seen: list[str | None] = []
+    bus.register("i18n", seen.append)
+
+    async def run() -> None:
+        await bus.start(FlakyRedis(failures=3))  # type: ignore[arg-type]
+        while not bus.connected:
+            await asyncio.sleep(0)
+        await bus.stop()
+
+    asyncio.run(run())
+
+    assert seen == [None] * 4  # Three failed attempts, one resubscribe
+    assert bus.resyncs == 1
@@ -0,0 +1,61 @@
+"""Tests for the negative lookup cache."""
+
+import uuid
+
+import pytest
+
+from app.core import negative_cache as negative_cache_module
+from app.core.invalidation import invalidate
+from app.core.negative_cache import NegativeCache, negative_cache
+
+
+def test_negative_cache_remembers_misses_until_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(negative_cache_module.time, "monotonic", lambda: now[0])
+    cache = NegativeCache(ttl=5, max_entries=10)
+    missing_id = uuid.uuid4()
+    assert not cache.contains("item", missing_id)
+
+    cache.add("item", missing_id, cache.generation("item"))
+    assert cache.contains("item", missing_id)
+    assert not cache.contains("file", missing_id)
+
+    now[0] += 4.9
+    assert cache.contains("item", missing_id)
+    now[0] += 0.1
+    assert not cache.contains("item", missing_id)
+    assert len(cache) == 0
+
+
+def test_negative_cache_is_bounded() -> None:
+    cache = NegativeCache(ttl=60, max_entries=2)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for id in ids:
+        cache.add("item", id, cache.generation("item"))
+    assert len(cache) == 2
+    assert not cache.contains("item", ids[0])
+
+
+def test_creation_invalidates_negative_entry() -> None:
+    missing_id = uuid.uuid4()
+    negative_cache.add("item", missing_id, negative_cache.generation("item"))
+    assert negative_cache.contains("item", missing_id)
+
+    invalidate("item", str(missing_id))
+
+    assert not negative_cache.contains("item", missing_id)
+
+
+def test_miss_recorded_after_creation_is_ignored() -> None:
+    cache = NegativeCache(ttl=60, max_entries=10)
+    missing_id = uuid.uuid4()
+
+    generation = cache.generation("item")  # Lookup starts and misses...
+    cache.discard("item", str(missing_id))  # ...the row is created meanwhile
+    cache.add("item", missing_id, generation)
+
+    assert not cache.contains("item", missing_id)
+    cache.add("file", missing_id, cache.generation("file"))  # Other tables unaffected
+    assert cache.contains("file", missing_id)
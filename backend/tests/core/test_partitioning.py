@@ -0,0 +1,19 @@
+"""Tests for hash partitioning of owner-scoped tables."""
+
+import pytest
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models import File, Item
+
+
+@pytest.mark.parametrize("model", [Item, File])
+def test_owner_scoped_tables_are_hash_partitioned(model: type) -> None:
+    table: Table = model.__table__
+    ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY HASH (owner_id)" in ddl
+    # The partition key must be part of the primary key ...
+    assert set(table.primary_key.columns.keys()) == {"id", "owner_id"}
+    # ... but rows are still identified by id alone in the ORM
+    assert [c.name for c in model.__mapper__.primary_key] == ["id"]
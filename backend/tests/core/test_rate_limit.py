@@ -0,0 +1,156 @@
+import asyncio
+from typing import Any
+
+import pytest
+from limits import parse
+
+from app.core import rate_limit
+from app.core.rate_limit import RateLimiter
+
+
+def read_items() -> None: ...
+
+
+def test_gcra_allows_burst_then_spaces_requests(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter("memory://", [], "test:")
+    item = parse("3/minute")
+
+    async def hits(count: int) -> list[tuple[bool, int]]:
+        results = [await limiter.hit("key", item) for _ in range(count)]
+        return [(r.allowed, r.remaining) for r in results]
+
+    assert asyncio.run(hits(4)) == [(True, 2), (True, 1), (True, 0), (False, 0)]
+    denied = asyncio.run(limiter.hit("key", item))
+    assert denied.retry_after == pytest.approx(20)
+    assert denied.headers()["Retry-After"] == "20"
+
+    # One emission interval (60s / 3) frees exactly one request
+    now[0] += 20
+    assert asyncio.run(hits(2)) == [(True, 0), (False, 0)]
+    now[0] += 60
+    assert asyncio.run(hits(1)) == [(True, 2)]
+
+
+def test_decorated_routes_use_their_own_limits() -> None:
+    limiter = RateLimiter("memory://", ["100/minute"], "test:")
+    scope = {"type": "http", "client": ("10.0.0.1", 1234)}
+
+    async def check_default() -> list[int]:
+        return [(await limiter.check(read_items, scope)).limit.amount]
+
+    assert asyncio.run(check_default()) == [100]
+    limiter.limit("1/minute")(read_items)
+
+    async def check_twice() -> list[bool]:
+        return [(await limiter.check(read_items, scope)).allowed for _ in range(2)]
+
+    assert asyncio.run(check_twice()) == [True, False]
+    assert limiter.status()["allowed"] == 2
+    assert limiter.status()["rejected"] == 1
+
+
+def test_redis_errors_fall_back_to_local_counters(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def unavailable() -> None:
+        raise RuntimeError("Redis pool is not initialized")
+
+    monkeypatch.setattr(rate_limit, "get_redis", unavailable)
+    limiter = RateLimiter(rate_limit.settings.REDIS_URL, [], "test:")
+    item = parse("1/minute")
+
+    async def hits() -> list[bool]:
+        return [(await limiter.hit("key", item)).allowed for _ in range(2)]
+
+    assert asyncio.run(hits()) == [True, False]
+    status = limiter.status()
+    assert status["redis_errors"] == 1  # Not retried until REDIS_RETRY_SECONDS pass
+    assert status["using_local_counters"] is True
+
+
+class FakeLeaseRedis:
+    """Answers lease syncs from ``replies`` and records what was reported."""
+
+    def __init__(self, replies: dict[str, list[int]]) -> None:
+        self.replies = replies
+        self.reported: list[dict[str, int]] = []
+
+    def register_script(self, script: str) -> "FakeLeaseRedis":
+        self.registered_client = self
+        return self
+
+    async def __call__(self, keys: list[str], args: list[Any], client: Any) -> None:
+        client.calls.append((keys[0], args[2]))
+
+    def pipeline(self, transaction: bool) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeLeaseRedis) -> None:
+        self.redis = redis
+        self.calls: list[tuple[str, int]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+
+    async def execute(self) -> list[list[int]]:
+        self.redis.reported.append(dict(self.calls))
+        return [self.redis.replies[key] for key, _ in self.calls]
+
+
+def test_leased_mode_admits_locally_and_reports_in_batches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = FakeLeaseRedis({"test:key": [40, 0, 36_000]})
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: redis)
+    limiter = RateLimiter(
+        rate_limit.settings.REDIS_URL, [], "test:", mode="leased", lease_fraction=0.25
+    )
+    item = parse("100/minute")
+
+    async def hits(count: int) -> list[bool]:
+        return [(await limiter.hit("key", item)).allowed for _ in range(count)]
+
+    # An unseen key starts with a quarter of the full budget, no Redis calls
+    assert asyncio.run(hits(26)) == [True] * 25 + [False]
+    assert redis.reported == []
+
+    # The sync charges what was admitted and leases a quarter of what is left
+    assert asyncio.run(limiter.sync()) == 1
+    assert redis.reported == [{"test:key": 25}]
+    assert asyncio.run(hits(11)) == [True] * 10 + [False]
+
+    # Idle keys are forgotten once their shared budget is full again
+    redis.replies["test:key"] = [100, 0, 0]
+    asyncio.run(limiter.sync())
+    asyncio.run(limiter.sync())
+    assert redis.reported[1:] == [{"test:key": 10}, {"test:key": 0}]
+    assert limiter.status()["leased_keys"] == 0
+
+
+def test_leased_mode_keeps_counts_when_sync_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def unavailable() -> None:
+        raise RuntimeError("Redis pool is not initialized")
+
+    monkeypatch.setattr(rate_limit, "get_redis", unavailable)
+    limiter = RateLimiter(rate_limit.settings.REDIS_URL, [], "test:", mode="leased")
+    item = parse("4/minute")
+
+    async def hits(count: int) -> list[bool]:
+        return [(await limiter.hit("key", item)).allowed for _ in range(count)]
+
+    assert asyncio.run(hits(2)) == [True, False]
+    assert asyncio.run(limiter.sync()) == 0
+    assert limiter._leases["key"].used == 1  # Reported by the next sync
+    assert limiter.status()["redis_errors"] == 1
+    # Until Redis is retried the worker enforces the full limit on its own
+    assert asyncio.run(hits(5)) == [True] * 4 + [False]
@@ -0,0 +1,86 @@
+"""Tests for read-replica routing."""
+
+import asyncio
+import contextlib
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from starlette.requests import Request
+
+from app.api import deps
+from app.core import replica
+from app.core.replica import ReplicaLagMonitor
+from app.models.user import User
+from app.users import config as users_config
+
+
+def test_unreachable_replica_reports_no_lag_measurement() -> None:
+    # SQLite has no replication functions, so the lag query fails
+    monitor = ReplicaLagMonitor(create_engine("sqlite://"), check_interval=60)
+    assert monitor.current_lag() is None
+
+
+def test_lag_measurement_is_reused_within_check_interval() -> None:
+    monitor = ReplicaLagMonitor(create_engine("sqlite://"), check_interval=60)
+    monitor.current_lag()
+    monitor.lag = 0.5
+    assert monitor.current_lag() == 0.5
+
+
+def test_reads_use_replica_only_when_fresh_and_not_sticky(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monitor = ReplicaLagMonitor(create_engine("sqlite://"), check_interval=60)
+    monitor.current_lag()
+    monkeypatch.setattr(replica, "lag_monitor", monitor)
+    monkeypatch.setattr(replica.settings, "DB_REPLICA_MAX_LAG_SECONDS", 2.0)
+    monkeypatch.setattr(replica, "_wrote_recently", lambda user_id: user_id == "writer")
+
+    monitor.lag = 0.1
+    assert replica.use_replica(None)
+    assert replica.use_replica("reader")
+    assert not replica.use_replica("writer")
+
+    monitor.lag = 5.0
+    assert not replica.use_replica("reader")
+
+    monitor.lag = None
+    assert not replica.use_replica("reader")
+
+
+def test_no_replica_configured_reads_from_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(replica, "lag_monitor", None)
+    assert not replica.use_replica("reader")
+
+
+def test_no_replica_configured_skips_token_decoding(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def decode(_request: Request) -> str:
+        raise AssertionError("token decoded without a replica")
+
+    monkeypatch.setattr(replica, "lag_monitor", None)
+    monkeypatch.setattr(deps, "get_bearer_subject", decode)
+    for method in ("GET", "POST"):
+        request = Request({"type": "http", "method": method, "headers": []})
+        for get_session in (deps.get_db, deps.get_read_db):
+            with contextlib.closing(get_session(request)) as sessions:
+                for session in sessions:
+                    assert not replica.is_replica_session(session)
+
+
+def test_user_manager_writes_pin_reads_to_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    marked: list[str] = []
+    monkeypatch.setattr(users_config, "mark_recent_write", marked.append)
+    session = MagicMock()
+    user = User(email="sticky@example.com", hashed_password="x")
+    user_db = users_config.SyncSQLAlchemyUserDatabase(session, User)
+
+    asyncio.run(user_db.update(user, {"full_name": "Sticky"}))
+    assert marked == [str(user.id)]
+    session.commit.assert_called_once()
@@ -0,0 +1,101 @@
+"""Tests for storage tier copies and write-behind access tracking."""
+
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core import access_tracker as access_tracker_module
+from app.core.access_tracker import AccessTracker
+from app.core.config import settings
+from app.utils.compression import ZSTD, iter_decoded, zstd_available
+from app.utils.tiering import copy_to_cold_tier, copy_to_hot_tier
+
+
+@pytest.fixture
+def tiers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[Path, Path]:
+    hot, cold = tmp_path / "hot", tmp_path / "cold"
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(hot))
+    monkeypatch.setattr(settings, "COLD_TIER_DIR", str(cold))
+    return hot, cold
+
+
+def test_cold_copy_round_trip(tiers: tuple[Path, Path]) -> None:
+    hot, cold = tiers
+    owner_id = uuid.uuid4()
+    source = hot / str(owner_id) / "notes.txt"
+    source.parent.mkdir(parents=True)
+    content = b"rarely read\n" * 10_000
+    source.write_bytes(content)
+
+    cold_path, encoding = copy_to_cold_tier(
+        source, owner_id=owner_id, content_type="text/plain", content_encoding=None
+    )
+
+    assert cold_path.is_relative_to(cold / str(owner_id))
+    assert source.exists()  # Removed by the caller once the row points at the copy
+    if zstd_available():
+        assert encoding == ZSTD
+        assert cold_path.stat().st_size < len(content) // 10
+    else:
+        assert encoding is None
+    assert b"".join(iter_decoded(cold_path, encoding, 4096)) == content
+    assert [p.name for p in cold_path.parent.iterdir()] == [cold_path.name]
+
+    source.unlink()
+    hot_path = copy_to_hot_tier(cold_path, owner_id=owner_id)
+
+    assert hot_path.parent == hot / str(owner_id)
+    assert hot_path.read_bytes() == cold_path.read_bytes()  # Still encoded
+
+
+def test_cold_copy_keeps_compressed_media_as_is(tiers: tuple[Path, Path]) -> None:
+    hot, _ = tiers
+    owner_id = uuid.uuid4()
+    source = hot / "photo.png"
+    source.parent.mkdir(parents=True)
+    source.write_bytes(b"\x89PNG" * 100)
+
+    cold_path, encoding = copy_to_cold_tier(
+        source, owner_id=owner_id, content_type="image/png", content_encoding=None
+    )
+
+    assert encoding is None
+    assert cold_path.read_bytes() == source.read_bytes()
+
+
+def test_access_tracker_flushes_latest_access_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    flushed: list[dict[tuple[uuid.UUID, uuid.UUID], object]] = []
+    monkeypatch.setattr(
+        access_tracker_module.crud,
+        "record_file_accesses",
+        lambda *, session, accesses: flushed.append(dict(accesses)),
+    )
+    tracker = AccessTracker(flush_interval=60)
+    file_id, owner_id = uuid.uuid4(), uuid.uuid4()
+
+    tracker.record(file_id, owner_id)
+    tracker.record(file_id, owner_id)
+
+    assert tracker.flush() == 1
+    assert list(flushed[0]) == [(file_id, owner_id)]
+    assert tracker.flush() == 0  # Nothing new
+    assert len(flushed) == 1
+
+
+def test_access_tracker_keeps_times_when_flush_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(**_: object) -> None:
+        raise OperationalError("UPDATE", {}, Exception("database is down"))
+
+    monkeypatch.setattr(access_tracker_module.crud, "record_file_accesses", fail)
+    tracker = AccessTracker(flush_interval=60)
+    tracker.record(uuid.uuid4(), uuid.uuid4())
+
+    assert tracker.flush() == 0
+    assert tracker.status()["pending"] == 1
+    assert tracker.failed_flushes == 1
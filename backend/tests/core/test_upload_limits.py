@@ -0,0 +1,79 @@
+"""Tests for upload admission control."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import upload_limits
+from app.core.upload_limits import UploadLimitedRoute, UploadLimiter
+
+
+def test_per_user_limit_rejects_with_429() -> None:
+    limiter = UploadLimiter(max_concurrent=10, max_per_user=1, queue_timeout=1)
+
+    async def run() -> None:
+        async with limiter.slot("user"):
+            assert limiter.status()["active"] == 1
+            with pytest.raises(HTTPException) as exc_info:
+                async with limiter.slot("user"):
+                    pass
+            assert exc_info.value.status_code == 429
+            async with limiter.slot("other"):
+                assert limiter.status()["users_uploading"] == 2
+
+    asyncio.run(run())
+    assert limiter.status()["active"] == 0
+    assert limiter.status()["users_uploading"] == 0
+    assert limiter.rejected_user == 1
+
+
+def test_process_limit_queues_then_rejects_with_503() -> None:
+    limiter = UploadLimiter(max_concurrent=1, max_per_user=10, queue_timeout=0.05)
+
+    async def run() -> None:
+        async with limiter.slot(None):
+            with pytest.raises(HTTPException) as exc_info:
+                async with limiter.slot(None):
+                    pass
+            assert exc_info.value.status_code == 503
+        # The slot is free again once the first upload finishes
+        async with limiter.slot(None):
+            pass
+
+    asyncio.run(run())
+    assert limiter.rejected_busy == 1
+    assert limiter.status()["queued"] == 0
+
+
+def test_disk_watermark_rejects_with_507(tmp_path: Path) -> None:
+    limiter = UploadLimiter(max_concurrent=1, max_per_user=1, queue_timeout=1)
+    limiter.check_disk_space(tmp_path, 0)
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.check_disk_space(tmp_path, 2**62)
+    assert exc_info.value.status_code == 507
+
+
+def test_route_rejects_with_503_when_queue_wait_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter = UploadLimiter(max_concurrent=1, max_per_user=10, queue_timeout=0.01)
+    monkeypatch.setattr(upload_limits, "upload_limiter", limiter)
+    monkeypatch.setattr(upload_limits.settings, "UPLOAD_MIN_FREE_BYTES", 0)
+    router = APIRouter(route_class=UploadLimitedRoute)
+
+    @router.post("/upload")
+    def upload() -> None: ...
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        # Hold the only slot so the request has to queue until it times out
+        client.portal.call(limiter._semaphore.acquire)
+        response = client.post("/upload")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert limiter.rejected_busy == 1
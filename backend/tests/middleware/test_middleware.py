@@ -0,0 +1,73 @@
+"""Tests for the request ID and rate limit middleware."""
+
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    RateLimiter,
+    RateLimitExceeded,
+    rate_limit_exceeded_handler,
+)
+from app.middleware import RateLimitMiddleware, RequestIDMiddleware
+
+
+def _app(default_limit: str) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = RateLimiter("memory://", [default_limit], "test:")
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+    @app.get("/items/")
+    def read_items(request: Request) -> dict[str, Any]:
+        return {"request_id": request.state.request_id}
+
+    @app.get(f"{settings.API_V1_STR}/utils/health-check/")
+    def health_check() -> bool:
+        return True
+
+    @app.get("/not-a/health-check/")
+    def lookalike() -> bool:
+        return True
+
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+def test_request_id_is_kept_or_generated() -> None:
+    client = TestClient(_app("100/minute"))
+
+    response = client.get("/items/", headers={"X-Request-ID": "abc"})
+    assert response.headers["X-Request-ID"] == "abc"
+    assert response.json() == {"request_id": "abc"}
+
+    response = client.get("/items/")
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert len(response.headers["X-Request-ID"]) == 36
+
+
+def test_rate_limit_applies_default_limit_with_headers() -> None:
+    client = TestClient(_app("2/minute"))
+
+    first = client.get("/items/")
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "2"
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert client.get("/items/").status_code == 200
+
+    response = client.get("/items/")
+    assert response.status_code == 429
+    assert "X-Request-ID" in response.headers
+
+
+def test_only_the_health_check_path_is_exempt() -> None:
+    client = TestClient(_app("1/minute"))
+    health_check = f"{settings.API_V1_STR}/utils/health-check/"
+
+    for _ in range(3):
+        assert client.get(health_check).status_code == 200
+    assert client.get("/not-a/health-check/").status_code == 200
+    assert client.get("/not-a/health-check/").status_code == 429
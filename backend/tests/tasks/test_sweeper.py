@@ -0,0 +1,71 @@
+"""Tests for the upload sweeper."""
+
+import os
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.tasks.sweeper import sweep_uploads
+from tests.utils.file import create_file_record, create_random_file
+from tests.utils.user import create_random_user
+
+
+def test_sweep_removes_orphaned_blobs_and_rows_without_blobs(db: Session) -> None:
+    user = create_random_user(db)
+    owner_id = str(user.id)
+
+    kept_path, _ = create_random_file(db, owner_id)
+    kept_id = create_file_record(db, owner_id, kept_path)
+
+    missing_path, _ = create_random_file(db, owner_id)
+    missing_id = create_file_record(db, owner_id, missing_path)
+    missing_path.unlink()
+
+    orphan_path, content = create_random_file(db, owner_id)
+    old = time.time() - settings.SWEEP_ORPHAN_GRACE_SECONDS - 60
+    os.utime(orphan_path, (old, old))
+    fresh_orphan_path, _ = create_random_file(db, owner_id)
+
+    report = sweep_uploads()
+
+    assert not orphan_path.exists()
+    assert fresh_orphan_path.exists()  # May be an upload in progress
+    assert kept_path.exists()
+    assert report.bytes_reclaimed >= len(content)
+    db.expire_all()
+    assert crud.get_file(session=db, file_id=uuid.UUID(kept_id)) is not None
+    assert crud.get_file(session=db, file_id=uuid.UUID(missing_id)) is None
+
+
+def test_sweep_matches_rows_stored_with_resolved_paths(db: Session) -> None:
+    user = create_random_user(db)
+    owner_id = str(user.id)
+    kept_path, _ = create_random_file(db, owner_id)
+    create_file_record(db, owner_id, kept_path.resolve())
+    old = time.time() - settings.SWEEP_ORPHAN_GRACE_SECONDS - 60
+    os.utime(kept_path, (old, old))
+
+    sweep_uploads()
+
+    assert kept_path.exists()
+
+
+def test_sweep_removes_nothing_when_no_blob_matches_a_row(
+    db: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # E.g. UPLOAD_DIR pointing at a different directory than the rows use
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    user = create_random_user(db)
+    blob_path, _ = create_random_file(db, str(user.id))
+    old = time.time() - settings.SWEEP_ORPHAN_GRACE_SECONDS - 60
+    os.utime(blob_path, (old, old))
+
+    report = sweep_uploads()
+
+    assert blob_path.exists()
+    assert report.orphans_removed == 0
@@ -0,0 +1,76 @@
+"""Tests for background task definitions."""
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.tasks.tasks import delete_blobs_task, delete_user_blobs_task
+
+
+def test_delete_user_blobs_task_removes_directory_in_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "BLOB_CLEANUP_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "BLOB_CLEANUP_PAUSE_SECONDS", 0)
+    user_id = str(uuid.uuid4())
+    user_dir = tmp_path / user_id
+    user_dir.mkdir()
+    for n in range(5):
+        (user_dir / f"{n}.txt").write_bytes(b"x" * 10)
+    other_dir = tmp_path / str(uuid.uuid4())
+    other_dir.mkdir()
+    (other_dir / "keep.txt").write_bytes(b"x")
+
+    result = asyncio.run(delete_user_blobs_task({}, user_id))
+
+    assert result == {"files_removed": 5, "bytes_freed": 50}
+    assert not user_dir.exists()
+    assert (other_dir / "keep.txt").exists()
+
+
+def test_delete_user_blobs_task_rejects_non_uuid_ids() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(delete_user_blobs_task({}, "../etc"))
+
+
+def test_delete_user_blobs_task_also_clears_cold_tier(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "hot"))
+    monkeypatch.setattr(settings, "COLD_TIER_DIR", str(tmp_path / "cold"))
+    monkeypatch.setattr(settings, "BLOB_CLEANUP_PAUSE_SECONDS", 0)
+    user_id = str(uuid.uuid4())
+    for tier in ("hot", "cold"):
+        (tmp_path / tier / user_id).mkdir(parents=True)
+        (tmp_path / tier / user_id / "a.txt").write_bytes(b"x" * 10)
+
+    result = asyncio.run(delete_user_blobs_task({}, user_id))
+
+    assert result == {"files_removed": 2, "bytes_freed": 20}
+    assert not (tmp_path / "hot" / user_id).exists()
+    assert not (tmp_path / "cold" / user_id).exists()
+
+
+def test_delete_blobs_task_unlinks_paths_in_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "BLOB_CLEANUP_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "BLOB_CLEANUP_PAUSE_SECONDS", 0)
+    paths = [tmp_path / f"{n}.txt" for n in range(5)]
+    for path in paths:
+        path.write_bytes(b"x")
+    kept = tmp_path / "keep.txt"
+    kept.write_bytes(b"x")
+
+    # Already-missing paths are skipped
+    result = asyncio.run(
+        delete_blobs_task({}, [str(p) for p in paths] + [str(tmp_path / "gone")])
+    )
+
+    assert result == {"files_removed": 5}
+    assert not any(path.exists() for path in paths)
+    assert kept.exists()
@@ -0,0 +1,67 @@
+"""Tests for moving cold files to the cold tier and recalling them."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import File
+from app.models.file import COLD_TIER, HOT_TIER
+from app.tasks.tiering import migrate_cold_files
+from tests.utils.file import create_file_record, create_random_file
+from tests.utils.user import create_random_user
+
+
+def test_cold_files_move_and_are_recalled_on_download(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "COLD_TIER_DIR", str(tmp_path))
+    user = create_random_user(db)
+    owner_id = str(user.id)
+    cold_hot_path, content = create_random_file(db, owner_id)
+    cold_id = uuid.UUID(create_file_record(db, owner_id, cold_hot_path, "cold.txt"))
+    recent_path, _ = create_random_file(db, owner_id)
+    recent_id = uuid.UUID(create_file_record(db, owner_id, recent_path))
+    cold_file = db.get(File, cold_id)
+    assert cold_file is not None
+    cold_file.last_accessed_at = datetime.now(timezone.utc) - timedelta(
+        days=settings.COLD_TIER_AFTER_DAYS + 1
+    )
+    db.add(cold_file)
+    db.commit()
+
+    report = migrate_cold_files()
+
+    assert report.files_moved >= 1
+    assert not cold_hot_path.exists()
+    assert recent_path.exists()
+    db.expire_all()
+    cold_file = db.get(File, cold_id)
+    assert cold_file is not None
+    assert cold_file.storage_tier == COLD_TIER
+    assert Path(cold_file.file_path).is_relative_to(tmp_path)
+    recent_file = db.get(File, recent_id)
+    assert recent_file is not None
+    assert recent_file.storage_tier == HOT_TIER
+
+    response = client.get(
+        f"{settings.API_V1_STR}/files/{cold_id}/download",
+        headers={**superuser_token_headers, "Accept-Encoding": "identity"},
+    )
+
+    assert response.status_code == 200
+    assert response.content == content.encode()
+    db.expire_all()
+    cold_file = db.get(File, cold_id)
+    assert cold_file is not None
+    assert cold_file.storage_tier == HOT_TIER
+    assert Path(cold_file.file_path).is_relative_to(Path(settings.UPLOAD_DIR))
+    assert not any(tmp_path.rglob("*.*"))
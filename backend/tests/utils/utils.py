@@ -1,9 +1,15 @@
 import random
+import re
 import string
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
 from app.core.config import settings
+from app.core.db import engine
 
 
 def random_lower_string() -> str:
@@ -34,3 +40,26 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+@contextmanager
+def capture_statements() -> Generator[list[str], None, None]:
+    """Collect every SQL statement executed on the engine inside the block."""
+    statements: list[str] = []
+
+    def before_cursor_execute(
+        _conn: Any, _cursor: Any, statement: str, *_args: Any
+    ) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def statements_on_table(statements: list[str], table: str) -> list[str]:
+    """Keep the statements that read or write ``table``."""
+    pattern = re.compile(rf'\b(FROM|INTO|UPDATE)\s+"?{table}"?(\s|$)')
+    return [s for s in statements if pattern.search(s)]